@@ -7,6 +7,8 @@ import time
 from discord.ext import commands
 from discord import app_commands, ui
 
+from utils.outbound import PANEL
+
 try:
     sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
     import config
@@ -27,7 +29,7 @@ class RoleSelector(discord.ui.RoleSelect):
         if interaction.user != view.author: return
 
         await interaction.response.defer()
-        if not interaction.guild.chunked: await interaction.guild.chunk()
+        await interaction.client.ensure_members(interaction.guild)
 
         view.target_members = set()
         for role in self.values:
@@ -44,6 +46,32 @@ class RoleSelector(discord.ui.RoleSelect):
         
         await interaction.edit_original_response(embeds=[interaction.message.embeds[0], painel], view=view)
 
+CAMPAIGN_STATUS = {
+    'running': ("🚀 Enviando...", discord.Color.gold()),
+    'paused': ("⏸️ Pausada", discord.Color.orange()),
+    'cancelled': ("⚠️ Cancelada", discord.Color.red()),
+    'done': ("✅ Finalizado", discord.Color.green()),
+}
+CAMPAIGN_PANEL_REFRESH = 10 # Segundos entre atualizações automáticas do painel
+
+def make_bar(current, total):
+    percent = current / total * 100 if total > 0 else 0
+    filled = int(15 * percent // 100)
+    return '▰' * filled + '▱' * (15 - filled) + f" {int(percent)}%"
+
+def campaign_panel(job, failures=()):
+    """Painel da campanha montado só com os contadores do job (sem edição por envio)."""
+    title, color = CAMPAIGN_STATUS.get(job['status'], ("📬 Campanha", discord.Color.light_grey()))
+    done = job['sent'] + job['failed']
+    painel = discord.Embed(title=title, color=color)
+    painel.description = (f"`{make_bar(done, job['total'])}`\n\n"
+                          f"👥 {job['total']} | 📨 {job['sent']} | 🚫 {job['failed']} | ⏳ {job['total'] - done}\n"
+                          f"⏱️ **Ritmo:** `{job['interval']:.1f}s` por DM")
+    if failures:
+        painel.add_field(name="Falhas", value="\n".join(f"`{count}x` {(error or '?')[:80]}" for error, count in failures), inline=False)
+    painel.set_footer(text=f"Campanha #{job['id']}")
+    return painel
+
 class CampaignView(ui.View):
     def __init__(self, bot, author, embed_to_send, delay, link_btn, label_btn, emoji_btn):
         super().__init__(timeout=None)
@@ -55,75 +83,87 @@ class CampaignView(ui.View):
         self.label_btn = label_btn
         self.emoji_btn = emoji_btn
         self.target_members = set()
-        self.stop_signal = False
         self.add_item(RoleSelector())
 
     @ui.button(label="Selecione cargos...", style=discord.ButtonStyle.secondary, disabled=True, row=1)
     async def start_btn(self, interaction: discord.Interaction, button: ui.Button):
-        if interaction.user != self.author: return
-        self.stop_signal = False
+        if interaction.user != self.author or self.is_finished(): return
+        # Antes de qualquer await: clique duplo (ou outro clique enquanto grava) não cria outra campanha
+        self.stop()
         button.disabled = True
-        self.stop_btn.disabled = False
-        self.children[0].disabled = True
-        await interaction.response.edit_message(view=self)
-        asyncio.create_task(self.run_process(interaction))
-
-    @ui.button(label="⛔ PARAR", style=discord.ButtonStyle.danger, disabled=True, row=1)
-    async def stop_btn(self, interaction: discord.Interaction, button: ui.Button):
-        if interaction.user != self.author: return
-        self.stop_signal = True
-        button.label = "🛑 Parando..."
-        button.disabled = True
-        await interaction.response.edit_message(view=self)
-
-    def make_bar(self, current, total):
-        percent = current / total * 100 if total > 0 else 0
-        filled = int(15 * percent // 100)
-        return '▰' * filled + '▱' * (15 - filled) + f" {int(percent)}%"
+        await interaction.response.defer()
 
-    async def run_process(self, interaction):
-        sent = 0
-        failed = 0
-        total = len(self.target_members)
-        
-        # Cria o botão que vai para o usuário
-        user_view = None
+        # Botão que vai para o usuário (link + emoji, se tiver)
+        link = None
         if self.link_btn and self.label_btn:
-            user_view = ui.View()
-            # Adiciona o botão com link e emoji (se tiver)
-            # Nota: Botões de Link são SEMPRE cinza (Limitação do Discord)
-            btn = ui.Button(
-                label=self.label_btn, 
-                url=self.link_btn, 
-                style=discord.ButtonStyle.link,
-                emoji=self.emoji_btn # <--- AQUI ENTRA O ÍCONE
-            )
-            user_view.add_item(btn)
+            link = {'url': self.link_btn, 'label': self.label_btn, 'emoji': self.emoji_btn}
 
-        painel = interaction.message.embeds[1]
-        members_list = list(self.target_members)
-
-        for index, member in enumerate(members_list, 1):
-            if self.stop_signal: break
-            try:
-                await member.send(embed=self.embed_to_send, view=user_view)
-                sent += 1
-            except: failed += 1
-            
-            if index % 5 == 0 or index == total:
-                painel.title = "🚀 Enviando..."
-                painel.color = discord.Color.gold()
-                painel.description = f"`{self.make_bar(index, total)}`\n\n📨 {sent} | 🚫 {failed}"
-                try: await interaction.edit_original_response(embeds=[interaction.message.embeds[0], painel], view=self)
-                except: pass
-            
-            await asyncio.sleep(self.delay)
+        # A campanha vai para o banco e roda na fila (utils/dm_campaigns.py): sobrevive a reinícios
+        job_id = await self.bot.campaigns.create(interaction.guild.id, interaction.user.id, self.embed_to_send, link,
+                                                 [m.id for m in self.target_members], self.delay)
+        asyncio.create_task(watch_campaign(self.bot, interaction, job_id))
+
+async def render_campaign(bot, job_id):
+    job = await bot.campaigns.get(job_id)
+    if not job: return None
+    return campaign_panel(job, await bot.campaigns.failures(job_id))
+
+async def watch_campaign(bot, interaction, job_id):
+    """Atualiza o painel a partir dos contadores enquanto o token da interação vale (~15 min)."""
+    deadline = time.time() + 14 * 60
+    preview = interaction.message.embeds[0]
+    while time.time() < deadline:
+        painel = await render_campaign(bot, job_id)
+        if not painel: return
+        try:
+            await bot.outbound.edit_original(interaction, PANEL, embeds=[preview, painel], view=CampaignControlView(bot))
+        except: return
+        if painel.title in (CAMPAIGN_STATUS['done'][0], CAMPAIGN_STATUS['cancelled'][0]): return
+        await asyncio.sleep(CAMPAIGN_PANEL_REFRESH)
+
+class CampaignControlView(ui.View):
+    """Controles persistentes: o ID da campanha vem do rodapé do painel."""
+    def __init__(self, bot):
+        super().__init__(timeout=None)
+        self.bot = bot
+
+    def _job_id(self, interaction):
+        for embed in interaction.message.embeds:
+            footer = embed.footer.text or ""
+            if footer.startswith("Campanha #"):
+                return int(footer.split("#", 1)[1])
+        return None
+
+    async def _control(self, interaction, action):
+        if not interaction.user.guild_permissions.administrator:
+            return await interaction.response.send_message("❌ Apenas administradores.", ephemeral=True)
+        job_id = self._job_id(interaction)
+        job = await self.bot.campaigns.get(job_id) if job_id else None
+        if not job or job['guild_id'] != interaction.guild.id:
+            return await interaction.response.send_message("❌ Campanha não encontrada.", ephemeral=True)
+
+        if action and not await action(job_id):
+            return await interaction.response.send_message("⚠️ Não é possível com o status atual da campanha.", ephemeral=True)
+
+        painel = await render_campaign(self.bot, job_id)
+        embeds = [painel if e.footer.text == painel.footer.text else e for e in interaction.message.embeds]
+        await interaction.response.edit_message(embeds=embeds, view=self)
+
+    @ui.button(label="Atualizar", emoji="🔄", style=discord.ButtonStyle.secondary, custom_id="dm_campaign_refresh")
+    async def refresh_btn(self, interaction: discord.Interaction, button: ui.Button):
+        await self._control(interaction, None)
+
+    @ui.button(label="Pausar", emoji="⏸️", style=discord.ButtonStyle.secondary, custom_id="dm_campaign_pause")
+    async def pause_btn(self, interaction: discord.Interaction, button: ui.Button):
+        await self._control(interaction, self.bot.campaigns.pause)
 
-        painel.title = "✅ Finalizado" if not self.stop_signal else "⚠️ Parado"
-        painel.color = discord.Color.green() if not self.stop_signal else discord.Color.red()
-        painel.description = f"**Relatório:**\n👥 {total}\n✅ {sent}\n❌ {failed}"
-        self.stop_btn.disabled = True
-        await interaction.edit_original_response(embeds=[interaction.message.embeds[0], painel], view=self)
+    @ui.button(label="Retomar", emoji="▶️", style=discord.ButtonStyle.success, custom_id="dm_campaign_resume")
+    async def resume_btn(self, interaction: discord.Interaction, button: ui.Button):
+        await self._control(interaction, self.bot.campaigns.resume_job)
+
+    @ui.button(label="Cancelar", emoji="⛔", style=discord.ButtonStyle.danger, custom_id="dm_campaign_cancel")
+    async def cancel_btn(self, interaction: discord.Interaction, button: ui.Button):
+        await self._control(interaction, self.bot.campaigns.cancel)
 
 # ====================================================
 # COG PRINCIPAL
@@ -132,6 +172,7 @@ class CampaignView(ui.View):
 class Admin(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
+        self.bot.add_view(CampaignControlView(self.bot))
 
     # --- FERRAMENTAS ---
     @app_commands.command(name="reload", description="🔄 Recarrega um módulo")
@@ -214,6 +255,26 @@ class Admin(commands.Cog):
         view = CampaignView(self.bot, interaction.user, embed, delay, link_botao, texto_botao, emoji_botao)
         await interaction.response.send_message(content="**👁️ PREVIEW:**", embeds=[embed, painel], view=view, ephemeral=True)
 
+    @app_commands.command(name="campanhas", description="📬 Status e controle das campanhas de DM")
+    @app_commands.describe(campanha="Número da campanha (padrão: a mais recente)")
+    @app_commands.checks.has_permissions(administrator=True)
+    async def campaigns_status(self, interaction: discord.Interaction, campanha: int = None):
+        jobs = await self.bot.campaigns.for_guild(interaction.guild.id)
+        if not jobs:
+            return await interaction.response.send_message("📭 Nenhuma campanha neste servidor.", ephemeral=True)
+
+        job_id = campanha or jobs[0]['id']
+        job = await self.bot.campaigns.get(job_id)
+        if not job or job['guild_id'] != interaction.guild.id:
+            return await interaction.response.send_message("❌ Campanha não encontrada.", ephemeral=True)
+
+        painel = campaign_panel(job, await self.bot.campaigns.failures(job_id))
+        others = [j for j in jobs if j['id'] != job_id][:5]
+        if others:
+            painel.add_field(name="Recentes", value="\n".join(
+                f"`#{j['id']}` {CAMPAIGN_STATUS.get(j['status'], ('?',))[0]} • {j['sent']}/{j['total']}" for j in others), inline=False)
+        await interaction.response.send_message(embed=painel, view=CampaignControlView(self.bot), ephemeral=True)
+
     # --- LIMPEZA DE CHAT ---
     @app_commands.command(name="limpar", description="🧹 Limpa mensagens do chat")
     @app_commands.describe(quantidade="Número de mensagens para apagar")
@@ -233,36 +294,15 @@ class Admin(commands.Cog):
     async def setup_streaming(self, interaction: discord.Interaction, canal: discord.TextChannel, cargo: discord.Role = None):
         role_id = cargo.id if cargo else None
         
-        # Upsert na tabela config
-        # SQLite UPSERT syntax: INSERT INTO ... ON CONFLICT(guild_id) DO UPDATE SET ...
-        # Mas nossa tabela config pode não ter UNIQUE(guild_id) garantido em versões antigas? 
-        # Assumindo que tem PRIMARY KEY(guild_id) ou UNIQUE
-        
-        # Vamos checar se já existe registro
-        exists = await self.bot.db.execute("SELECT 1 FROM config WHERE guild_id = ?", (interaction.guild.id,))
-        row = await exists.fetchone()
-        
-        if row:
-            await self.bot.db.execute("UPDATE config SET streaming_channel_id = ?, streaming_role_id = ? WHERE guild_id = ?", (canal.id, role_id, interaction.guild.id))
-        else:
-             await self.bot.db.execute("INSERT INTO config (guild_id, streaming_channel_id, streaming_role_id) VALUES (?, ?, ?)", (interaction.guild.id, canal.id, role_id))
-             
-        await self.bot.db.commit()
+        # Upsert na tabela config (via cache, que já faz INSERT ... ON CONFLICT)
+        await self.bot.config_cache.update(interaction.guild.id, streaming_channel_id=canal.id, streaming_role_id=role_id)
         await interaction.response.send_message(f"✅ **Streaming Configurado!**\n📺 Canal: {canal.mention}\n🎭 Cargo: {cargo.mention if cargo else 'Nenhum'}", ephemeral=True)
 
     @app_commands.command(name="setup_tickets", description="⚙️ Configura o canal de Tickets (para Punições)")
     @app_commands.describe(canal="Canal onde fica o painel de tickets")
     @app_commands.checks.has_permissions(administrator=True)
     async def setup_tickets(self, interaction: discord.Interaction, canal: discord.TextChannel):
-        exists = await self.bot.db.execute("SELECT 1 FROM config WHERE guild_id = ?", (interaction.guild.id,))
-        row = await exists.fetchone()
-        
-        if row:
-            await self.bot.db.execute("UPDATE config SET ticket_panel_channel_id = ? WHERE guild_id = ?", (canal.id, interaction.guild.id))
-        else:
-             await self.bot.db.execute("INSERT INTO config (guild_id, ticket_panel_channel_id) VALUES (?, ?)", (interaction.guild.id, canal.id))
-             
-        await self.bot.db.commit()
+        await self.bot.config_cache.update(interaction.guild.id, ticket_panel_channel_id=canal.id)
         await interaction.response.send_message(f"✅ **Tickets Configurado!**\n🎫 Canal Vinculado: {canal.mention}", ephemeral=True)
 
 async def setup(bot):
@@ -34,9 +34,7 @@ class Bugs(commands.Cog):
         await self.send_admin_panel(interaction)
 
     async def send_admin_panel(self, interaction: discord.Interaction, is_edit=False):
-        async with self.bot.db.execute("SELECT * FROM config WHERE guild_id = ?", (interaction.guild.id,)) as cursor:
-            row = await cursor.fetchone()
-            data = dict(zip([d[0] for d in cursor.description], row)) if row else {}
+        data = self.bot.config_cache.get(interaction.guild.id)
 
         pub_id = data.get('bug_public_channel_id')
         stf_id = data.get('bug_staff_channel_id')
@@ -74,17 +72,14 @@ class Bugs(commands.Cog):
     # 📝 LÓGICA DE REPORT (SUBMIT)
     # ====================================================
     async def submit_bug(self, interaction, title, desc, steps, media):
-        async with self.bot.db.execute("SELECT bug_staff_channel_id, bug_count, bug_emoji_analyze, bug_emoji_fixed, bug_emoji_invalid FROM config WHERE guild_id = ?", (interaction.guild.id,)) as cursor:
-            res = await cursor.fetchone()
-            if not res or not res[0]:
-                return await interaction.response.send_message("❌ Erro: Canal da Staff não configurado.", ephemeral=True)
-            
-            staff_channel_id = res[0]
-            count = (res[1] or 0) + 1
-            emojis = {'analyze': res[2] or "🔍", 'fixed': res[3] or "✅", 'invalid': res[4] or "❌"}
+        res = self.bot.config_cache.get_many(interaction.guild.id, 'bug_staff_channel_id', 'bug_emoji_analyze', 'bug_emoji_fixed', 'bug_emoji_invalid')
+        if not res[0]:
+            return await interaction.response.send_message("❌ Erro: Canal da Staff não configurado.", ephemeral=True)
+        
+        staff_channel_id = res[0]
+        emojis = {'analyze': res[1] or "🔍", 'fixed': res[2] or "✅", 'invalid': res[3] or "❌"}
 
-        await self.bot.db.execute("UPDATE config SET bug_count = ? WHERE guild_id = ?", (count, interaction.guild.id))
-        await self.bot.db.commit()
+        count = await self.bot.counters.next(interaction.guild.id, 'bug')
 
         staff_chan = self.bot.get_channel(staff_channel_id)
         if not staff_chan:
@@ -147,11 +142,11 @@ class BugVisualModal(ui.Modal, title="🎨 Emojis dos Botões"):
 
     async def on_submit(self, interaction: discord.Interaction):
         await interaction.response.defer(ephemeral=True)
-        await self.bot.db.execute("""
-            UPDATE config SET bug_emoji_public=?, bug_emoji_analyze=?, bug_emoji_fixed=?, bug_emoji_invalid=?
-            WHERE guild_id=?
-        """, (self.e_pub.value, self.e_ana.value, self.e_fix.value, self.e_inv.value, interaction.guild.id))
-        await self.bot.db.commit()
+        await self.bot.config_cache.update(
+            interaction.guild.id,
+            bug_emoji_public=self.e_pub.value, bug_emoji_analyze=self.e_ana.value,
+            bug_emoji_fixed=self.e_fix.value, bug_emoji_invalid=self.e_inv.value
+        )
         await interaction.followup.send("✅ Emojis salvos!")
         await self.cog.send_admin_panel(self.origin, is_edit=True)
 
@@ -242,23 +237,19 @@ class BugAdminView(ui.View):
     @ui.select(cls=discord.ui.ChannelSelect, placeholder="Canal Público", channel_types=[discord.ChannelType.text], row=0)
     async def sel_pub(self, interaction: discord.Interaction, select: ui.ChannelSelect):
         await interaction.response.defer()
-        await self.bot.db.execute("UPDATE config SET bug_public_channel_id = ? WHERE guild_id = ?", (select.values[0].id, interaction.guild.id))
-        await self.bot.db.commit()
+        await self.bot.config_cache.update(interaction.guild.id, bug_public_channel_id=select.values[0].id)
         await self.cog.send_admin_panel(interaction, is_edit=True)
 
     @ui.select(cls=discord.ui.ChannelSelect, placeholder="Canal Staff", channel_types=[discord.ChannelType.text], row=1)
     async def sel_stf(self, interaction: discord.Interaction, select: ui.ChannelSelect):
         await interaction.response.defer()
-        await self.bot.db.execute("UPDATE config SET bug_staff_channel_id = ? WHERE guild_id = ?", (select.values[0].id, interaction.guild.id))
-        await self.bot.db.commit()
+        await self.bot.config_cache.update(interaction.guild.id, bug_staff_channel_id=select.values[0].id)
         await self.cog.send_admin_panel(interaction, is_edit=True)
 
     @ui.button(label="Editar Emojis", style=discord.ButtonStyle.secondary, emoji="🎨", row=2)
     async def edit_emojis(self, interaction: discord.Interaction, button: ui.Button):
-        async with self.bot.db.execute("SELECT bug_emoji_public, bug_emoji_analyze, bug_emoji_fixed, bug_emoji_invalid FROM config WHERE guild_id = ?", (interaction.guild.id,)) as cursor:
-            row = await cursor.fetchone()
-            keys = ['bug_emoji_public', 'bug_emoji_analyze', 'bug_emoji_fixed', 'bug_emoji_invalid']
-            data = dict(zip(keys, row)) if row else {}
+        keys = ['bug_emoji_public', 'bug_emoji_analyze', 'bug_emoji_fixed', 'bug_emoji_invalid']
+        data = {k: v for k, v in zip(keys, self.bot.config_cache.get_many(interaction.guild.id, *keys)) if v is not None}
             
         await interaction.response.send_modal(BugVisualModal(self.bot, self.cog, interaction, data))
 
@@ -266,10 +257,9 @@ class BugAdminView(ui.View):
     @ui.button(label="Postar Botão", style=discord.ButtonStyle.secondary, emoji="🚀", row=2)
     async def post_btn(self, interaction: discord.Interaction, button: ui.Button):
         await interaction.response.defer(ephemeral=True)
-        async with self.bot.db.execute("SELECT bug_public_channel_id, bug_emoji_public FROM config WHERE guild_id = ?", (interaction.guild.id,)) as cursor:
-            res = await cursor.fetchone()
+        res = self.bot.config_cache.get_many(interaction.guild.id, 'bug_public_channel_id', 'bug_emoji_public')
         
-        if not res or not res[0]: return await interaction.followup.send("❌ Configure Canal Público.")
+        if not res[0]: return await interaction.followup.send("❌ Configure Canal Público.")
         
         channel = self.bot.get_channel(res[0])
         emj = res[1] or "🐛"
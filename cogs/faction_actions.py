@@ -5,6 +5,8 @@ import json
 import datetime
 import asyncio
 
+from utils.outbound import PANEL
+
 # ====================================================
 # 🎨 CORES E CONSTANTES
 # ====================================================
@@ -35,10 +37,8 @@ class FactionActions(commands.Cog):
     # ====================================================
     @tasks.loop(hours=1)
     async def auto_ranking_loop(self):
-        async with self.bot.db.execute("SELECT guild_id, action_ranking_channel_id FROM config") as cursor:
-            configs = await cursor.fetchall()
-        
-        for guild_id, channel_id in configs:
+        for guild_id in self.bot.config_cache.guild_ids():
+            channel_id = self.bot.config_cache.get(guild_id, 'action_ranking_channel_id')
             if not channel_id: continue
             
             guild = self.bot.get_guild(guild_id)
@@ -58,15 +58,12 @@ class FactionActions(commands.Cog):
                         break
                 
                 if last_message:
-                    await last_message.edit(embed=embed)
+                    await self.bot.outbound.edit(last_message, PANEL, embed=embed)
                 else:
-                    await channel.send(embed=embed)
+                    await self.bot.outbound.send(channel, PANEL, embed=embed)
 
                 # Backup Webhook
-                async with self.bot.db.execute("SELECT action_ranking_webhook FROM config WHERE guild_id = ?", (guild_id,)) as cursor:
-                    res = await cursor.fetchone()
-                
-                webhook_url = res[0] if res else None
+                webhook_url = self.bot.config_cache.get(guild_id, 'action_ranking_webhook')
                 if webhook_url:
                     try:
                         async with aiohttp.ClientSession() as session:
@@ -99,9 +96,7 @@ class FactionActions(commands.Cog):
         await self.send_config_panel(interaction)
 
     async def send_config_panel(self, interaction: discord.Interaction, is_edit=False):
-        async with self.bot.db.execute("SELECT * FROM config WHERE guild_id = ?", (interaction.guild.id,)) as cursor:
-            row = await cursor.fetchone()
-            cfg = dict(zip([d[0] for d in cursor.description], row)) if row else {}
+        cfg = self.bot.config_cache.get(interaction.guild.id)
 
         embed = discord.Embed(title="⚙️ Configuração de Ações", color=0x2b2d31)
         embed.description = (
@@ -124,49 +119,29 @@ class FactionActions(commands.Cog):
         else: await interaction.followup.send(embed=embed, view=view)
 
     async def _get_emojis(self, guild_id):
-        async with self.bot.db.execute("SELECT action_emoji_join, action_emoji_leave, action_emoji_win, action_emoji_loss, action_emoji_notify, action_emoji_edit FROM config WHERE guild_id = ?", (guild_id,)) as cursor:
-            row = await cursor.fetchone()
-        if not row: return {}
+        if not self.bot.config_cache.has(guild_id): return {}
+        row = self.bot.config_cache.get_many(guild_id, 'action_emoji_join', 'action_emoji_leave', 'action_emoji_win', 'action_emoji_loss', 'action_emoji_notify', 'action_emoji_edit')
         return {
             'join': row[0], 'leave': row[1], 'win': row[2], 'loss': row[3], 'notify': row[4], 'edit': row[5]
         }
 
-    async def _check_db_columns(self):
-        async with self.bot.db.execute("PRAGMA table_info(faction_actions)") as cursor:
-            columns = [row[1] for row in await cursor.fetchall()]
-        
-        if "category" not in columns:
-            print("⚠️ Coluna 'category' não encontrada em faction_actions. Adicionando...")
-            await self.bot.db.execute("ALTER TABLE faction_actions ADD COLUMN category TEXT DEFAULT 'PVP'")
-            await self.bot.db.commit()
-            print("✅ Coluna 'category' adicionada com sucesso.")
-            
-        # Tabela de Bônus Manual
-        await self.bot.db.execute("""
-            CREATE TABLE IF NOT EXISTS ranking_bonus (
-                user_id INTEGER,
-                guild_id INTEGER,
-                bonus_wins INTEGER DEFAULT 0,
-                bonus_actions INTEGER DEFAULT 0,
-                bonus_mvps INTEGER DEFAULT 0,
-                PRIMARY KEY (user_id, guild_id)
-            )
-        """)
-        await self.bot.db.commit()
-
-        # Webhook Column (Config Table)
-        async with self.bot.db.execute("PRAGMA table_info(config)") as cursor:
-            cols = [row[1] for row in await cursor.fetchall()]
-            
-        if "action_ranking_webhook" not in cols:
-             print("⚠️ Coluna 'action_ranking_webhook' não encontrada em config. Adicionando...")
-             await self.bot.db.execute("ALTER TABLE config ADD COLUMN action_ranking_webhook TEXT")
-             await self.bot.db.commit()
-             print("✅ Coluna 'action_ranking_webhook' adicionada.")
-
     # ====================================================
     # 📊 RANKING
     # ====================================================
+    async def _bump_ranking(self, guild_id, category, deltas):
+        """Soma (user_id, total, wins, mvps) nos contadores da categoria e no geral ('ALL')."""
+        if not deltas: return
+        db = await self.bot.db.for_guild(guild_id)
+        categories = ['ALL'] if category in (None, 'ALL') else [category, 'ALL']
+        await db.executemany("""
+            INSERT INTO ranking_counters (guild_id, user_id, category, total, wins, mvps)
+            VALUES (?, ?, ?, ?, ?, ?)
+            ON CONFLICT(guild_id, user_id, category) DO UPDATE SET
+            total = total + excluded.total,
+            wins = wins + excluded.wins,
+            mvps = mvps + excluded.mvps
+        """, [(guild_id, uid, cat, t, w, m) for cat in categories for uid, t, w, m in deltas])
+
     @app_commands.command(name="ranking_acoes", description="Mostra o ranking dos membros mais ativos nas ações.")
     @app_commands.describe(categoria="Filtrar por categoria (Opcional)")
     @app_commands.choices(categoria=[
@@ -180,55 +155,18 @@ class FactionActions(commands.Cog):
         await interaction.followup.send(embed=embed)
 
     async def _build_ranking_embed(self, guild, category=None):
-        # Busca todas as ações finalizadas (WIN ou LOSS)
-        query = "SELECT participants, status, mvp_id FROM faction_actions WHERE guild_id = ? AND status IN ('WIN', 'LOSS')"
-        params = [guild.id]
-        
-        if category:
-            query += " AND category = ?"
-            params.append(category)
-            
-        async with self.bot.db.execute(query, tuple(params)) as cursor:
-            rows = await cursor.fetchall()
-            
-        print(f"📊 [RANKING DEBUG] Guild {guild.id} | Categoria: {category} | Rows: {len(rows)}")
-        if rows:
-            print(f"   > Exemplo Row 0: {rows[0]}")
-            
-        scores = {}
-        
-        if rows:
-            for row in rows:
-                try:
-                    participants = json.loads(row[0]) if row[0] else []
-                except Exception as e:
-                    print(f"⚠️ [RANKING ERROR] Falha ao ler participantes da Row: {row} -> {e}")
-                    participants = []
-
-                status = row[1]
-                mvp_id = row[2]
-                
-                for uid in participants:
-                    if uid not in scores: scores[uid] = {'total': 0, 'wins': 0, 'mvps': 0}
-                    scores[uid]['total'] += 1
-                    if status == 'WIN': scores[uid]['wins'] += 1
-                
-                if mvp_id:
-                    if mvp_id not in scores: scores[mvp_id] = {'total': 0, 'wins': 0, 'mvps': 0}
-                    scores[mvp_id]['mvps'] += 1
-        
-        # Injeta Pontos Manuais (Bônus)
-        async with self.bot.db.execute("SELECT user_id, bonus_actions, bonus_wins, bonus_mvps FROM ranking_bonus WHERE guild_id = ?", (guild.id,)) as cursor:
-             bonus_rows = await cursor.fetchall()
-             
-        for uid, b_act, b_wins, b_mvps in bonus_rows:
-            if uid not in scores: scores[uid] = {'total': 0, 'wins': 0, 'mvps': 0}
-            scores[uid]['total'] += b_act
-            scores[uid]['wins'] += b_wins
-            scores[uid]['mvps'] += b_mvps
-
-        # Ordena por total de participações
-        sorted_scores = sorted(scores.items(), key=lambda x: x[1]['total'], reverse=True)[:10]
+        db = await self.bot.db.for_guild(guild.id)
+        # Contadores mantidos incrementalmente (ranking_counters): top 10 direto do índice
+        async with db.read() as conn:
+            async with conn.execute("""
+                SELECT user_id, total, wins, mvps FROM ranking_counters
+                WHERE guild_id = ? AND category = ?
+                ORDER BY total DESC
+                LIMIT 10
+            """, (guild.id, category or 'ALL')) as cursor:
+                rows = await cursor.fetchall()
+
+        sorted_scores = [(uid, {'total': total, 'wins': wins, 'mvps': mvps}) for uid, total, wins, mvps in rows]
         
         embed = discord.Embed(title=f"🏆 Ranking de Ações ({category if category else 'Geral'})", color=COLOR_OPEN)
         description = ""
@@ -266,10 +204,11 @@ class FactionActions(commands.Cog):
     @app_commands.describe(membro="Membro para adicionar pontos", acoes="Quantidade de ações", vitorias="Quantidade de vitórias", mvps="Quantidade de MVPs")
     @app_commands.checks.has_permissions(administrator=True)
     async def add_points(self, interaction: discord.Interaction, membro: discord.Member, acoes: int = 0, vitorias: int = 0, mvps: int = 0):
+        db = await self.bot.db.for_guild(interaction.guild.id)
         await interaction.response.defer(ephemeral=True)
         
         # Update or Insert (Upsert)
-        await self.bot.db.execute("""
+        await db.execute("""
             INSERT INTO ranking_bonus (user_id, guild_id, bonus_actions, bonus_wins, bonus_mvps)
             VALUES (?, ?, ?, ?, ?)
             ON CONFLICT(user_id, guild_id) DO UPDATE SET
@@ -277,15 +216,20 @@ class FactionActions(commands.Cog):
             bonus_wins = bonus_wins + excluded.bonus_wins,
             bonus_mvps = bonus_mvps + excluded.bonus_mvps
         """, (membro.id, interaction.guild.id, acoes, vitorias, mvps))
+        await self._bump_ranking(interaction.guild.id, 'ALL', [(membro.id, acoes, vitorias, mvps)])
         
-        await self.bot.db.commit()
+        await db.commit()
         await interaction.followup.send(f"✅ Adicionado para {membro.mention}:\n+ {acoes} Ações\n+ {vitorias} Vitórias\n+ {mvps} MVPs", ephemeral=True)
 
     @app_commands.command(name="remover_pontos", description="⚠️ Remove TODOS os pontos manuais de um usuário.")
     @app_commands.checks.has_permissions(administrator=True)
     async def remove_points(self, interaction: discord.Interaction, membro: discord.Member):
-        await self.bot.db.execute("DELETE FROM ranking_bonus WHERE user_id = ? AND guild_id = ?", (membro.id, interaction.guild.id))
-        await self.bot.db.commit()
+        db = await self.bot.db.for_guild(interaction.guild.id)
+        async with db.execute("DELETE FROM ranking_bonus WHERE user_id = ? AND guild_id = ? RETURNING bonus_actions, bonus_wins, bonus_mvps", (membro.id, interaction.guild.id)) as cursor:
+            bonus = await cursor.fetchone()
+        if bonus:
+            await self._bump_ranking(interaction.guild.id, 'ALL', [(membro.id, -bonus[0], -bonus[1], -bonus[2])])
+        await db.commit()
         await interaction.response.send_message(f"✅ Pontos manuais de {membro.mention} removidos.", ephemeral=True)
 
 
@@ -339,12 +283,12 @@ class FactionActions(commands.Cog):
     # Lógica Central de Criação (Reutilizável)
     # ----------------------------------------------------
     async def _create_action_logic(self, interaction: discord.Interaction, acao: str, data_hora_str: str, vagas: int, categoria: str):
+        db = await self.bot.db.for_guild(interaction.guild.id)
         try:
             # 1. Verifica Configurações
-            async with self.bot.db.execute("SELECT action_channel_id, action_role_id FROM config WHERE guild_id = ?", (interaction.guild.id,)) as cursor:
-                res = await cursor.fetchone()
+            res = self.bot.config_cache.get_many(interaction.guild.id, 'action_channel_id', 'action_role_id')
             
-            if not res or not res[0]:
+            if not res[0]:
                 return await interaction.followup.send("❌ Canal de ações não configurado! Use `/painel_acoes`.", ephemeral=True)
             
             channel = self.bot.get_channel(res[0])
@@ -382,7 +326,7 @@ class FactionActions(commands.Cog):
 
             # 5. Salva no Banco
             try:
-                await self.bot.db.execute("""
+                await db.execute("""
                     INSERT INTO faction_actions (
                         message_id, channel_id, guild_id, responsible_id, 
                         action_name, date_time, slots, status, participants, cancellations, category
@@ -391,7 +335,7 @@ class FactionActions(commands.Cog):
                     message.id, channel.id, interaction.guild.id, interaction.user.id,
                     acao, data_hora_str, vagas, "OPEN", json.dumps([]), json.dumps([]), categoria
                 ))
-                await self.bot.db.commit()
+                await db.commit()
             except Exception as dbe:
                 # Tenta apagar a mensagem se falhar no banco para não ficar fantasma
                 await message.delete()
@@ -470,7 +414,6 @@ class FactionActions(commands.Cog):
     # ====================================================
     @commands.Cog.listener()
     async def on_ready(self):
-        await self._check_db_columns()
         self.bot.add_view(ActionView(self.bot, {}))
         self.bot.add_view(ActionCreationDashboard(self.bot, self))
         print("✅ [FactionActions] Dashboard de Criação carregado.")
@@ -607,21 +550,34 @@ class ActionView(ui.View):
                 self.join_action.disabled = False
 
     async def _update_message(self, interaction, new_data):
-        # Atualiza DB
-        await self.bot.db.execute("""
-            UPDATE faction_actions 
-            SET status=?, participants=?, cancellations=?, profit=?, action_name=?, date_time=?, slots=?
-            WHERE message_id=?
-        """, (
-            new_data['status'], json.dumps(new_data['participants']), 
-            json.dumps(new_data['cancellations']), new_data.get('profit'), 
-            new_data['name'], new_data['datetime'], new_data['slots'],
-            interaction.message.id
-        ))
-        await self.bot.db.commit()
-
-        # Reconstrói Embed
+        """Grava e redesenha a ação. Retorna False se ela já tinha sido finalizada (nada gravado)."""
+        db = await self.bot.db.for_guild(interaction.guild.id)
         cog = self.bot.get_cog("FactionActions")
+
+        # Ação já finalizada nunca é regravada: a transição para WIN/LOSS e a
+        # edição comum só valem enquanto o status no banco não é final, e o
+        # ranking sobe no mesmo bloco (o flusher não comita um sem o outro)
+        finishing = new_data['status'] in ('WIN', 'LOSS')
+        async with db.write() as conn:
+            async with conn.execute("""
+                UPDATE faction_actions 
+                SET status=?, cancellations=?, profit=?, action_name=?, date_time=?, slots=?
+                WHERE message_id=? AND status NOT IN ('WIN','LOSS')
+            """, (
+                new_data['status'], json.dumps(new_data['cancellations']), new_data.get('profit'), 
+                new_data['name'], new_data['datetime'], new_data['slots'],
+                interaction.message.id
+            )) as cursor:
+                changed = cursor.rowcount
+            if changed != 1: return False
+
+            await self._save_participants(interaction, new_data['participants'])
+            if finishing:
+                win = 1 if new_data['status'] == 'WIN' else 0
+                await cog._bump_ranking(interaction.guild.id, new_data.get('category'), [(uid, 1, win, 0) for uid in new_data['participants']])
+
+        # Reconstrói Embed (nomes dos participantes vêm do cache de membros)
+        await self.bot.ensure_members(interaction.guild) # Quem chama já respondeu com defer()
         embed = cog._build_embed(interaction.guild, new_data)
         
         # Busca emojis atualizados
@@ -638,10 +594,27 @@ class ActionView(ui.View):
 
 
         await interaction.message.edit(embed=embed, view=new_view)
+        return True
+
+    async def _save_participants(self, interaction, participants):
+        db = await self.bot.db.for_guild(interaction.guild.id)
+        # Remove quem saiu e grava a ordem atual (joined_at dos antigos é mantido)
+        message_id = interaction.message.id
+        await db.execute(
+            "DELETE FROM action_participants WHERE message_id = ? AND user_id NOT IN (SELECT value FROM json_each(?))",
+            (message_id, json.dumps(participants))
+        )
+        now = datetime.datetime.now().isoformat(timespec='seconds')
+        await db.executemany("""
+            INSERT INTO action_participants (message_id, guild_id, user_id, joined_at, position)
+            VALUES (?, ?, ?, ?, ?)
+            ON CONFLICT(message_id, user_id) DO UPDATE SET position = excluded.position
+        """, [(message_id, interaction.guild.id, uid, now, pos) for pos, uid in enumerate(participants)])
 
     async def _get_current_data(self, interaction):
+        db = await self.bot.db.for_guild(interaction.guild.id)
         # Busca dados atualizados do DB
-        async with self.bot.db.execute("SELECT * FROM faction_actions WHERE message_id = ?", (interaction.message.id,)) as cursor:
+        async with db.execute("SELECT * FROM faction_actions WHERE message_id = ?", (interaction.message.id,)) as cursor:
             row = await cursor.fetchone()
         
         if not row: return None
@@ -649,8 +622,9 @@ class ActionView(ui.View):
         cols = [d[0] for d in cursor.description]
         data = dict(zip(cols, row))
         
-        data['participants'] = json.loads(data['participants'])
-        data['cancellations'] = json.loads(data['cancellations'])
+        async with db.execute("SELECT user_id FROM action_participants WHERE message_id = ? ORDER BY position", (interaction.message.id,)) as cursor:
+            data['participants'] = [r[0] for r in await cursor.fetchall()]
+        data['cancellations'] = json.loads(data['cancellations']) if data['cancellations'] else []
         
         # Renomeia chaves para compatibilidade
         data['name'] = data['action_name']
@@ -678,8 +652,10 @@ class ActionView(ui.View):
         if len(data['participants']) >= data['slots']:
             data['status'] = 'FULL'
         
-        await self._update_message(interaction, data)
-        await interaction.response.send_message("✅ Você entrou na ação!", ephemeral=True)
+        await interaction.response.defer(ephemeral=True) # Primeiro uso na guild pode baixar a lista de membros
+        if not await self._update_message(interaction, data):
+            return await interaction.followup.send("❌ Esta ação já foi finalizada.", ephemeral=True)
+        await interaction.followup.send("✅ Você entrou na ação!", ephemeral=True)
 
     @ui.button(label="Cancelar", style=discord.ButtonStyle.secondary, emoji="✖️", custom_id="act_leave")
     async def leave_action(self, interaction: discord.Interaction, button: ui.Button):
@@ -702,9 +678,11 @@ class ActionView(ui.View):
         if interaction.user.id != data['responsible']: return await interaction.response.send_message("❌ Apenas o responsável.", ephemeral=True)
 
         data['status'] = 'LOSS'
-        await self._update_message(interaction, data)
+        await interaction.response.defer(ephemeral=True)
+        if not await self._update_message(interaction, data):
+            return await interaction.followup.send("❌ Esta ação já foi finalizada.", ephemeral=True)
         await self._log_result(interaction, data) # Loga o resultado
-        await interaction.response.send_message("✅ Resultado registrado: Derrota.", ephemeral=True)
+        await interaction.followup.send("✅ Resultado registrado: Derrota.", ephemeral=True)
 
     @ui.button(label="Votação MVP", style=discord.ButtonStyle.primary, emoji="⭐", custom_id="act_mvp", row=2)
     async def mvp_action(self, interaction: discord.Interaction, button: ui.Button):
@@ -722,8 +700,10 @@ class ActionView(ui.View):
         if interaction.user.id not in data['participants'] and interaction.user.id != data['responsible']:
             return await interaction.response.send_message("❌ Apenas participantes podem votar.", ephemeral=True)
 
+        await interaction.response.defer(ephemeral=True)
+        await self.bot.ensure_members(interaction.guild) # Opções do select usam os nomes dos participantes
         view = MVPVotingView(self.bot, data, interaction.message)
-        await interaction.response.send_message("⭐ **Votação de MVP Iniciada!**\nSelecione abaixo quem foi o destaque da ação.", view=view, ephemeral=True)
+        await interaction.followup.send("⭐ **Votação de MVP Iniciada!**\nSelecione abaixo quem foi o destaque da ação.", view=view, ephemeral=True)
 
     # === NOVOS BOTÕES ===
     @ui.button(label="Notificar", style=discord.ButtonStyle.secondary, emoji="🔔", custom_id="act_notify", row=1)
@@ -758,11 +738,10 @@ class ActionView(ui.View):
 
     # Helper para Log
     async def _log_result(self, interaction, data):
-        async with self.bot.db.execute("SELECT action_logs_channel_id FROM config WHERE guild_id = ?", (interaction.guild.id,)) as cursor:
-            res = await cursor.fetchone()
+        logs_channel_id = self.bot.config_cache.get(interaction.guild.id, 'action_logs_channel_id')
             
-        if res and res[0]:
-            log_chan = interaction.guild.get_channel(res[0])
+        if logs_channel_id:
+            log_chan = interaction.guild.get_channel(logs_channel_id)
             if log_chan:
                 color = COLOR_WIN if data['status'] == 'WIN' else COLOR_LOSS
                 embed = discord.Embed(title=f"Relatório de Ação: {data['name']}", color=color)
@@ -805,27 +784,29 @@ class MVPVotingView(ui.View):
         self.add_item(self.select)
 
     async def vote_callback(self, interaction: discord.Interaction):
+        db = await self.bot.db.for_guild(interaction.guild.id)
         target_id = int(self.select.values[0])
         if target_id == 0: return await interaction.response.send_message("❌ Opção inválida.", ephemeral=True)
         
         # Registra Voto
         try:
-            await self.bot.db.execute("INSERT INTO action_mvp_votes (message_id, voter_id, target_id) VALUES (?, ?, ?)", (self.message.id, interaction.user.id, target_id))
-            await self.bot.db.commit()
+            await db.execute("INSERT INTO action_mvp_votes (message_id, voter_id, target_id) VALUES (?, ?, ?)", (self.message.id, interaction.user.id, target_id))
+            await db.commit()
             await interaction.response.send_message(f"✅ Voto registrado em <@{target_id}>!", ephemeral=True)
         except:
             # Se já votou, atualiza
-            await self.bot.db.execute("UPDATE action_mvp_votes SET target_id = ? WHERE message_id = ? AND voter_id = ?", (target_id, self.message.id, interaction.user.id))
-            await self.bot.db.commit()
+            await db.execute("UPDATE action_mvp_votes SET target_id = ? WHERE message_id = ? AND voter_id = ?", (target_id, self.message.id, interaction.user.id))
+            await db.commit()
             await interaction.response.send_message(f"✅ Voto atualizado para <@{target_id}>!", ephemeral=True)
 
     @ui.button(label="Encerrar Votação (Responsável)", style=discord.ButtonStyle.danger, row=1)
     async def close_voting(self, interaction: discord.Interaction, button: ui.Button):
+        db = await self.bot.db.for_guild(interaction.guild.id)
         if interaction.user.id != self.data['responsible']:
             return await interaction.response.send_message("❌ Apenas o responsável pode encerrar.", ephemeral=True)
             
         # Contabiliza Votos
-        async with self.bot.db.execute("SELECT target_id, COUNT(*) as votes FROM action_mvp_votes WHERE message_id = ? GROUP BY target_id ORDER BY votes DESC LIMIT 1", (self.message.id,)) as cursor:
+        async with db.execute("SELECT target_id, COUNT(*) as votes FROM action_mvp_votes WHERE message_id = ? GROUP BY target_id ORDER BY votes DESC LIMIT 1", (self.message.id,)) as cursor:
             res = await cursor.fetchone()
             
         if not res:
@@ -833,14 +814,19 @@ class MVPVotingView(ui.View):
             
         mvp_id = res[0]
         votes = res[1]
+        await interaction.response.defer() # Responde antes do possível download da lista de membros
         
-        # Atualiza Ação com MVP
-        await self.bot.db.execute("UPDATE faction_actions SET mvp_id = ? WHERE message_id = ?", (mvp_id, self.message.id))
-        await self.bot.db.commit()
+        # Atualiza Ação com MVP (só conta no ranking se ainda não havia MVP)
+        cog = self.bot.get_cog("FactionActions")
+        async with db.execute("UPDATE faction_actions SET mvp_id = ? WHERE message_id = ? AND mvp_id IS NULL", (mvp_id, self.message.id)) as cursor:
+            changed = cursor.rowcount
+        if changed:
+            await cog._bump_ranking(interaction.guild.id, self.data.get('category'), [(mvp_id, 0, 0, 1)])
+        await db.commit()
         
         # Atualiza Embed da Ação
         self.data['mvp_id'] = mvp_id
-        cog = self.bot.get_cog("FactionActions")
+        await self.bot.ensure_members(interaction.guild)
         embed = cog._build_embed(interaction.guild, self.data)
         await self.message.edit(embed=embed)
         
@@ -852,7 +838,7 @@ class MVPVotingView(ui.View):
              # Fallback se não conseguir recuperar a view
              pass
 
-        await interaction.response.edit_message(content=f"🏆 **MVP Definido:** <@{mvp_id}> com {votes} votos!", view=None, embed=None)
+        await interaction.edit_original_response(content=f"🏆 **MVP Definido:** <@{mvp_id}> com {votes} votos!", view=None, embed=None)
 
 class CancelModal(ui.Modal, title="Cancelar Participação"):
     reason = ui.TextInput(label="Motivo do cancelamento", style=discord.TextStyle.short, placeholder="Ex: Tive que sair...")
@@ -869,8 +855,10 @@ class CancelModal(ui.Modal, title="Cancelar Participação"):
 
         if self.data['status'] == 'FULL': self.data['status'] = 'OPEN'
 
-        await self.view._update_message(interaction, self.data)
-        await interaction.response.send_message("✅ Participação cancelada.", ephemeral=True)
+        await interaction.response.defer(ephemeral=True)
+        if not await self.view._update_message(interaction, self.data):
+            return await interaction.followup.send("❌ Esta ação já foi finalizada.", ephemeral=True)
+        await interaction.followup.send("✅ Participação cancelada.", ephemeral=True)
 
 class ProfitModal(ui.Modal, title="Registrar Vitória"):
     profit = ui.TextInput(label="Lucro da Ação", style=discord.TextStyle.paragraph, placeholder="Ex: 1x Glock, 50k dinheiro sujo...")
@@ -883,9 +871,11 @@ class ProfitModal(ui.Modal, title="Registrar Vitória"):
         self.data['status'] = 'WIN'
         self.data['profit'] = self.profit.value
         
-        await self.view._update_message(interaction, self.data)
+        await interaction.response.defer(ephemeral=True)
+        if not await self.view._update_message(interaction, self.data):
+            return await interaction.followup.send("❌ Esta ação já foi finalizada.", ephemeral=True)
         await self.view._log_result(interaction, self.data) # Loga o resultado
-        await interaction.response.send_message("✅ Vitória registrada com lucro!", ephemeral=True)
+        await interaction.followup.send("✅ Vitória registrada com lucro!", ephemeral=True)
 
 class EditActionModal(ui.Modal, title="Editar Ação"):
     def __init__(self, bot, view, data):
@@ -916,8 +906,10 @@ class EditActionModal(ui.Modal, title="Editar Ação"):
         else:
             if self.data['status'] == 'FULL': self.data['status'] = 'OPEN'
             
-        await self.view._update_message(interaction, self.data)
-        await interaction.response.send_message("✅ Ação editada.", ephemeral=True)
+        await interaction.response.defer(ephemeral=True)
+        if not await self.view._update_message(interaction, self.data):
+            return await interaction.followup.send("❌ Esta ação já foi finalizada.", ephemeral=True)
+        await interaction.followup.send("✅ Ação editada.", ephemeral=True)
 
 class ActionConfigView(ui.View):
     def __init__(self, bot, cog):
@@ -927,50 +919,42 @@ class ActionConfigView(ui.View):
 
     @ui.select(cls=discord.ui.ChannelSelect, placeholder="Definir Canal de Ações", channel_types=[discord.ChannelType.text], row=0)
     async def sel_channel(self, interaction: discord.Interaction, select: ui.ChannelSelect):
-        await self.bot.db.execute("UPDATE config SET action_channel_id = ? WHERE guild_id = ?", (select.values[0].id, interaction.guild.id))
-        await self.bot.db.commit()
+        await self.bot.config_cache.update(interaction.guild.id, action_channel_id=select.values[0].id)
         await interaction.response.send_message("✅ Canal de Ações atualizado!", ephemeral=True)
         await self.cog.send_config_panel(interaction, is_edit=True)
 
     @ui.select(cls=discord.ui.ChannelSelect, placeholder="Definir Canal de Logs", channel_types=[discord.ChannelType.text], row=1)
     async def sel_logs(self, interaction: discord.Interaction, select: ui.ChannelSelect):
-        await self.bot.db.execute("UPDATE config SET action_logs_channel_id = ? WHERE guild_id = ?", (select.values[0].id, interaction.guild.id))
-        await self.bot.db.commit()
+        await self.bot.config_cache.update(interaction.guild.id, action_logs_channel_id=select.values[0].id)
         await interaction.response.send_message("✅ Canal de Logs atualizado!", ephemeral=True)
         await self.cog.send_config_panel(interaction, is_edit=True)
 
     @ui.select(cls=discord.ui.ChannelSelect, placeholder="Definir Canal de Ranking Automático", channel_types=[discord.ChannelType.text], row=2)
     async def sel_ranking(self, interaction: discord.Interaction, select: ui.ChannelSelect):
-        await self.bot.db.execute("UPDATE config SET action_ranking_channel_id = ? WHERE guild_id = ?", (select.values[0].id, interaction.guild.id))
-        await self.bot.db.commit()
+        await self.bot.config_cache.update(interaction.guild.id, action_ranking_channel_id=select.values[0].id)
         await interaction.response.send_message("✅ Canal de Ranking atualizado!", ephemeral=True)
         await self.cog.send_config_panel(interaction, is_edit=True)
 
     @ui.select(cls=discord.ui.RoleSelect, placeholder="Definir Cargo de Menção", row=3)
     async def sel_role(self, interaction: discord.Interaction, select: ui.RoleSelect):
-        await self.bot.db.execute("UPDATE config SET action_role_id = ? WHERE guild_id = ?", (select.values[0].id, interaction.guild.id))
-        await self.bot.db.commit()
+        await self.bot.config_cache.update(interaction.guild.id, action_role_id=select.values[0].id)
         await interaction.response.send_message("✅ Cargo de Menção atualizado!", ephemeral=True)
         await self.cog.send_config_panel(interaction, is_edit=True)
 
     @ui.button(label="Configurar Emojis", style=discord.ButtonStyle.primary, emoji="🎨", row=4)
     async def config_emojis(self, interaction: discord.Interaction, button: ui.Button):
         # Fetch current emojis
-        async with self.bot.db.execute("SELECT action_emoji_join, action_emoji_leave, action_emoji_win, action_emoji_loss, action_emoji_notify, action_emoji_edit FROM config WHERE guild_id = ?", (interaction.guild.id,)) as cursor:
-            row = await cursor.fetchone()
-        
-        emojis = row if row else (None, None, None, None, None, None)
+        emojis = self.bot.config_cache.get_many(interaction.guild.id, 'action_emoji_join', 'action_emoji_leave', 'action_emoji_win', 'action_emoji_loss', 'action_emoji_notify', 'action_emoji_edit')
         await interaction.response.send_modal(ActionEmojiModal(self.bot, self.cog, interaction, emojis))
 
     @ui.button(label="Emoji Editar", style=discord.ButtonStyle.secondary, emoji="✏️", row=4)
     async def config_edit_emoji(self, interaction: discord.Interaction, button: ui.Button):
-        async with self.bot.db.execute("SELECT action_emoji_edit FROM config WHERE guild_id = ?", (interaction.guild.id,)) as cursor:
-            res = await cursor.fetchone()
+        current = self.bot.config_cache.get(interaction.guild.id, 'action_emoji_edit', "✏️")
+        await interaction.response.send_modal(ActionEditEmojiModal(self.bot, self.cog, interaction, current))
+
     @ui.button(label="Configurar Webhook", style=discord.ButtonStyle.secondary, emoji="🔗", row=4)
     async def config_webhook(self, interaction: discord.Interaction, button: ui.Button):
-        async with self.bot.db.execute("SELECT action_ranking_webhook FROM config WHERE guild_id = ?", (interaction.guild.id,)) as cursor:
-            res = await cursor.fetchone()
-        current = res[0] if res else ""
+        current = self.bot.config_cache.get(interaction.guild.id, 'action_ranking_webhook', "")
         await interaction.response.send_modal(WebhookConfigModal(self.bot, self.cog, interaction, current))
 
 class WebhookConfigModal(ui.Modal, title="🔗 Configurar Backup Webhook"):
@@ -985,8 +969,7 @@ class WebhookConfigModal(ui.Modal, title="🔗 Configurar Backup Webhook"):
         if url and not url.startswith("http"):
             return await interaction.response.send_message("❌ URL inválida.", ephemeral=True)
             
-        await self.bot.db.execute("UPDATE config SET action_ranking_webhook = ? WHERE guild_id = ?", (url, interaction.guild.id))
-        await self.bot.db.commit()
+        await self.bot.config_cache.update(interaction.guild.id, action_ranking_webhook=url)
         await interaction.response.send_message("✅ Webhook de backup atualizado!", ephemeral=True)
         await self.cog.send_config_panel(self.origin, is_edit=True)
 
@@ -1011,12 +994,12 @@ class ActionEmojiModal(ui.Modal, title="🎨 Configurar Emojis"):
         
     async def on_submit(self, interaction: discord.Interaction):
         await interaction.response.defer(ephemeral=True)
-        await self.bot.db.execute("""
-            UPDATE config SET 
-            action_emoji_join=?, action_emoji_leave=?, action_emoji_win=?, action_emoji_loss=?, action_emoji_notify=?
-            WHERE guild_id=?
-        """, (self.e_join.value, self.e_leave.value, self.e_win.value, self.e_loss.value, self.e_notify.value, interaction.guild.id))
-        await self.bot.db.commit()
+        await self.bot.config_cache.update(
+            interaction.guild.id,
+            action_emoji_join=self.e_join.value, action_emoji_leave=self.e_leave.value,
+            action_emoji_win=self.e_win.value, action_emoji_loss=self.e_loss.value,
+            action_emoji_notify=self.e_notify.value
+        )
         
         await interaction.followup.send("✅ Emojis principais atualizados!", ephemeral=True)
         await self.cog.send_config_panel(self.origin, is_edit=True)
@@ -1029,8 +1012,7 @@ class ActionEditEmojiModal(ui.Modal, title="🎨 Emoji de Edição"):
         self.add_item(self.e_edit)
     
     async def on_submit(self, interaction: discord.Interaction):
-        await self.bot.db.execute("UPDATE config SET action_emoji_edit=? WHERE guild_id=?", (self.e_edit.value, interaction.guild.id))
-        await self.bot.db.commit()
+        await self.bot.config_cache.update(interaction.guild.id, action_emoji_edit=self.e_edit.value)
         await interaction.response.send_message("✅ Emoji de edição atualizado!", ephemeral=True)
         await self.cog.send_config_panel(self.origin, is_edit=True)
 
@@ -1042,11 +1024,20 @@ class ResetRankingConfirmView(ui.View):
     @ui.button(label="SIM, ZERAR TUDO", style=discord.ButtonStyle.danger, emoji="💣")
     async def confirm(self, interaction: discord.Interaction, button: ui.Button):
         await interaction.response.defer()
+        db = await self.bot.db.for_guild(interaction.guild.id)
         
-        # Deleta dados do servidor
-        await self.bot.db.execute("DELETE FROM faction_actions WHERE guild_id = ?", (interaction.guild.id,))
-        await self.bot.db.execute("DELETE FROM action_mvp_votes WHERE guild_id = ?", (interaction.guild.id,))
-        await self.bot.db.commit()
+        # Deleta dados do servidor (tudo ou nada, já commitado ao sair)
+        async with db.write(durable=True) as conn:
+            await conn.execute("DELETE FROM faction_actions WHERE guild_id = ?", (interaction.guild.id,))
+            await conn.execute("DELETE FROM action_participants WHERE guild_id = ?", (interaction.guild.id,))
+            await conn.execute("DELETE FROM action_mvp_votes WHERE guild_id = ?", (interaction.guild.id,))
+            await conn.execute("DELETE FROM ranking_counters WHERE guild_id = ?", (interaction.guild.id,))
+            # Bônus manual não faz parte do histórico: volta para o contador geral
+            await conn.execute("""
+                INSERT INTO ranking_counters (guild_id, user_id, category, total, wins, mvps)
+                SELECT guild_id, user_id, 'ALL', bonus_actions, bonus_wins, bonus_mvps
+                FROM ranking_bonus WHERE guild_id = ?
+            """, (interaction.guild.id,))
         
         await interaction.edit_original_response(content="✅ **Ranking resetado com sucesso!** Todo o histórico foi apagado.", embed=None, view=None)
 
@@ -14,6 +14,8 @@ import matplotlib.pyplot as plt
 from collections import deque
 from discord.ext import commands, tasks
 
+from utils.outbound import PANEL
+
 try:
     sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
     import config
@@ -142,7 +144,7 @@ class General(commands.Cog):
                 else:
                     embed.set_image(url="https://raw.githubusercontent.com/bpevs/transparent-textures/master/1000x1.png")
 
-                await message.edit(embed=embed, attachments=files)
+                await self.bot.outbound.edit(message, PANEL, embed=embed, attachments=files)
             
             except Exception as e:
                 print(f"❌ [PING] Erro ao atualizar msg {msg_id}: {e}")
@@ -187,9 +189,7 @@ class General(commands.Cog):
         # 1. Identificar Tier
         raw_tier = 'free'
         try:
-            async with self.bot.db.execute("SELECT tier FROM licenses WHERE guild_id = ?", (interaction.guild.id,)) as cursor:
-                row = await cursor.fetchone()
-            if row: raw_tier = row[0]
+            raw_tier = await self.bot.licenses.tier(interaction.guild.id)
         except: pass
         
         # DEBUG: Ver o que está vindo do banco
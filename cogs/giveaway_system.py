@@ -1,44 +1,17 @@
 import discord
 from discord.ext import commands, tasks
 from discord import app_commands, ui
-import datetime
 import random
 import asyncio
 import json
+from utils.time_utils import now_ts
 
 class GiveawaySystem(commands.GroupCog, name="sorteio"):
     def __init__(self, bot):
         self.bot = bot
         
     async def cog_load(self):
-        # Tabela PRINCIPAL de Sorteios
-        await self.bot.db.execute("""
-            CREATE TABLE IF NOT EXISTS giveaways (
-                message_id INTEGER PRIMARY KEY,
-                channel_id INTEGER,
-                guild_id INTEGER,
-                title TEXT,
-                description TEXT,
-                prize TEXT,
-                winners_count INTEGER,
-                end_time TIMESTAMP,
-                host_id INTEGER,
-                requirements TEXT DEFAULT '{}',
-                status TEXT DEFAULT 'OPEN'
-            )
-        """)
-        
-        # Tabela de PARTICIPANTES
-        await self.bot.db.execute("""
-            CREATE TABLE IF NOT EXISTS giveaway_entries (
-                giveaway_id INTEGER,
-                user_id INTEGER,
-                PRIMARY KEY (giveaway_id, user_id)
-            )
-        """)
-        await self.bot.db.commit()
-        print("✅ [Giveaway] Tabelas carregadas.")
-        
+        # Tabelas criadas pelas migrações (database/schema.py, v5)
         # Inicia loop
         self.check_giveaways.start()
 
@@ -64,11 +37,8 @@ class GiveawaySystem(commands.GroupCog, name="sorteio"):
         if not interaction.user.guild_permissions.administrator:
             return await interaction.response.send_message("❌ Apenas administradores.", ephemeral=True)
             
-        async with self.bot.db.execute("SELECT giveaway_color, giveaway_emoji FROM config WHERE guild_id = ?", (interaction.guild.id,)) as cursor:
-            data = await cursor.fetchone()
-            
-        current_color = data[0] if data else 3447003
-        current_emoji = data[1] if data else "🎉"
+        current_color = self.bot.config_cache.get(interaction.guild.id, 'giveaway_color', 3447003)
+        current_emoji = self.bot.config_cache.get(interaction.guild.id, 'giveaway_emoji', "🎉")
         
         new_color = current_color
         new_emoji = current_emoji
@@ -87,14 +57,7 @@ class GiveawaySystem(commands.GroupCog, name="sorteio"):
             new_emoji = emoji
             msg.append(f"🎟️ Emoji atualizado para {emoji}")
             
-        await self.bot.db.execute("""
-            INSERT INTO config (guild_id, giveaway_color, giveaway_emoji)
-            VALUES (?, ?, ?)
-            ON CONFLICT(guild_id) DO UPDATE SET
-            giveaway_color = excluded.giveaway_color,
-            giveaway_emoji = excluded.giveaway_emoji
-        """, (interaction.guild.id, new_color, new_emoji))
-        await self.bot.db.commit()
+        await self.bot.config_cache.update(interaction.guild.id, giveaway_color=new_color, giveaway_emoji=new_emoji)
         
         if not msg:
             return await interaction.response.send_message(f"ℹ️ Nenhuma alteração feita.\nAtual: Cor `#{new_color:X}`, Emoji {new_emoji}", ephemeral=True)
@@ -125,9 +88,7 @@ class GiveawaySystem(commands.GroupCog, name="sorteio"):
     @tasks.loop(seconds=10)
     async def check_giveaways(self):
         await self.bot.wait_until_ready()
-        now = datetime.datetime.now()
-        
-        async with self.bot.db.execute("SELECT message_id, channel_id, guild_id, prize, winners_count, host_id, title, description FROM giveaways WHERE status = 'OPEN' AND end_time <= ?", (now,)) as cursor:
+        async with self.bot.db.execute("SELECT message_id, channel_id, guild_id, prize, winners_count, host_id, title, description FROM giveaways WHERE status = 'OPEN' AND end_ts <= ?", (now_ts(),)) as cursor:
             ended_giveaways = await cursor.fetchall()
             
         for gw in ended_giveaways:
@@ -171,9 +132,7 @@ class GiveawaySystem(commands.GroupCog, name="sorteio"):
         winners_mentions = ", ".join([f"<@{uid}>" for uid in winners])
         
         # Busca config de cor
-        async with self.bot.db.execute("SELECT giveaway_color FROM config WHERE guild_id = ?", (guild_id,)) as cursor:
-             data = await cursor.fetchone()
-        color = data[0] if data and data[0] else 0xf1c40f 
+        color = self.bot.config_cache.get(guild_id, 'giveaway_color') or 0xf1c40f
 
         embed = discord.Embed(title=f"🎉 {title or 'TEMOS VENCEDORES!'}", description=f"O sorteio **{prize}** foi finalizado!", color=color)
         if desc:
@@ -226,8 +185,10 @@ class EndGiveawayModal(ui.Modal, title="Encerrar Sorteio"):
             
         if not gw: return await interaction.response.send_message("❌ Sorteio não encontrado.", ephemeral=True)
         
+        await interaction.response.defer(ephemeral=True)
+        await self.bot.ensure_members(interaction.guild) # Anúncio usa o avatar do 1º ganhador
         await self.cog.end_giveaway(gw)
-        await interaction.response.send_message("✅ Sorteio encerrado forçadamente.", ephemeral=True)
+        await interaction.followup.send("✅ Sorteio encerrado forçadamente.", ephemeral=True)
 
 class EndedGiveawayView(ui.View):
     def __init__(self, bot):
@@ -310,8 +271,7 @@ class GiveawayModal(ui.Modal, title="Criar Sorteio"):
         elif time_str.endswith("d"): seconds = int(time_str[:-1]) * 86400
         else: return await interaction.response.send_message("❌ Formato de tempo inválido! Use m (minutos), h (horas) ou d (dias).", ephemeral=True)
         
-        end_time = datetime.datetime.now() + datetime.timedelta(seconds=seconds)
-        timestamp = int(end_time.timestamp())
+        timestamp = now_ts() + seconds
         
         requirements = {}
         role_mention = ""
@@ -325,8 +285,7 @@ class GiveawayModal(ui.Modal, title="Criar Sorteio"):
         except: return await interaction.response.send_message("❌ Nº de Ganhadores deve ser um número.", ephemeral=True)
 
         # BUSCA CONFIG (COR / EMOJI)
-        async with self.bot.db.execute("SELECT giveaway_color, giveaway_emoji FROM config WHERE guild_id = ?", (interaction.guild.id,)) as cursor:
-            data = await cursor.fetchone()
+        data = self.bot.config_cache.get_many(interaction.guild.id, 'giveaway_color', 'giveaway_emoji')
         
         if data and data[0]: color = data[0]
         else: color = 0x3498db
@@ -349,9 +308,9 @@ class GiveawayModal(ui.Modal, title="Criar Sorteio"):
         msg = await interaction.original_response()
         
         await self.bot.db.execute("""
-            INSERT INTO giveaways (message_id, channel_id, guild_id, prize, winners_count, end_time, host_id, requirements, title, description)
+            INSERT INTO giveaways (message_id, channel_id, guild_id, prize, winners_count, end_ts, host_id, requirements, title, description)
             VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """, (msg.id, interaction.channel.id, interaction.guild.id, self.prize.value, winners_count, end_time, interaction.user.id, json.dumps(requirements), self.gw_title.value, self.gw_desc.value))
+        """, (msg.id, interaction.channel.id, interaction.guild.id, self.prize.value, winners_count, timestamp, interaction.user.id, json.dumps(requirements), self.gw_title.value, self.gw_desc.value))
         await self.bot.db.commit()
 
 # ====================================================
@@ -4,6 +4,8 @@ from discord import app_commands, ui
 import datetime
 import asyncio
 
+from utils.outbound import PANEL
+
 INVISIBLE_WIDE_URL = "https://raw.githubusercontent.com/bpevs/transparent-textures/master/1000x1.png"
 
 class Hierarchy(commands.Cog):
@@ -15,41 +17,7 @@ class Hierarchy(commands.Cog):
         self.daily_update.cancel()
 
     async def cog_load(self):
-        # Migração DB
-        print("🔍 [HIERARCHY] Verificando tabelas...")
-        
-        # Tabela de Cargos
-        try:
-            async with self.bot.db.execute("SELECT group_name FROM hierarchy_roles LIMIT 1") as cursor: pass
-        except:
-            print("⚠️ [HIERARCHY] Atualizando tabela de cargos...")
-            try:
-                await self.bot.db.execute("""
-                    CREATE TABLE IF NOT EXISTS hierarchy_roles (
-                        id INTEGER PRIMARY KEY AUTOINCREMENT,
-                        guild_id INTEGER,
-                        role_id INTEGER,
-                        label TEXT,
-                        priority INTEGER,
-                        group_name TEXT DEFAULT 'Principal'
-                    )
-                """)
-                try: await self.bot.db.execute("ALTER TABLE hierarchy_roles ADD COLUMN group_name TEXT DEFAULT 'Principal'")
-                except: pass
-                await self.bot.db.commit()
-            except Exception as e: print(f"❌ [HIERARCHY] Erro migração roles: {e}")
-
-        # Tabela de Mensagens Ativas (Para Auto-Update)
-        await self.bot.db.execute("""
-            CREATE TABLE IF NOT EXISTS hierarchy_messages (
-                message_id INTEGER PRIMARY KEY,
-                channel_id INTEGER,
-                guild_id INTEGER,
-                group_name TEXT
-            )
-        """)
-        await self.bot.db.commit()
-        
+        # Tabelas criadas pelas migrações (database/schema.py, v2)
         # Registra View Persistente
         self.bot.add_view(RefreshHierarchyView(self.bot, self))
         self.bot.add_view(HierarchyConfigView(self.bot, self))
@@ -80,7 +48,7 @@ class Hierarchy(commands.Cog):
                 
                 embed = await self._build_hierarchy_embed(guild, group_name)
                 if embed:
-                    await message.edit(embed=embed)
+                    await self.bot.outbound.edit(message, PANEL, embed=embed)
                     
             except Exception as e:
                 print(f"❌ [HIERARCHY] Erro ao atualizar msg {msg_id}: {e}")
@@ -99,6 +67,8 @@ class Hierarchy(commands.Cog):
         if not rows:
             return None
 
+        await self.bot.ensure_members(guild) # role.members precisa da lista completa
+
         embed = discord.Embed(title=f"🏛️ {group_name.upper()}", color=0x2b2d31)
         embed.set_thumbnail(url=guild.icon.url if guild.icon else self.bot.user.display_avatar.url)
         embed.set_image(url=INVISIBLE_WIDE_URL)
@@ -160,6 +130,8 @@ class Hierarchy(commands.Cog):
         if not rows:
             return await interaction.followup.send(f"❌ Grupo '{grupo}' não encontrado ou vazio.", ephemeral=True)
 
+        await self.bot.ensure_members(interaction.guild)
+
         final_text = f"**LISTA: {grupo.upper()}**\n\n"
         
         for role_id, label in rows:
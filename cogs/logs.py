@@ -4,32 +4,14 @@ from discord import app_commands, ui
 import datetime
 import aiosqlite
 
+from utils.log_sink import LogSink
+
 INVISIBLE_WIDE_URL = "https://raw.githubusercontent.com/bpevs/transparent-textures/master/1000x1.png"
 
 class Logs(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
-
-    async def cog_load(self):
-        # Migração Automática de DB
-        print("🔍 [LOGS] Verificando colunas de log no banco de dados...")
-        try:
-            # Tenta adicionar colunas se não existirem
-            async with self.bot.db.execute("SELECT log_voice_channel_id, log_message_channel_id, log_nickname_channel_id, log_ban_channel_id FROM config LIMIT 1") as cursor:
-                pass
-        except Exception:
-            print("⚠️ [LOGS] Colunas de log não encontradas ou incompletas. Atualizando...")
-            try:
-                # Adiciona colunas uma a uma (SQLite não falha se já existir em versões recentes, mas garantindo)
-                columns = ["log_voice_channel_id", "log_message_channel_id", "log_nickname_channel_id", "log_ban_channel_id"]
-                for col in columns:
-                    try:
-                        await self.bot.db.execute(f"ALTER TABLE config ADD COLUMN {col} INTEGER")
-                    except: pass
-                await self.bot.db.commit()
-                print("✅ [LOGS] Colunas verificadas/adicionadas.")
-            except Exception as e:
-                print(f"❌ [LOGS] Erro na migração: {e}")
+        self.sink = LogSink(bot.outbound) # Agrupa até 10 embeds por mensagem em cada canal de log
 
     # ====================================================
     # ⚙️ PAINEL DE CONFIGURAÇÃO
@@ -39,13 +21,9 @@ class Logs(commands.Cog):
     async def config_logs(self, interaction: discord.Interaction):
         await interaction.response.defer(ephemeral=True)
         
-        async with self.bot.db.execute("SELECT log_voice_channel_id, log_message_channel_id, log_nickname_channel_id, log_ban_channel_id FROM config WHERE guild_id = ?", (interaction.guild.id,)) as cursor:
-            row = await cursor.fetchone()
-            
-        voice_id = row[0] if row else None
-        msg_id = row[1] if row else None
-        nick_id = row[2] if row else None
-        ban_id = row[3] if row else None
+        voice_id, msg_id, nick_id, ban_id = self.bot.config_cache.get_many(
+            interaction.guild.id, 'log_voice_channel_id', 'log_message_channel_id', 'log_nickname_channel_id', 'log_ban_channel_id'
+        )
         
         embed = discord.Embed(title="⚙️ Configuração de Logs", color=0x2b2d31)
         embed.description = (
@@ -71,11 +49,10 @@ class Logs(commands.Cog):
         if member.bot: return
         
         # Busca canal de log
-        async with self.bot.db.execute("SELECT log_voice_channel_id FROM config WHERE guild_id = ?", (member.guild.id,)) as cursor:
-            row = await cursor.fetchone()
-        if not row or not row[0]: return
+        log_id = self.bot.config_cache.get(member.guild.id, 'log_voice_channel_id')
+        if not log_id: return
         
-        log_channel = member.guild.get_channel(row[0])
+        log_channel = member.guild.get_channel(log_id)
         if not log_channel: return
 
         embed = discord.Embed(timestamp=datetime.datetime.now())
@@ -104,18 +81,17 @@ class Logs(commands.Cog):
         else:
             return # Mudança de estado irrelevante (mute/deafen)
 
-        await log_channel.send(embed=embed)
+        self.sink.push(log_channel, embed)
 
     # --- MENSAGEM APAGADA ---
     @commands.Cog.listener()
     async def on_message_delete(self, message):
         if message.author.bot or not message.guild: return
 
-        async with self.bot.db.execute("SELECT log_message_channel_id FROM config WHERE guild_id = ?", (message.guild.id,)) as cursor:
-            row = await cursor.fetchone()
-        if not row or not row[0]: return
+        log_id = self.bot.config_cache.get(message.guild.id, 'log_message_channel_id')
+        if not log_id: return
         
-        log_channel = message.guild.get_channel(row[0])
+        log_channel = message.guild.get_channel(log_id)
         if not log_channel: return
 
         embed = discord.Embed(title="🗑️ Mensagem Apagada", color=0xe74c3c, timestamp=datetime.datetime.now())
@@ -129,7 +105,7 @@ class Logs(commands.Cog):
         embed.set_thumbnail(url=message.author.display_avatar.url)
         embed.set_image(url=INVISIBLE_WIDE_URL)
         
-        await log_channel.send(embed=embed)
+        self.sink.push(log_channel, embed)
 
     # --- MENSAGEM EDITADA ---
     @commands.Cog.listener()
@@ -137,11 +113,10 @@ class Logs(commands.Cog):
         if before.author.bot or not before.guild: return
         if before.content == after.content: return # Ignora mudanças que não são de texto (ex: embed load)
 
-        async with self.bot.db.execute("SELECT log_message_channel_id FROM config WHERE guild_id = ?", (before.guild.id,)) as cursor:
-            row = await cursor.fetchone()
-        if not row or not row[0]: return
+        log_id = self.bot.config_cache.get(before.guild.id, 'log_message_channel_id')
+        if not log_id: return
         
-        log_channel = before.guild.get_channel(row[0])
+        log_channel = before.guild.get_channel(log_id)
         if not log_channel: return
 
         embed = discord.Embed(title="✏️ Mensagem Editada", color=0x3498db, timestamp=datetime.datetime.now())
@@ -154,18 +129,17 @@ class Logs(commands.Cog):
         embed.set_thumbnail(url=before.author.display_avatar.url)
         embed.set_image(url=INVISIBLE_WIDE_URL)
         
-        await log_channel.send(embed=embed)
+        self.sink.push(log_channel, embed)
 
     # --- NICKNAME ALTERADO ---
     @commands.Cog.listener()
     async def on_member_update(self, before, after):
         if before.nick == after.nick: return
         
-        async with self.bot.db.execute("SELECT log_nickname_channel_id FROM config WHERE guild_id = ?", (before.guild.id,)) as cursor:
-            row = await cursor.fetchone()
-        if not row or not row[0]: return
+        log_id = self.bot.config_cache.get(before.guild.id, 'log_nickname_channel_id')
+        if not log_id: return
         
-        log_channel = before.guild.get_channel(row[0])
+        log_channel = before.guild.get_channel(log_id)
         if not log_channel: return
 
         embed = discord.Embed(title="🏷️ Nickname Alterado", color=0x9b59b6, timestamp=datetime.datetime.now())
@@ -177,16 +151,15 @@ class Logs(commands.Cog):
         embed.set_thumbnail(url=after.display_avatar.url)
         embed.set_image(url=INVISIBLE_WIDE_URL)
         
-        await log_channel.send(embed=embed)
+        self.sink.push(log_channel, embed)
 
     # --- MEMBRO BANIDO ---
     @commands.Cog.listener()
     async def on_member_ban(self, guild, user):
-        async with self.bot.db.execute("SELECT log_ban_channel_id FROM config WHERE guild_id = ?", (guild.id,)) as cursor:
-            row = await cursor.fetchone()
-        if not row or not row[0]: return
+        log_id = self.bot.config_cache.get(guild.id, 'log_ban_channel_id')
+        if not log_id: return
         
-        log_channel = guild.get_channel(row[0])
+        log_channel = guild.get_channel(log_id)
         if not log_channel: return
 
         embed = discord.Embed(title="🔨 Membro Banido", color=0xff0000, timestamp=datetime.datetime.now())
@@ -196,16 +169,15 @@ class Logs(commands.Cog):
         embed.set_thumbnail(url=user.display_avatar.url)
         embed.set_image(url=INVISIBLE_WIDE_URL)
         
-        await log_channel.send(embed=embed)
+        self.sink.push(log_channel, embed)
 
     # --- MEMBRO DESBANIDO ---
     @commands.Cog.listener()
     async def on_member_unban(self, guild, user):
-        async with self.bot.db.execute("SELECT log_ban_channel_id FROM config WHERE guild_id = ?", (guild.id,)) as cursor:
-            row = await cursor.fetchone()
-        if not row or not row[0]: return
+        log_id = self.bot.config_cache.get(guild.id, 'log_ban_channel_id')
+        if not log_id: return
         
-        log_channel = guild.get_channel(row[0])
+        log_channel = guild.get_channel(log_id)
         if not log_channel: return
 
         embed = discord.Embed(title="🔓 Membro Desbanido", color=0x2ecc71, timestamp=datetime.datetime.now())
@@ -215,7 +187,7 @@ class Logs(commands.Cog):
         embed.set_thumbnail(url=user.display_avatar.url)
         embed.set_image(url=INVISIBLE_WIDE_URL)
         
-        await log_channel.send(embed=embed)
+        self.sink.push(log_channel, embed)
 
 class LogConfigView(ui.View):
     def __init__(self, bot):
@@ -224,26 +196,22 @@ class LogConfigView(ui.View):
 
     @ui.select(cls=discord.ui.ChannelSelect, placeholder="Selecione Canal de Logs de VOZ", channel_types=[discord.ChannelType.text], row=0)
     async def sel_voice(self, interaction: discord.Interaction, select: ui.ChannelSelect):
-        await self.bot.db.execute("UPDATE config SET log_voice_channel_id = ? WHERE guild_id = ?", (select.values[0].id, interaction.guild.id))
-        await self.bot.db.commit()
+        await self.bot.config_cache.update(interaction.guild.id, log_voice_channel_id=select.values[0].id)
         await interaction.response.send_message(f"✅ Log de Voz definido para {select.values[0].mention}!", ephemeral=True)
 
     @ui.select(cls=discord.ui.ChannelSelect, placeholder="Selecione Canal de Logs de MENSAGEM", channel_types=[discord.ChannelType.text], row=1)
     async def sel_msg(self, interaction: discord.Interaction, select: ui.ChannelSelect):
-        await self.bot.db.execute("UPDATE config SET log_message_channel_id = ? WHERE guild_id = ?", (select.values[0].id, interaction.guild.id))
-        await self.bot.db.commit()
+        await self.bot.config_cache.update(interaction.guild.id, log_message_channel_id=select.values[0].id)
         await interaction.response.send_message(f"✅ Log de Mensagens definido para {select.values[0].mention}!", ephemeral=True)
 
     @ui.select(cls=discord.ui.ChannelSelect, placeholder="Selecione Canal de Logs de NICKNAME", channel_types=[discord.ChannelType.text], row=2)
     async def sel_nick(self, interaction: discord.Interaction, select: ui.ChannelSelect):
-        await self.bot.db.execute("UPDATE config SET log_nickname_channel_id = ? WHERE guild_id = ?", (select.values[0].id, interaction.guild.id))
-        await self.bot.db.commit()
+        await self.bot.config_cache.update(interaction.guild.id, log_nickname_channel_id=select.values[0].id)
         await interaction.response.send_message(f"✅ Log de Nickname definido para {select.values[0].mention}!", ephemeral=True)
 
     @ui.select(cls=discord.ui.ChannelSelect, placeholder="Selecione Canal de Logs de PUNIÇÕES", channel_types=[discord.ChannelType.text], row=3)
     async def sel_ban(self, interaction: discord.Interaction, select: ui.ChannelSelect):
-        await self.bot.db.execute("UPDATE config SET log_ban_channel_id = ? WHERE guild_id = ?", (select.values[0].id, interaction.guild.id))
-        await self.bot.db.commit()
+        await self.bot.config_cache.update(interaction.guild.id, log_ban_channel_id=select.values[0].id)
         await interaction.response.send_message(f"✅ Log de Punições definido para {select.values[0].mention}!", ephemeral=True)
 
 async def setup(bot):
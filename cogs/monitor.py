@@ -68,6 +68,7 @@ class Monitor(commands.Cog):
 
     async def cog_load(self):
         self.bot.add_view(MonitorView(self))
+        self.bot.router.subscribe(self.count_message) # Toda mensagem (roteador já ignora bots)
         print("[+] [Monitor] Views persistentes carregadas.")
         
         # Tenta carregar ID do admin de uma tabela global (se existir) ou usa o default
@@ -78,6 +79,9 @@ class Monitor(commands.Cog):
         if self.bot.is_ready():
             await self.start_session()
 
+    async def cog_unload(self):
+        self.bot.router.unsubscribe(self.count_message)
+
     def get_uptime_str(self):
         diff = int(time.time() - self.start_time)
         d, r = divmod(diff, 86400); h, r = divmod(r, 3600); m, s = divmod(r, 60)
@@ -128,9 +132,7 @@ class Monitor(commands.Cog):
     async def on_ready(self):
         if not self.is_monitoring: await self.start_session()
 
-    @commands.Cog.listener()
-    async def on_message(self, m):
-        if m.author.bot: return
+    async def count_message(self, m):
         self.stats["msgs"] += 1
         if m.attachments: self.stats["uploads"] += 1
 
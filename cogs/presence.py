@@ -34,12 +34,9 @@ class Presence(commands.Cog):
 
     async def send_panel(self, interaction: discord.Interaction, is_edit=False):
         # 1. Pega dados do banco
-        async with self.bot.db.execute("SELECT presence_interval, presence_state FROM config WHERE guild_id = ?", (interaction.guild.id,)) as cursor:
-            config_data = await cursor.fetchone()
-            
         # Valores padrão se não tiver config
-        interval = config_data[0] if config_data else 60
-        state = config_data[1] if config_data else "online"
+        interval = self.bot.config_cache.get(interaction.guild.id, 'presence_interval', 60)
+        state = self.bot.config_cache.get(interaction.guild.id, 'presence_state', "online")
 
         # 2. Pega as frases cadastradas
         async with self.bot.db.execute("SELECT id, activity_type, activity_text FROM presence") as cursor:
@@ -190,8 +187,7 @@ class IntervalModal(ui.Modal, title="Alterar Intervalo"):
             sec = int(self.seconds.value)
             if sec < 10: sec = 10
             
-            await self.bot.db.execute("UPDATE config SET presence_interval = ? WHERE guild_id = ?", (sec, interaction.guild.id))
-            await self.bot.db.commit()
+            await self.bot.config_cache.update(interaction.guild.id, presence_interval=sec)
             
             await interaction.response.send_message(f"✅ Intervalo alterado para {sec}s.", ephemeral=True)
             await self.cog.send_panel(self.origin, is_edit=True)
@@ -255,10 +251,7 @@ class PresenceView(ui.View):
     @ui.button(label="Modo", style=discord.ButtonStyle.primary, emoji="🚦")
     async def mode_btn(self, interaction: discord.Interaction, button: ui.Button):
         # Ciclo: Online -> Idle -> DND -> Invisible
-        async with self.bot.db.execute("SELECT presence_state FROM config WHERE guild_id = ?", (interaction.guild.id,)) as cursor:
-            curr = await cursor.fetchone()
-        
-        curr = curr[0] if curr else "online"
+        curr = self.bot.config_cache.get(interaction.guild.id, 'presence_state', "online")
         states = ["online", "idle", "dnd", "invisible"]
         
         try: next_idx = (states.index(curr) + 1) % len(states)
@@ -266,8 +259,7 @@ class PresenceView(ui.View):
         
         new_state = states[next_idx]
         
-        await self.bot.db.execute("UPDATE config SET presence_state = ? WHERE guild_id = ?", (new_state, interaction.guild.id))
-        await self.bot.db.commit()
+        await self.bot.config_cache.update(interaction.guild.id, presence_state=new_state)
         
         await interaction.response.defer() # Apenas carrega, não manda msg
         await self.cog.send_panel(interaction, is_edit=True)
@@ -3,6 +3,8 @@ from discord import app_commands
 from discord.ext import commands
 import datetime
 from typing import Optional
+from utils.time_utils import now_ts, fmt_ts
+from database.archive import all_time
 
 # ==============================================================================
 # VIEW: DASHBOARD DE CONFIGURAÇÃO (Configuração Visual e Canais)
@@ -34,22 +36,19 @@ class PunishmentDashboardView(discord.ui.View):
     @discord.ui.select(cls=discord.ui.ChannelSelect, channel_types=[discord.ChannelType.text], placeholder="Canal de Tickets...", min_values=1, max_values=1, row=1)
     async def select_ticket_channel(self, interaction: discord.Interaction, select: discord.ui.ChannelSelect):
         channel = select.values[0]
-        await self.bot.db.execute("INSERT INTO config (guild_id, ticket_panel_channel_id) VALUES (?, ?) ON CONFLICT(guild_id) DO UPDATE SET ticket_panel_channel_id = ?", (interaction.guild.id, channel.id, channel.id))
-        await self.bot.db.commit()
+        await self.bot.config_cache.update(interaction.guild.id, ticket_panel_channel_id=channel.id)
         await interaction.response.send_message(f"✅ Canal de Tickets vinculado: {channel.mention}", ephemeral=True)
 
     @discord.ui.select(cls=discord.ui.ChannelSelect, channel_types=[discord.ChannelType.text], placeholder="Canal de Alinhamento...", min_values=1, max_values=1, row=2)
     async def select_align_channel(self, interaction: discord.Interaction, select: discord.ui.ChannelSelect):
         channel = select.values[0]
-        await self.bot.db.execute("INSERT INTO config (guild_id, alignment_channel_id) VALUES (?, ?) ON CONFLICT(guild_id) DO UPDATE SET alignment_channel_id = ?", (interaction.guild.id, channel.id, channel.id))
-        await self.bot.db.commit()
+        await self.bot.config_cache.update(interaction.guild.id, alignment_channel_id=channel.id)
         await interaction.response.send_message(f"✅ Canal de Alinhamento vinculado: {channel.mention}", ephemeral=True)
 
     @discord.ui.select(cls=discord.ui.ChannelSelect, channel_types=[discord.ChannelType.text], placeholder="Canal de Punições (Logs do Membro)...", min_values=1, max_values=1, row=3)
     async def select_punish_channel(self, interaction: discord.Interaction, select: discord.ui.ChannelSelect):
         channel = select.values[0]
-        await self.bot.db.execute("UPDATE config SET punish_channel_id = ? WHERE guild_id = ?", (channel.id, interaction.guild.id))
-        await self.bot.db.commit()
+        await self.bot.config_cache.update(interaction.guild.id, punish_channel_id=channel.id)
         await interaction.response.send_message(f"✅ Canal de Punições vinculado: {channel.mention}", ephemeral=True)
 
 
@@ -65,8 +64,7 @@ class PunishmentTextModal(discord.ui.Modal, title="Configurar Textos de Puniçã
         self.bot = bot
 
     async def on_submit(self, interaction: discord.Interaction):
-        await self.bot.db.execute("UPDATE config SET punish_title = ?, punish_desc = ? WHERE guild_id = ?", (self.title_field.value, self.desc_field.value, interaction.guild.id))
-        await self.bot.db.commit()
+        await self.bot.config_cache.update(interaction.guild.id, punish_title=self.title_field.value, punish_desc=self.desc_field.value)
         await interaction.response.send_message("✅ **Textos Atualizados!**", ephemeral=True)
 
 class PunishmentEmojiModal(discord.ui.Modal, title="Configurar Emojis"):
@@ -79,8 +77,7 @@ class PunishmentEmojiModal(discord.ui.Modal, title="Configurar Emojis"):
         self.bot = bot
 
     async def on_submit(self, interaction: discord.Interaction):
-        await self.bot.db.execute("UPDATE config SET punish_emoji_warn = ?, punish_emoji_feedback = ?, punish_emoji_ban = ? WHERE guild_id = ?", (self.warn.value, self.feedback.value, self.ban.value, interaction.guild.id))
-        await self.bot.db.commit()
+        await self.bot.config_cache.update(interaction.guild.id, punish_emoji_warn=self.warn.value, punish_emoji_feedback=self.feedback.value, punish_emoji_ban=self.ban.value)
         await interaction.response.send_message("✅ **Emojis Atualizados!**", ephemeral=True)
 
 class PunishmentColorModal(discord.ui.Modal, title="Configurar Cor da Embed"):
@@ -97,8 +94,7 @@ class PunishmentColorModal(discord.ui.Modal, title="Configurar Cor da Embed"):
         except ValueError:
             return await interaction.response.send_message("❌ **Cor Inválida!** Use formato HEX (Ex: FFD700).", ephemeral=True)
             
-        await self.bot.db.execute("UPDATE config SET punish_color = ? WHERE guild_id = ?", (int_color, interaction.guild.id))
-        await self.bot.db.commit()
+        await self.bot.config_cache.update(interaction.guild.id, punish_color=int_color)
         await interaction.response.send_message(f"✅ **Cor Atualizada!** (Preview: #{clean_hex})", ephemeral=True)
 
 
@@ -156,6 +152,7 @@ class Punishments(commands.Cog):
         targets = []
         if user: targets.append(user)
         if role:
+            await self.bot.ensure_members(interaction.guild)
             for m in role.members:
                 if m not in targets: targets.append(m)
 
@@ -175,9 +172,9 @@ class Punishments(commands.Cog):
             # 1. DB Log
             # Saving 'punicao' in the 'conclusion' column to persist it for history
             await self.bot.db.execute("""
-                INSERT INTO org_punishments (guild_id, user_id, staff_id, type, reason, conclusion)
-                VALUES (?, ?, ?, ?, ?, ?)
-            """, (interaction.guild.id, target.id, interaction.user.id, "manual", motivo, punicao))
+                INSERT INTO org_punishments (guild_id, user_id, staff_id, type, reason, conclusion, created_ts)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+            """, (interaction.guild.id, target.id, interaction.user.id, "manual", motivo, punicao, now_ts()))
             
             # 2. Notification (Public Channel or DM)
             # Layout Premium / "Senior Dev" Style (Ticket Sync)
@@ -291,6 +288,7 @@ class Punishments(commands.Cog):
                 return await interaction.response.send_message("⛔ Apenas Administradores podem limpar o histórico.", ephemeral=True)
                 
             await self.bot.db.execute("DELETE FROM org_punishments WHERE user_id = ? AND guild_id = ?", (self.target_id, interaction.guild.id))
+            await self.bot.db.execute("DELETE FROM archive.org_punishments WHERE user_id = ? AND guild_id = ?", (self.target_id, interaction.guild.id))
             await self.bot.db.commit()
             await interaction.response.edit_message(content=f"✅ Histórico limpo por {interaction.user.mention}!", embed=None, view=None)
 
@@ -298,7 +296,9 @@ class Punishments(commands.Cog):
         if not interaction.user.guild_permissions.manage_messages:
             return await interaction.response.send_message("⛔ **Sem permissão.**", ephemeral=True)
 
-        async with self.bot.db.execute("SELECT type, reason, conclusion, staff_id, timestamp FROM org_punishments WHERE user_id = ? AND guild_id = ? ORDER BY id DESC LIMIT 10", (user.id, interaction.guild.id)) as cursor:
+        # Ficha completa: inclui as anotações já arquivadas
+        source = all_time("org_punishments", "id, guild_id, user_id, type, reason, conclusion, staff_id, timestamp, created_ts")
+        async with self.bot.db.execute(f"SELECT type, reason, conclusion, staff_id, timestamp, created_ts FROM {source} WHERE user_id = ? AND guild_id = ? ORDER BY id DESC LIMIT 10", (user.id, interaction.guild.id)) as cursor:
             rows = await cursor.fetchall()
         
         conf = await self.get_config(interaction.guild.id)
@@ -314,7 +314,8 @@ class Punishments(commands.Cog):
         separator = "━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━"
         
         for row in rows:
-            p_type, reason, conclusion, staff_id, date = row
+            p_type, reason, conclusion, staff_id, date, created_ts = row
+            if created_ts: date = fmt_ts(created_ts)
             staff = interaction.guild.get_member(staff_id)
             staff_mention = staff.mention if staff else f"<@{staff_id}>"
             
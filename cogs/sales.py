@@ -2,6 +2,8 @@ import discord
 from discord.ext import commands
 from discord import app_commands, ui
 import datetime
+from utils.time_utils import now_ts, days_ago_ts, month_start_ts
+from database.archive import all_time
 
 INVISIBLE_WIDE_URL = "https://raw.githubusercontent.com/bpevs/transparent-textures/master/1000x1.png"
 
@@ -9,27 +11,6 @@ class Sales(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
 
-    async def cog_load(self):
-        # Tabela de Vendas
-        await self.bot.db.execute("""
-            CREATE TABLE IF NOT EXISTS sales (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                guild_id INTEGER,
-                seller_id INTEGER,
-                item TEXT,
-                quantity INTEGER,
-                price INTEGER,
-                buyer TEXT,
-                is_partnership INTEGER,
-                timestamp TIMESTAMP
-            )
-        """)
-        
-        # Atualiza Config se necessário (existem outras colunas no bot_db.py, aqui só garante as de log se falhar lá)
-        # O bot_db.py já cuida das migrações principais.
-        await self.bot.db.commit()
-        print("✅ [Sales] Tabelas carregadas.")
-
     @commands.Cog.listener()
     async def on_ready(self):
         # View persistente para escutar interações (o visual não importa aqui, só o custom_id)
@@ -56,7 +37,7 @@ class Sales(commands.Cog):
         
         if logs:
             try:
-                await self.bot.db.execute("UPDATE config SET sales_log_channel_id = ? WHERE guild_id = ?", (logs.id, interaction.guild.id))
+                await self.bot.config_cache.update(interaction.guild.id, commit=False, sales_log_channel_id=logs.id)
                 msg.append(f"✅ Logs definidos para {logs.mention}")
             except Exception as e:
                 msg.append(f"❌ Erro ao salvar logs: {e}")
@@ -65,21 +46,21 @@ class Sales(commands.Cog):
             try:
                 hex_clean = hex_color.replace("#", "")
                 new_color = int(hex_clean, 16)
-                await self.bot.db.execute("UPDATE config SET sales_panel_color = ? WHERE guild_id = ?", (new_color, interaction.guild.id))
+                await self.bot.config_cache.update(interaction.guild.id, commit=False, sales_panel_color=new_color)
                 msg.append(f"🎨 Cor do Painel atualizada para `#{hex_clean}`")
             except:
                 msg.append("❌ Cor inválida! Use formato Hex (Ex: #FF0000).")
 
         if emoji:
-            await self.bot.db.execute("UPDATE config SET sales_btn_emoji = ? WHERE guild_id = ?", (emoji, interaction.guild.id))
+            await self.bot.config_cache.update(interaction.guild.id, commit=False, sales_btn_emoji=emoji)
             msg.append(f"💰 Emoji Painel atualizado para {emoji}")
 
         if emoji_normal:
-            await self.bot.db.execute("UPDATE config SET sales_emoji_normal = ? WHERE guild_id = ?", (emoji_normal, interaction.guild.id))
+            await self.bot.config_cache.update(interaction.guild.id, commit=False, sales_emoji_normal=emoji_normal)
             msg.append(f"💵 Emoji 'Normal' atualizado para {emoji_normal}")
 
         if emoji_parceria:
-            await self.bot.db.execute("UPDATE config SET sales_emoji_partnership = ? WHERE guild_id = ?", (emoji_parceria, interaction.guild.id))
+            await self.bot.config_cache.update(interaction.guild.id, commit=False, sales_emoji_partnership=emoji_parceria)
             msg.append(f"🤝 Emoji 'Parceria' atualizado para {emoji_parceria}")
 
         await self.bot.db.commit()
@@ -92,8 +73,7 @@ class Sales(commands.Cog):
     @app_commands.checks.has_permissions(administrator=True)
     async def sales_panel(self, interaction: discord.Interaction):
         # Busca config
-        async with self.bot.db.execute("SELECT sales_panel_color, sales_btn_emoji FROM config WHERE guild_id = ?", (interaction.guild.id,)) as cursor:
-            data = await cursor.fetchone()
+        data = self.bot.config_cache.get_many(interaction.guild.id, 'sales_panel_color', 'sales_btn_emoji')
             
         # Defaults
         color = data[0] if data and data[0] else 0x2ecc71
@@ -123,6 +103,7 @@ class Sales(commands.Cog):
         app_commands.Choice(name="Geral (Todo o tempo)", value="all")
     ])
     async def sales_ranking(self, interaction: discord.Interaction, periodo: app_commands.Choice[str] = None):
+        db = await self.bot.db.for_guild(interaction.guild.id)
         period_val = periodo.value if periodo else "all"
         guild_id = interaction.guild.id
         
@@ -130,34 +111,38 @@ class Sales(commands.Cog):
             query = """
                 SELECT seller_id, SUM(price) as total 
                 FROM sales 
-                WHERE guild_id = ? AND timestamp >= datetime('now', '-7 days', 'localtime')
+                WHERE guild_id = ? AND created_ts >= ?
                 GROUP BY seller_id 
                 ORDER BY total DESC 
                 LIMIT 10
             """
+            params = (guild_id, days_ago_ts(7))
             title_text = "🏆 Ranking Semanal de Vendas"
         elif period_val == "monthly":
             query = """
                 SELECT seller_id, SUM(price) as total 
                 FROM sales 
-                WHERE guild_id = ? AND timestamp >= datetime('now', 'start of month', 'localtime')
+                WHERE guild_id = ? AND created_ts >= ?
                 GROUP BY seller_id 
                 ORDER BY total DESC 
                 LIMIT 10
             """
+            params = (guild_id, month_start_ts())
             title_text = "🏆 Ranking Mensal de Vendas"
         else:
-            query = """
+            # Geral: vendas quentes + arquivadas
+            query = f"""
                 SELECT seller_id, SUM(price) as total 
-                FROM sales 
+                FROM {all_time('sales', 'guild_id, seller_id, price')} 
                 WHERE guild_id = ? 
                 GROUP BY seller_id 
                 ORDER BY total DESC 
                 LIMIT 10
             """
+            params = (guild_id,)
             title_text = "🏆 Ranking Geral de Vendas"
             
-        async with self.bot.db.execute(query, (guild_id,)) as cursor:
+        async with db.execute(query, params) as cursor:
             rows = await cursor.fetchall()
             
         if not rows:
@@ -221,8 +206,7 @@ class SalesModal(ui.Modal, title="Registrar Venda"):
         }
         
         # Busca config para os emojis dos botões
-        async with self.bot.db.execute("SELECT sales_emoji_normal, sales_emoji_partnership FROM config WHERE guild_id = ?", (interaction.guild.id,)) as cursor:
-            res = await cursor.fetchone()
+        res = self.bot.config_cache.get_many(interaction.guild.id, 'sales_emoji_normal', 'sales_emoji_partnership')
             
         e_normal = res[0] if res and res[0] else "💵"
         e_partnership = res[1] if res and res[1] else "🤝"
@@ -250,16 +234,16 @@ class SalesTypeView(ui.View):
         self.add_item(btn_part)
 
     async def _finish(self, interaction, is_partnership):
+        db = await self.bot.db.for_guild(interaction.guild.id)
         # Salva no DB
-        await self.bot.db.execute("""
-            INSERT INTO sales (guild_id, seller_id, item, quantity, price, buyer, is_partnership, timestamp)
+        await db.execute("""
+            INSERT INTO sales (guild_id, seller_id, item, quantity, price, buyer, is_partnership, created_ts)
             VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-        """, (interaction.guild.id, interaction.user.id, self.data['item'], self.data['qty'], self.data['price'], self.data['buyer'], 1 if is_partnership else 0, datetime.datetime.now()))
-        await self.bot.db.commit()
+        """, (interaction.guild.id, interaction.user.id, self.data['item'], self.data['qty'], self.data['price'], self.data['buyer'], 1 if is_partnership else 0, now_ts()))
+        await db.commit()
         
         # Log
-        async with self.bot.db.execute("SELECT sales_log_channel_id FROM config WHERE guild_id = ?", (interaction.guild.id,)) as cursor:
-            res = await cursor.fetchone()
+        res = self.bot.config_cache.get_many(interaction.guild.id, 'sales_log_channel_id')
             
         if res and res[0]:
             channel = interaction.guild.get_channel(res[0])
@@ -12,40 +12,7 @@ class Setagem(commands.Cog):
         self.bot = bot
 
     async def cog_load(self):
-        # Migração DB
-        print("🔍 [SETAGEM] Verificando tabelas e colunas...")
-        await self.bot.db.execute("""
-            CREATE TABLE IF NOT EXISTS set_config (
-                guild_id INTEGER PRIMARY KEY,
-                channel_analysis INTEGER,
-                channel_log INTEGER,
-                role_verified INTEGER,
-                role_unverified INTEGER,
-                set_approve_emoji TEXT,
-                set_reject_emoji TEXT,
-                embed_color TEXT
-            )
-        """)
-        
-        # Migração de Coluna (Caso a tabela já exista sem embed_color)
-        try:
-            await self.bot.db.execute("ALTER TABLE set_config ADD COLUMN embed_color TEXT")
-            await self.bot.db.commit()
-            print("✅ [SETAGEM] Coluna 'embed_color' adicionada.")
-        except Exception:
-            pass # Coluna já existe
-
-        # Tabela de Cargos Selecionáveis
-        await self.bot.db.execute("""
-            CREATE TABLE IF NOT EXISTS set_selectable_roles (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                guild_id INTEGER,
-                role_id INTEGER,
-                label TEXT
-            )
-        """)
-        await self.bot.db.commit()
-        
+        # Tabelas criadas pelas migrações (database/schema.py, v3)
         # Registra View Persistente
         self.bot.add_view(self.SetRequestView(self.bot, self))
         self.bot.add_view(SetagemDashboardView(self.bot, self))
@@ -198,6 +165,7 @@ class Setagem(commands.Cog):
             role_unver = interaction.guild.get_role(config[1]) if config[1] else None
             log_channel = interaction.guild.get_channel(config[2]) if config[2] else None
             
+            await self.bot.ensure_members(interaction.guild)
             target = interaction.guild.get_member(self.target_id)
             
             # Ações Logic
@@ -279,6 +247,7 @@ class Setagem(commands.Cog):
 
         async def on_submit(self, interaction: discord.Interaction):
             await interaction.response.defer()
+            await self.bot.ensure_members(interaction.guild)
             target = interaction.guild.get_member(self.target_id)
             
             # Update Staff Embed (Red)
@@ -6,6 +6,8 @@ import os
 import io
 import csv
 import datetime
+from utils.time_utils import month_start_ts, fmt_ts
+from database.archive import all_time
 
 # Tenta importar as configurações
 try:
@@ -37,24 +39,25 @@ class StaffStats(commands.Cog):
     ])
     @app_commands.checks.has_permissions(administrator=True)
     async def ranking_staff(self, interaction: discord.Interaction, periodo: app_commands.Choice[str] = None):
+        db = await self.bot.db.for_guild(interaction.guild.id)
         await interaction.response.defer()
 
         mode = periodo.value if periodo else "geral"
         
-        sql = "SELECT staff_id, COUNT(*) as total, AVG(stars) as media FROM staff_ratings WHERE guild_id = ?"
         params = [interaction.guild.id]
 
         if mode == "mes":
-            current_month = datetime.datetime.now().strftime('%Y-%m-01')
-            sql += " AND date >= ?"
-            params.append(current_month)
+            sql = "SELECT staff_id, COUNT(*) as total, AVG(stars) as media FROM staff_ratings WHERE guild_id = ? AND created_ts >= ?"
+            params.append(month_start_ts())
             title_text = f"🏆 Staff do Mês ({datetime.datetime.now().strftime('%m/%Y')})"
         else:
+            # Geral: inclui avaliações arquivadas
+            sql = f"SELECT staff_id, COUNT(*) as total, AVG(stars) as media FROM {all_time('staff_ratings', 'guild_id, staff_id, stars')} WHERE guild_id = ?"
             title_text = "🏆 Ranking Geral de Atendimento"
 
         sql += " GROUP BY staff_id ORDER BY media DESC, total DESC LIMIT 10"
 
-        async with self.bot.db.execute(sql, tuple(params)) as cursor:
+        async with db.execute(sql, tuple(params)) as cursor:
             rank_data = await cursor.fetchall()
 
         if not rank_data:
@@ -91,9 +94,10 @@ class StaffStats(commands.Cog):
     @app_commands.command(name="relatorio_staff", description="📂 Baixa planilha com TODAS as avaliações (Auditoria)")
     @app_commands.checks.has_permissions(administrator=True)
     async def export_csv(self, interaction: discord.Interaction):
+        db = await self.bot.db.for_guild(interaction.guild.id)
         await interaction.response.defer(ephemeral=True)
 
-        async with self.bot.db.execute("SELECT staff_id, user_id, stars, date FROM staff_ratings WHERE guild_id = ? ORDER BY date DESC", (interaction.guild.id,)) as cursor:
+        async with db.execute(f"SELECT staff_id, user_id, stars, created_ts FROM {all_time('staff_ratings', 'guild_id, staff_id, user_id, stars, created_ts')} WHERE guild_id = ? ORDER BY created_ts DESC", (interaction.guild.id,)) as cursor:
             rows = await cursor.fetchall()
 
         if not rows:
@@ -104,9 +108,8 @@ class StaffStats(commands.Cog):
         writer.writerow(["Data", "Nome Staff", "ID Staff", "Nome Cliente", "ID Cliente", "Nota"])
 
         for row in rows:
-            staff_id, user_id, stars, date_str = row
-            try: dt = datetime.datetime.fromisoformat(date_str).strftime("%d/%m/%Y %H:%M")
-            except: dt = date_str
+            staff_id, user_id, stars, created_ts = row
+            dt = fmt_ts(created_ts)
 
             s_member = interaction.guild.get_member(staff_id)
             u_member = interaction.guild.get_member(user_id)
@@ -129,10 +132,11 @@ class StaffStats(commands.Cog):
     # ====================================================
     @app_commands.command(name="meus_stats", description="📊 Suas estatísticas pessoais")
     async def my_stats(self, interaction: discord.Interaction):
+        db = await self.bot.db.for_guild(interaction.guild.id)
         await interaction.response.defer(ephemeral=True)
 
-        query = "SELECT COUNT(*) as total, AVG(stars) as media FROM staff_ratings WHERE guild_id = ? AND staff_id = ?"
-        async with self.bot.db.execute(query, (interaction.guild.id, interaction.user.id)) as cursor:
+        query = f"SELECT COUNT(*) as total, AVG(stars) as media FROM {all_time('staff_ratings', 'guild_id, staff_id, stars')} WHERE guild_id = ? AND staff_id = ?"
+        async with db.execute(query, (interaction.guild.id, interaction.user.id)) as cursor:
             data = await cursor.fetchone()
 
         total, media = data if data else (0, 0)
@@ -10,6 +10,8 @@ class Streaming(commands.Cog):
         self.bot = bot
         # Regex básico para Twitch e Youtube
         self.url_regex = re.compile(r"(https?://(?:www\.|go\.)?twitch\.tv/([a-z0-9_]+))|(https?://(?:www\.)?youtube\.com/watch\?v=([a-zA-Z0-9_-]+))|(https?://youtu\.be/([a-zA-Z0-9_-]+))")
+        # (guild_id, user_id) com live ativa: espelho em memória de active_streams
+        self.live = set()
 
     async def get_stream_metadata(self, url):
         """Tenta obter título e jogo da página (Simples Scraping)"""
@@ -50,21 +52,26 @@ class Streaming(commands.Cog):
             print(f"Erro scraping: {e}")
             return None
 
+    async def cog_load(self):
+        # Só mensagens do canal de divulgação chegam aqui (utils/message_router.py)
+        self.bot.router.subscribe(self.on_stream_message, 'streaming_channel_id')
+        await self.load_live()
+
+    async def load_live(self):
+        """Carrega quem está em live (boot e restauração do banco)."""
+        async with self.bot.db.execute("SELECT guild_id, user_id FROM active_streams") as cursor:
+            self.live = {(row[0], row[1]) for row in await cursor.fetchall()}
+
     @commands.Cog.listener()
-    async def on_message(self, message):
-        if message.author.bot: return
-        if not message.guild: return
-        
-        # 1. Verifica se está no canal de divulgação configurado
-        config = await self.bot.db.execute("SELECT streaming_channel_id, streaming_role_id FROM config WHERE guild_id = ?", (message.guild.id,))
-        row = await config.fetchone()
-        
-        if not row or not row[0]: return # Não configurado
-        
-        streaming_channel_id = row[0]
-        streaming_role_id = row[1]
-        
-        if message.channel.id != streaming_channel_id: return
+    async def on_database_restored(self):
+        await self.load_live()
+
+    async def cog_unload(self):
+        self.bot.router.unsubscribe(self.on_stream_message)
+
+    async def on_stream_message(self, message):
+        # 1. O roteador já filtrou o canal de divulgação configurado
+        streaming_role_id = self.bot.config_cache.get(message.guild.id, 'streaming_role_id')
 
         # 2. Busca Link
         match = self.url_regex.search(message.content)
@@ -125,12 +132,14 @@ class Streaming(commands.Cog):
                 VALUES (?, ?, ?, ?, ?, ?)
             """, (sent_msg.id, message.channel.id, message.guild.id, message.author.id, str(datetime.now()), url))
             await self.bot.db.commit()
+            self.live.add((message.guild.id, message.author.id))
 
     async def _terminate_stream(self, guild, user_id, active_stream_data):
         """Helper para encerrar uma live (usado pelo evento e pelo comando manual)"""
         msg_id, chan_id, guild_id, start_time_str = active_stream_data[0], active_stream_data[1], active_stream_data[2], active_stream_data[3] if len(active_stream_data) > 3 else None
         
-        # 1. Remove do DB
+        # 1. Remove do DB (e da memória antes de qualquer await)
+        self.live.discard((guild_id, user_id))
         await self.bot.db.execute("DELETE FROM active_streams WHERE message_id = ?", (msg_id,))
         await self.bot.db.commit()
         
@@ -163,36 +172,42 @@ class Streaming(commands.Cog):
                      pass
 
              # 4. Remove Cargo
-             config = await self.bot.db.execute("SELECT streaming_role_id FROM config WHERE guild_id = ?", (guild.id,))
-             row = await config.fetchone()
-             if row and row[0]:
-                 role = guild.get_role(row[0])
-                 target_member = guild.get_member(user_id)
-                 if role and target_member:
-                     try: await target_member.remove_roles(role)
+             role_id = self.bot.config_cache.get(guild.id, 'streaming_role_id')
+             if role_id:
+                 role = guild.get_role(role_id)
+                 if role:
+                     try:
+                         target_member = guild.get_member(user_id) or await guild.fetch_member(user_id) # Fora do cache após reinício
+                         await target_member.remove_roles(role)
                      except: pass
         return True
 
     @commands.Cog.listener()
-    async def on_presence_update(self, before, after):
-        # Otimização: Só checa se o user tiver cargo de streaming OU estiver na tabela active_streams
+    async def on_raw_presence_update(self, payload):
+        # Evento cru (enable_raw_presences): chega mesmo com o streamer fora do
+        # cache de membros, que não é baixado no boot (utils/intents.py)
+        # Quase ninguém está em live: sai sem await nenhum
+        key = (payload.guild_id, payload.user_id)
+        if key not in self.live: return
+
         is_streaming = False
-        for activity in after.activities:
+        for activity in payload.activities:
             if activity.type == discord.ActivityType.streaming:
                 is_streaming = True
                 break
         
         if is_streaming: return # Ainda está em live, ignora.
 
-        # Se não está streaming, verifica se ele tinha uma live ativa no DB
-        # E pega START_TIME também
-        async with self.bot.db.execute("SELECT message_id, channel_id, guild_id, start_time FROM active_streams WHERE user_id = ? AND guild_id = ?", (after.id, after.guild.id)) as cursor:
+        # Saiu da live: tira do conjunto já (outro evento de presença não repete o fluxo)
+        # e busca os dados da divulgação (START_TIME também)
+        self.live.discard(key)
+        async with self.bot.db.execute("SELECT message_id, channel_id, guild_id, start_time FROM active_streams WHERE user_id = ? AND guild_id = ?", (payload.user_id, payload.guild_id)) as cursor:
             active_stream = await cursor.fetchone()
         
         if not active_stream: return # Não estava na nossa lista
 
         # ACABOU A LIVE
-        await self._terminate_stream(after.guild, after.id, active_stream)
+        await self._terminate_stream(payload.guild, payload.user_id, active_stream)
 
     @discord.app_commands.command(name="encerrar_live", description="🛑 Força o encerramento da divulgação de uma live.")
     @discord.app_commands.checks.has_permissions(manage_messages=True)
@@ -213,11 +228,7 @@ class Streaming(commands.Cog):
         await interaction.response.defer(ephemeral=True)
         
         # Busca config atual
-        cursor = await self.bot.db.execute("SELECT streaming_channel_id, streaming_role_id FROM config WHERE guild_id = ?", (interaction.guild.id,))
-        row = await cursor.fetchone()
-        
-        current_channel_id = row[0] if row else None
-        current_role_id = row[1] if row else None
+        current_channel_id, current_role_id = self.bot.config_cache.get_many(interaction.guild.id, 'streaming_channel_id', 'streaming_role_id')
         
         current_channel = interaction.guild.get_channel(current_channel_id) if current_channel_id else None
         current_role = interaction.guild.get_role(current_role_id) if current_role_id else None
@@ -239,9 +250,7 @@ class Streaming(commands.Cog):
         # Check de Permissão (Dono ou V8)
         is_owner = interaction.user.id == int(interaction.client.owner_id or 0)
         if not is_owner:
-             async with self.bot.db.execute("SELECT tier FROM licenses WHERE guild_id = ?", (interaction.guild.id,)) as cursor:
-                row = await cursor.fetchone()
-             if not row or row[0] != 'v8':
+             if await self.bot.licenses.tier(interaction.guild.id) != 'v8':
                  await interaction.response.send_message("🔒 **Recurso Exclusivo V8.**", ephemeral=True)
                  return
         
@@ -267,8 +276,7 @@ class StreamingConfigView(discord.ui.View):
         if interaction.user != self.author: return
         channel = select.values[0]
         
-        await self.bot.db.execute("INSERT INTO config (guild_id, streaming_channel_id) VALUES (?, ?) ON CONFLICT(guild_id) DO UPDATE SET streaming_channel_id = ?", (interaction.guild.id, channel.id, channel.id))
-        await self.bot.db.commit()
+        await self.bot.config_cache.update(interaction.guild.id, streaming_channel_id=channel.id)
         
         await interaction.response.send_message(f"✅ Canal definido para {channel.mention}", ephemeral=True)
 
@@ -277,8 +285,7 @@ class StreamingConfigView(discord.ui.View):
         if interaction.user != self.author: return
         role = select.values[0]
         
-        await self.bot.db.execute("INSERT INTO config (guild_id, streaming_role_id) VALUES (?, ?) ON CONFLICT(guild_id) DO UPDATE SET streaming_role_id = ?", (interaction.guild.id, role.id, role.id))
-        await self.bot.db.commit()
+        await self.bot.config_cache.update(interaction.guild.id, streaming_role_id=role.id)
         
         await interaction.response.send_message(f"✅ Cargo definido para {role.mention}", ephemeral=True)
 
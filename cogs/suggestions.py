@@ -34,9 +34,7 @@ class Suggestions(commands.Cog):
         await self.send_panel(interaction)
 
     async def send_panel(self, interaction: discord.Interaction, is_edit=False):
-        async with self.bot.db.execute("SELECT * FROM config WHERE guild_id = ?", (interaction.guild.id,)) as cursor:
-            row = await cursor.fetchone()
-            data = dict(zip([d[0] for d in cursor.description], row)) if row else {}
+        data = self.bot.config_cache.get(interaction.guild.id)
 
         chan_id = data.get('sugg_channel_id')
         chan = self.bot.get_channel(chan_id) if chan_id else None
@@ -69,15 +67,14 @@ class Suggestions(commands.Cog):
     # ====================================================
     # 📨 EVENTO DE MENSAGEM (GATILHO)
     # ====================================================
-    @commands.Cog.listener()
-    async def on_message(self, message):
-        if message.author.bot: return
-        
-        async with self.bot.db.execute("SELECT sugg_channel_id FROM config WHERE guild_id = ?", (message.guild.id,)) as cursor:
-            res = await cursor.fetchone()
-        
-        if not res or message.channel.id != res[0]: return
+    async def cog_load(self):
+        # Só mensagens do canal de sugestões chegam aqui (utils/message_router.py)
+        self.bot.router.subscribe(self.on_suggestion_message, 'sugg_channel_id')
+
+    async def cog_unload(self):
+        self.bot.router.unsubscribe(self.on_suggestion_message)
 
+    async def on_suggestion_message(self, message):
         try: await message.delete()
         except: pass 
 
@@ -123,8 +120,7 @@ class Suggestions(commands.Cog):
         perc_up = (votes['up'] / total * 100) if total > 0 else 0
         perc_down = (votes['down'] / total * 100) if total > 0 else 0
 
-        async with self.bot.db.execute("SELECT sugg_up_emoji, sugg_down_emoji, sugg_color FROM config WHERE guild_id = ?", (interaction.guild.id,)) as cursor:
-            res = await cursor.fetchone()
+        res = self.bot.config_cache.get_many(interaction.guild.id, 'sugg_up_emoji', 'sugg_down_emoji', 'sugg_color')
         
         up_emj = res[0] or "✅"
         down_emj = res[1] or "❌"
@@ -205,15 +201,12 @@ class ConfirmSuggestionView(ui.View):
         await interaction.response.defer(ephemeral=True)
 
         try:
-            async with self.bot.db.execute("SELECT sugg_count, sugg_color, sugg_up_emoji, sugg_down_emoji FROM config WHERE guild_id = ?", (interaction.guild.id,)) as cursor:
-                res = await cursor.fetchone()
-                count = (res[0] or 0) + 1
-                color = res[1] or config.EMBED_COLOR
-                up_emj = res[2] or "✅"
-                down_emj = res[3] or "❌"
+            res = self.bot.config_cache.get_many(interaction.guild.id, 'sugg_color', 'sugg_up_emoji', 'sugg_down_emoji')
+            color = res[0] or config.EMBED_COLOR
+            up_emj = res[1] or "✅"
+            down_emj = res[2] or "❌"
 
-            await self.bot.db.execute("UPDATE config SET sugg_count = ? WHERE guild_id = ?", (count, interaction.guild.id))
-            await self.bot.db.commit()
+            count = await self.bot.counters.next(interaction.guild.id, 'suggestion')
 
             # Construct Embed
             embed = discord.Embed(title=f"💡 Sugestão #{count:03d}", color=color)
@@ -315,11 +308,7 @@ class ConfigSuggModal(ui.Modal, title="🎨 Visual Sugestões"):
         try: col = int(self.color.value.replace("#", ""), 16)
         except: return await interaction.followup.send("Cor inválida!")
 
-        await self.bot.db.execute("""
-            UPDATE config SET sugg_color = ?, sugg_up_emoji = ?, sugg_down_emoji = ? 
-            WHERE guild_id = ?
-        """, (col, self.up.value, self.down.value, interaction.guild.id))
-        await self.bot.db.commit()
+        await self.bot.config_cache.update(interaction.guild.id, sugg_color=col, sugg_up_emoji=self.up.value, sugg_down_emoji=self.down.value)
         await interaction.followup.send("✅ Configuração salva!")
         await self.cog.send_panel(self.origin, is_edit=True)
 
@@ -332,14 +321,12 @@ class AdminSuggView(ui.View):
     @ui.select(cls=discord.ui.ChannelSelect, placeholder="Selecione o Canal de Sugestões...", channel_types=[discord.ChannelType.text])
     async def sel_chan(self, interaction: discord.Interaction, select: ui.ChannelSelect):
         await interaction.response.defer()
-        await self.bot.db.execute("UPDATE config SET sugg_channel_id = ? WHERE guild_id = ?", (select.values[0].id, interaction.guild.id))
-        await self.bot.db.commit()
+        await self.bot.config_cache.update(interaction.guild.id, sugg_channel_id=select.values[0].id)
         await self.cog.send_panel(interaction, is_edit=True)
 
     @ui.button(label="Editar Visual (Emojis/Cor)", style=discord.ButtonStyle.secondary, emoji="🎨")
     async def edit_vis(self, interaction: discord.Interaction, button: ui.Button):
-        async with self.bot.db.execute("SELECT sugg_color, sugg_up_emoji, sugg_down_emoji FROM config WHERE guild_id = ?", (interaction.guild.id,)) as cursor:
-            res = await cursor.fetchone()
+        res = self.bot.config_cache.get_many(interaction.guild.id, 'sugg_color', 'sugg_up_emoji', 'sugg_down_emoji')
         
         col = res[0] or config.EMBED_COLOR
         up = res[1] or "✅"
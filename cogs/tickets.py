@@ -8,6 +8,7 @@ import uuid
 from discord.ext import commands
 from discord import app_commands, ui
 import aiohttp
+from utils.time_utils import now_ts
 
 try:
     sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -76,7 +77,8 @@ class Tickets(commands.Cog):
             
             for (g_id,) in guilds:
                 # Pega categorias dessa guild
-                async with self.bot.db.execute("SELECT id, label, description, emoji FROM ticket_categories WHERE guild_id = ?", (g_id,)) as cursor:
+                db = await self.bot.db.for_guild(g_id)
+                async with db.execute("SELECT id, label, description, emoji FROM ticket_categories WHERE guild_id = ?", (g_id,)) as cursor:
                     cats = await cursor.fetchall()
                 
                 if cats:
@@ -95,11 +97,10 @@ class Tickets(commands.Cog):
         await self.send_admin_panel(interaction)
 
     async def send_admin_panel(self, interaction: discord.Interaction, is_edit=False):
-        async with self.bot.db.execute("SELECT * FROM config WHERE guild_id = ?", (interaction.guild.id,)) as cursor:
-            row = await cursor.fetchone()
-            cfg = dict(zip([d[0] for d in cursor.description], row)) if row else {}
+        db = await self.bot.db.for_guild(interaction.guild.id)
+        cfg = self.bot.config_cache.get(interaction.guild.id)
 
-        async with self.bot.db.execute("SELECT COUNT(*) FROM ticket_categories WHERE guild_id = ?", (interaction.guild.id,)) as cursor:
+        async with db.execute("SELECT COUNT(*) FROM ticket_categories WHERE guild_id = ?", (interaction.guild.id,)) as cursor:
             cat_count = (await cursor.fetchone())[0]
 
         cat_channel = self.bot.get_channel(cfg.get('ticket_category_id'))
@@ -136,27 +137,26 @@ class Tickets(commands.Cog):
     # 🛫 CRIAR TICKET
     # ====================================================
     async def create_ticket(self, interaction, category_id, reason):
-        async with self.bot.db.execute("""
-            SELECT ticket_category_id, ticket_support_role_id, ticket_count, 
-                   tk_emoji_claim, tk_emoji_admin, tk_emoji_close, ticket_color, tk_emoji_voice 
-            FROM config WHERE guild_id = ?
-        """, (interaction.guild.id,)) as cursor:
-            res = await cursor.fetchone()
+        db = await self.bot.db.for_guild(interaction.guild.id)
+        res = self.bot.config_cache.get_many(
+            interaction.guild.id,
+            'ticket_category_id', 'ticket_support_role_id',
+            'tk_emoji_claim', 'tk_emoji_admin', 'tk_emoji_close', 'ticket_color', 'tk_emoji_voice'
+        )
             
-        if not res or not res[1]:
+        if not res[1]:
             return await interaction.followup.send("❌ Sistema em manutenção ou não configurado.", ephemeral=True)
         
-        global_cat_id, role_id, count, e_claim, e_admin, e_close, t_color, e_voice = res
-        count = (count or 0) + 1
+        global_cat_id, role_id, e_claim, e_admin, e_close, t_color, e_voice = res
         
-        async with self.bot.db.execute("SELECT label, emoji, location_id FROM ticket_categories WHERE id = ?", (category_id,)) as cursor:
+        async with db.execute("SELECT label, emoji, location_id FROM ticket_categories WHERE id = ?", (category_id,)) as cursor:
             cat_data = await cursor.fetchone()
             cat_name = cat_data[0] if cat_data else "Ticket"
             cat_emoji = cat_data[1] if cat_data else "🎫"
             specific_cat_id = cat_data[2] if cat_data else None
 
-        await self.bot.db.execute("UPDATE config SET ticket_count = ? WHERE guild_id = ?", (count, interaction.guild.id))
-        await self.bot.db.commit()
+        # Número do ticket gravado antes de criar o canal
+        count = await self.bot.counters.next(interaction.guild.id, 'ticket', durable=True)
 
         target_category_id = specific_cat_id if specific_cat_id else global_cat_id
         category = self.bot.get_channel(target_category_id)
@@ -179,8 +179,8 @@ class Tickets(commands.Cog):
         except Exception as e:
             return await interaction.followup.send(f"❌ Erro ao criar canal: {e}", ephemeral=True)
 
-        await self.bot.db.execute("INSERT INTO active_tickets (channel_id, guild_id, user_id, opened_at) VALUES (?, ?, ?, ?)", (ticket_channel.id, interaction.guild.id, interaction.user.id, datetime.datetime.now().isoformat()))
-        await self.bot.db.commit()
+        await db.execute("INSERT INTO active_tickets (channel_id, guild_id, user_id, opened_at) VALUES (?, ?, ?, ?)", (ticket_channel.id, interaction.guild.id, interaction.user.id, datetime.datetime.now().isoformat()))
+        await db.commit()
 
         embed = discord.Embed(color=final_color)
         embed.set_author(name=f"Atendimento Iniciado | {cat_name}", icon_url=interaction.guild.icon.url if interaction.guild.icon else None)
@@ -250,8 +250,11 @@ class VisualConfigModal(ui.Modal, title="🎨 Visual do Painel"):
         await interaction.response.defer(ephemeral=True)
         try: col = int(self.t_color.value.replace("#", ""), 16)
         except: return await interaction.followup.send("❌ Cor inválida!")
-        await self.bot.db.execute("UPDATE config SET ticket_title=?, ticket_desc=?, ticket_color=?, ticket_banner=?, ticket_viewer_url=? WHERE guild_id=?", (self.t_title.value, self.t_desc.value, col, self.t_banner.value, self.t_viewer.value, interaction.guild.id))
-        await self.bot.db.commit()
+        await self.bot.config_cache.update(
+            interaction.guild.id,
+            ticket_title=self.t_title.value, ticket_desc=self.t_desc.value, ticket_color=col,
+            ticket_banner=self.t_banner.value, ticket_viewer_url=self.t_viewer.value
+        )
         await interaction.followup.send("✅ Configuração Salva!")
         await self.cog.send_admin_panel(self.origin, is_edit=True)
 
@@ -267,8 +270,11 @@ class InternalButtonsModal(ui.Modal, title="⚙️ Botões Internos"):
         self.add_item(self.i_claim); self.add_item(self.i_admin); self.add_item(self.i_close); self.add_item(self.i_cancel); self.add_item(self.i_voice)
     async def on_submit(self, interaction: discord.Interaction):
         await interaction.response.defer(ephemeral=True)
-        await self.bot.db.execute("UPDATE config SET tk_emoji_claim=?, tk_emoji_admin=?, tk_emoji_close=?, tk_emoji_cancel=?, tk_emoji_voice=? WHERE guild_id=?", (self.i_claim.value, self.i_admin.value, self.i_close.value, self.i_cancel.value, self.i_voice.value, interaction.guild.id))
-        await self.bot.db.commit()
+        await self.bot.config_cache.update(
+            interaction.guild.id,
+            tk_emoji_claim=self.i_claim.value, tk_emoji_admin=self.i_admin.value, tk_emoji_close=self.i_close.value,
+            tk_emoji_cancel=self.i_cancel.value, tk_emoji_voice=self.i_voice.value
+        )
         await interaction.followup.send("✅ Botões atualizados!")
         await self.cog.send_admin_panel(self.origin, is_edit=True)
 
@@ -282,15 +288,16 @@ class CategoryModal(ui.Modal):
         self.c_loc = ui.TextInput(label="ID Categoria Discord (Opcional)", default=str(current_loc) if current_loc else "", required=False)
         self.add_item(self.c_name); self.add_item(self.c_desc); self.add_item(self.c_emoji); self.add_item(self.c_loc)
     async def on_submit(self, interaction: discord.Interaction):
+        db = await self.bot.db.for_guild(interaction.guild.id)
         await interaction.response.defer(ephemeral=True)
         loc_id = int(self.c_loc.value) if self.c_loc.value.isdigit() else None
         if self.cat_id:
-            await self.bot.db.execute("UPDATE ticket_categories SET label=?, description=?, emoji=?, location_id=? WHERE id=?", (self.c_name.value, self.c_desc.value, self.c_emoji.value, loc_id, self.cat_id))
+            await db.execute("UPDATE ticket_categories SET label=?, description=?, emoji=?, location_id=? WHERE id=?", (self.c_name.value, self.c_desc.value, self.c_emoji.value, loc_id, self.cat_id))
             msg = "✅ Categoria Atualizada!"
         else:
-            await self.bot.db.execute("INSERT INTO ticket_categories (guild_id, label, description, emoji, location_id) VALUES (?, ?, ?, ?, ?)", (interaction.guild.id, self.c_name.value, self.c_desc.value, self.c_emoji.value, loc_id))
+            await db.execute("INSERT INTO ticket_categories (guild_id, label, description, emoji, location_id) VALUES (?, ?, ?, ?, ?)", (interaction.guild.id, self.c_name.value, self.c_desc.value, self.c_emoji.value, loc_id))
             msg = "✅ Categoria Criada!"
-        await self.bot.db.commit()
+        await db.commit()
         await interaction.followup.send(msg)
         await self.cog.send_admin_panel(self.origin, is_edit=True)
 
@@ -306,17 +313,17 @@ class RatingView(ui.View):
         self.transcript_url = transcript_url
     
     async def rate(self, interaction, stars):
+        db = await self.bot.db.for_guild(self.guild.id)
         # 1. Salva no Banco
         staff_id = self.staff_member.id if self.staff_member else 0
-        await self.bot.db.execute("INSERT INTO staff_ratings (guild_id, staff_id, user_id, stars, date) VALUES (?, ?, ?, ?, ?)", (self.guild.id, staff_id, interaction.user.id, stars, datetime.datetime.now().isoformat()))
-        await self.bot.db.commit()
+        await db.execute("INSERT INTO staff_ratings (guild_id, staff_id, user_id, stars, created_ts) VALUES (?, ?, ?, ?, ?)", (self.guild.id, staff_id, interaction.user.id, stars, now_ts()))
+        await db.commit()
         
         # 2. Envia Embed para o Canal de Log
-        async with self.bot.db.execute("SELECT rating_channel_id FROM config WHERE guild_id = ?", (self.guild.id,)) as cursor:
-            res = await cursor.fetchone()
+        rating_channel_id = self.bot.config_cache.get(self.guild.id, 'rating_channel_id')
         
-        if res and res[0]:
-            rating_channel = self.guild.get_channel(res[0])
+        if rating_channel_id:
+            rating_channel = self.guild.get_channel(rating_channel_id)
             if rating_channel:
                 embed_log = discord.Embed(title="⭐ Nova Avaliação Recebida", color=0xf1c40f) # Dourado
                 embed_log.set_thumbnail(url=self.bot.user.display_avatar.url)
@@ -366,9 +373,10 @@ class TicketControlView(ui.View):
 
     @ui.button(label="Assumir Ticket", style=discord.ButtonStyle.secondary, custom_id="tk_claim")
     async def claim_ticket(self, interaction: discord.Interaction, button: ui.Button):
+        db = await self.bot.db.for_guild(interaction.guild.id)
         await interaction.response.defer()
-        await self.bot.db.execute("UPDATE active_tickets SET claimed_by = ? WHERE channel_id = ?", (interaction.user.id, interaction.channel.id))
-        await self.bot.db.commit()
+        await db.execute("UPDATE active_tickets SET claimed_by = ? WHERE channel_id = ?", (interaction.user.id, interaction.channel.id))
+        await db.commit()
         message = interaction.message
         embed = message.embeds[0]
         new_fields = [f for f in embed.fields if "Staff Responsável" not in f.name]
@@ -417,9 +425,7 @@ class TicketControlView(ui.View):
 
     @ui.button(label="Fechar Ticket", style=discord.ButtonStyle.secondary, custom_id="tk_close")
     async def close_ticket(self, interaction: discord.Interaction, button: ui.Button):
-        async with self.bot.db.execute("SELECT tk_emoji_cancel FROM config WHERE guild_id = ?", (interaction.guild.id,)) as cursor:
-            res = await cursor.fetchone()
-        cancel_emoji = res[0] if res and res[0] else "🛑"
+        cancel_emoji = self.bot.config_cache.get(interaction.guild.id, 'tk_emoji_cancel') or "🛑"
         view = CloseTimerView(self.bot, interaction.user, cancel_emoji)
         await interaction.response.send_message("Fechando ticket em **20** segundos...\nClique abaixo para cancelar.", view=view)
         msg = await interaction.original_response()
@@ -437,8 +443,9 @@ class TicketAdminOptionsView(ui.View):
         await interaction.response.send_modal(MemberControlModal("remove"))
     @ui.button(label="Notificar Autor", emoji="🔔", style=discord.ButtonStyle.primary)
     async def notify_user(self, interaction: discord.Interaction, button: ui.Button):
+        db = await self.bot.db.for_guild(interaction.guild.id)
         await interaction.response.defer(ephemeral=True)
-        async with self.bot.db.execute("SELECT user_id FROM active_tickets WHERE channel_id = ?", (interaction.channel.id,)) as cursor:
+        async with db.execute("SELECT user_id FROM active_tickets WHERE channel_id = ?", (interaction.channel.id,)) as cursor:
             res = await cursor.fetchone()
         if res:
             try:
@@ -475,6 +482,7 @@ class CloseTimerView(ui.View):
         self.stop()
 
 async def perform_ticket_close_timer(bot, channel, closed_by_user, view, message):
+    db = await bot.db.for_guild(channel.guild.id)
     try:
         for i in range(20, 0, -5):
             if view.cancelled: return
@@ -486,10 +494,11 @@ async def perform_ticket_close_timer(bot, channel, closed_by_user, view, message
         if view.cancelled: return
         
         # === 1. DADOS ===
-        async with bot.db.execute("SELECT user_id, opened_at, claimed_by FROM active_tickets WHERE channel_id = ?", (channel.id,)) as cursor:
+        async with db.execute("SELECT user_id, opened_at, claimed_by FROM active_tickets WHERE channel_id = ?", (channel.id,)) as cursor:
             t_data = await cursor.fetchone()
         opener_id, opened_at_str, claimer_id = t_data if t_data else (None, None, None)
         
+        await bot.ensure_members(channel.guild)
         opener = channel.guild.get_member(opener_id) if opener_id else None
         claimer = channel.guild.get_member(claimer_id) if claimer_id else None
         
@@ -504,11 +513,8 @@ async def perform_ticket_close_timer(bot, channel, closed_by_user, view, message
         file_path = os.path.join("transcripts", file_name)
         with open(file_path, "w", encoding="utf-8") as f: f.write(html_source)
 
-        async with bot.db.execute("SELECT ticket_viewer_url, ticket_logs_id FROM config WHERE guild_id = ?", (channel.guild.id,)) as cursor:
-            res_cfg = await cursor.fetchone()
-        
-        base_url = res_cfg[0] if res_cfg and res_cfg[0] else ""
-        logs_id = res_cfg[1] if res_cfg else None
+        base_url, logs_id = bot.config_cache.get_many(channel.guild.id, 'ticket_viewer_url', 'ticket_logs_id')
+        base_url = base_url or ""
         if base_url and not base_url.endswith('/'): base_url += '/'
         final_url = f"{base_url}{file_name}" if base_url else "#"
 
@@ -543,14 +549,11 @@ async def perform_ticket_close_timer(bot, channel, closed_by_user, view, message
     except Exception as e: print(f"Erro no fechamento: {e}")
     finally:
         if not view.cancelled:
-            await bot.db.execute("DELETE FROM active_tickets WHERE channel_id = ?", (channel.id,))
-            await bot.db.commit()
+            await db.execute("DELETE FROM active_tickets WHERE channel_id = ?", (channel.id,))
+            await db.commit()
             
             # === 5. BACKUP WEBHOOK ===
-            async with bot.db.execute("SELECT ticket_backup_webhook FROM config WHERE guild_id = ?", (channel.guild.id,)) as cursor:
-                res_bkp = await cursor.fetchone()
-            
-            webhook_url = res_bkp[0] if res_bkp else None
+            webhook_url = bot.config_cache.get(channel.guild.id, 'ticket_backup_webhook')
             
             if webhook_url:
                 try:
@@ -600,8 +603,7 @@ class BackupConfigModal(ui.Modal, title="📦 Backup via Webhook"):
         self.add_item(self.webhook)
     async def on_submit(self, interaction: discord.Interaction):
         await interaction.response.defer(ephemeral=True)
-        await self.bot.db.execute("UPDATE config SET ticket_backup_webhook=? WHERE guild_id=?", (self.webhook.value, interaction.guild.id))
-        await self.bot.db.commit()
+        await self.bot.config_cache.update(interaction.guild.id, ticket_backup_webhook=self.webhook.value)
         await interaction.followup.send("✅ Webhook de Backup atualizado!")
         await self.cog.send_admin_panel(self.origin, is_edit=True)
 
@@ -611,40 +613,31 @@ class GlobalSettingsView(ui.View):
         self.bot = bot; self.cog = cog; self.origin = origin_interaction
     @ui.button(label="Editar Visual", emoji="🎨", style=discord.ButtonStyle.primary)
     async def edit_visual(self, interaction: discord.Interaction, button: ui.Button):
-        async with self.bot.db.execute("SELECT ticket_title, ticket_desc, ticket_color, ticket_banner, ticket_viewer_url FROM config WHERE guild_id=?", (interaction.guild.id,)) as c:
-            res = await c.fetchone()
-        t, d, c, b, v = res if res else (None, None, None, None, None)
+        t, d, c, b, v = self.bot.config_cache.get_many(interaction.guild.id, 'ticket_title', 'ticket_desc', 'ticket_color', 'ticket_banner', 'ticket_viewer_url')
         await interaction.response.send_modal(VisualConfigModal(self.bot, self.cog, self.origin, t, d, c, b, v))
     @ui.button(label="Botões Internos", emoji="⚙️", style=discord.ButtonStyle.secondary)
     async def edit_buttons(self, interaction: discord.Interaction, button: ui.Button):
-        async with self.bot.db.execute("SELECT tk_emoji_claim, tk_emoji_admin, tk_emoji_close, tk_emoji_cancel, tk_emoji_voice FROM config WHERE guild_id=?", (interaction.guild.id,)) as c:
-            res = await c.fetchone()
-        ec, ea, el, ecan, ev = res if res else (None, None, None, None, None)
+        ec, ea, el, ecan, ev = self.bot.config_cache.get_many(interaction.guild.id, 'tk_emoji_claim', 'tk_emoji_admin', 'tk_emoji_close', 'tk_emoji_cancel', 'tk_emoji_voice')
         await interaction.response.send_modal(InternalButtonsModal(self.bot, self.cog, self.origin, ec, ea, el, ecan, ev))
     @ui.button(label="Configurar Backup", emoji="📦", style=discord.ButtonStyle.secondary, row=1)
     async def config_backup(self, interaction: discord.Interaction, button: ui.Button):
-        async with self.bot.db.execute("SELECT ticket_backup_webhook FROM config WHERE guild_id=?", (interaction.guild.id,)) as c:
-            res = await c.fetchone()
-        wh = res[0] if res else None
+        wh = self.bot.config_cache.get(interaction.guild.id, 'ticket_backup_webhook')
         await interaction.response.send_modal(BackupConfigModal(self.bot, self.cog, self.origin, wh))
     @ui.select(cls=discord.ui.RoleSelect, placeholder="Definir Cargo Suporte", row=2)
     async def sel_role(self, interaction: discord.Interaction, select: ui.RoleSelect):
-        await self.bot.db.execute("UPDATE config SET ticket_support_role_id = ? WHERE guild_id = ?", (select.values[0].id, interaction.guild.id))
-        await self.bot.db.commit()
+        await self.bot.config_cache.update(interaction.guild.id, ticket_support_role_id=select.values[0].id)
         await interaction.response.send_message("✅ Cargo atualizado!", ephemeral=True)
         await self.cog.send_admin_panel(self.origin, is_edit=True)
     @ui.select(cls=discord.ui.ChannelSelect, placeholder="Definir Categoria Padrão", channel_types=[discord.ChannelType.category], row=3)
     async def sel_cat(self, interaction: discord.Interaction, select: ui.ChannelSelect):
-        await self.bot.db.execute("UPDATE config SET ticket_category_id = ? WHERE guild_id = ?", (select.values[0].id, interaction.guild.id))
-        await self.bot.db.commit()
+        await self.bot.config_cache.update(interaction.guild.id, ticket_category_id=select.values[0].id)
         await interaction.response.send_message("✅ Categoria Padrão atualizada!", ephemeral=True)
         await self.cog.send_admin_panel(self.origin, is_edit=True)
     
     # SELEÇÃO DE CANAIS DE LOGS (Agrupados)
     @ui.select(cls=discord.ui.ChannelSelect, placeholder="Definir Canal de Logs GERAIS", channel_types=[discord.ChannelType.text], row=4)
     async def sel_log(self, interaction: discord.Interaction, select: ui.ChannelSelect):
-        await self.bot.db.execute("UPDATE config SET ticket_logs_id = ? WHERE guild_id = ?", (select.values[0].id, interaction.guild.id))
-        await self.bot.db.commit()
+        await self.bot.config_cache.update(interaction.guild.id, ticket_logs_id=select.values[0].id)
         await interaction.response.send_message("✅ Canal de logs de Tickets atualizado!", ephemeral=True)
         await self.cog.send_admin_panel(self.origin, is_edit=True)
 
@@ -654,12 +647,14 @@ class CategoryControlView(ui.View):
     async def new_cat(self, i, b): await i.response.send_modal(CategoryModal(self.bot, self.cog, self.origin))
     @ui.button(label="Editar Categoria", style=discord.ButtonStyle.primary, emoji="✏️")
     async def edit_cat(self, i, b):
-        async with self.bot.db.execute("SELECT id, label, description, emoji, location_id FROM ticket_categories WHERE guild_id = ?", (i.guild.id,)) as c: cats=await c.fetchall()
+        db = await self.bot.db.for_guild(i.guild.id)
+        async with db.execute("SELECT id, label, description, emoji, location_id FROM ticket_categories WHERE guild_id = ?", (i.guild.id,)) as c: cats=await c.fetchall()
         if not cats: return await i.response.send_message("Nenhuma categoria.", ephemeral=True)
         await i.response.send_message("Selecione:", view=CategoryEditSelectView(self.bot, self.cog, self.origin, cats), ephemeral=True)
     @ui.button(label="Excluir Categoria", style=discord.ButtonStyle.danger, emoji="🗑️")
     async def del_cat(self, i, b):
-        async with self.bot.db.execute("SELECT id, label FROM ticket_categories WHERE guild_id = ?", (i.guild.id,)) as c: cats=await c.fetchall()
+        db = await self.bot.db.for_guild(i.guild.id)
+        async with db.execute("SELECT id, label FROM ticket_categories WHERE guild_id = ?", (i.guild.id,)) as c: cats=await c.fetchall()
         if not cats: return await i.response.send_message("Nenhuma categoria.", ephemeral=True)
         await i.response.send_message("Selecione:", view=CategoryDeleteSelectView(self.bot, self.cog, self.origin, cats), ephemeral=True)
     
@@ -673,8 +668,7 @@ class RatingChannelSelectView(ui.View):
         super().__init__(timeout=60); self.bot=bot; self.cog=cog; self.origin=origin
     @ui.select(cls=discord.ui.ChannelSelect, placeholder="Selecione o canal...", channel_types=[discord.ChannelType.text])
     async def callback(self, interaction: discord.Interaction, select: ui.ChannelSelect):
-        await self.bot.db.execute("UPDATE config SET rating_channel_id = ? WHERE guild_id = ?", (select.values[0].id, interaction.guild.id))
-        await self.bot.db.commit()
+        await self.bot.config_cache.update(interaction.guild.id, rating_channel_id=select.values[0].id)
         await interaction.response.send_message(f"✅ Avaliações serão enviadas para {select.values[0].mention}!", ephemeral=True)
         await self.cog.send_admin_panel(self.origin, is_edit=True)
 
@@ -693,7 +687,8 @@ class CategoryDeleteSelectView(ui.View):
         options = [discord.SelectOption(label=c[1], value=str(c[0])) for c in cats]
         self.select = ui.Select(placeholder="Excluir...", options=options); self.select.callback = self.callback; self.add_item(self.select)
     async def callback(self, i):
-        await self.bot.db.execute("DELETE FROM ticket_categories WHERE id = ?", (int(self.select.values[0]),)); await self.bot.db.commit()
+        db = await self.bot.db.for_guild(i.guild.id)
+        await db.execute("DELETE FROM ticket_categories WHERE id = ?", (int(self.select.values[0]),)); await db.commit()
         await i.response.send_message("🗑️ Removida!", ephemeral=True); await self.cog.send_admin_panel(self.origin, is_edit=True)
 
 class UserTicketSelect(ui.Select):
@@ -713,9 +708,10 @@ class AdminTicketView(ui.View):
     async def cats_main(self, i, b): await i.response.send_message("📂 **Gestão de Categorias**", view=CategoryControlView(self.bot, self.cog, i), ephemeral=True)
     @ui.button(label="POSTAR PAINEL PÚBLICO", style=discord.ButtonStyle.primary, emoji="📢", row=1)
     async def post_panel(self, i, b):
+        db = await self.bot.db.for_guild(i.guild.id)
         await i.response.defer(ephemeral=True)
-        async with self.bot.db.execute("SELECT ticket_panel_channel_id, ticket_title, ticket_desc, ticket_color, ticket_banner FROM config WHERE guild_id = ?", (i.guild.id,)) as c: cfg=await c.fetchone()
-        async with self.bot.db.execute("SELECT id, label, description, emoji FROM ticket_categories WHERE guild_id = ?", (i.guild.id,)) as c: cats=await c.fetchall()
+        cfg = self.bot.config_cache.get_many(i.guild.id, 'ticket_panel_channel_id', 'ticket_title', 'ticket_desc', 'ticket_color', 'ticket_banner')
+        async with db.execute("SELECT id, label, description, emoji FROM ticket_categories WHERE guild_id = ?", (i.guild.id,)) as c: cats=await c.fetchall()
         if not cats: return await i.followup.send("❌ Crie uma categoria antes.")
         chan = self.bot.get_channel(cfg[0]) if cfg[0] else i.channel
         INVISIBLE_WIDE_URL = "https://raw.githubusercontent.com/bpevs/transparent-textures/master/1000x1.png"
@@ -724,7 +720,7 @@ class AdminTicketView(ui.View):
         embed.set_thumbnail(url=self.bot.user.display_avatar.url)
         embed.set_image(url=cfg[4] if cfg[4] else INVISIBLE_WIDE_URL)
         await chan.send(embed=embed, view=UserTicketView(self.bot, self.cog, cats))
-        if not cfg[0]: await self.bot.db.execute("UPDATE config SET ticket_panel_channel_id = ? WHERE guild_id = ?", (chan.id, i.guild.id)); await self.bot.db.commit()
+        if not cfg[0]: await self.bot.config_cache.update(i.guild.id, ticket_panel_channel_id=chan.id)
         await i.followup.send(f"✅ Painel postado em {chan.mention}!")
 
 async def setup(bot):
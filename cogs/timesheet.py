@@ -3,6 +3,8 @@ from discord import app_commands, ui
 from discord.ext import commands, tasks
 import datetime
 import asyncio
+from utils.time_utils import now_ts, from_ts
+from utils.outbound import PANEL
 
 # ====================================================
 # 🎨 CONSTANTES & UTILS
@@ -38,10 +40,7 @@ class Timesheet(commands.Cog):
     async def config_panel(self, interaction: discord.Interaction):
         await interaction.response.defer(ephemeral=True)
         
-        async with self.bot.db.execute("SELECT ts_channel_operator, ts_channel_management, ts_channel_history, ts_role_id FROM config WHERE guild_id = ?", (interaction.guild.id,)) as cursor:
-            row = await cursor.fetchone()
-        
-        cfg = row if row else (None, None, None, None)
+        cfg = self.bot.config_cache.get_many(interaction.guild.id, 'ts_channel_operator', 'ts_channel_management', 'ts_channel_history', 'ts_role_id')
         
         embed = discord.Embed(title="⚙️ Configuração do Ponto", color=0x2b2d31)
         embed.description = (
@@ -61,18 +60,18 @@ class Timesheet(commands.Cog):
     # ====================================================
     @app_commands.command(name="ponto", description="📱 Abre seu cartão de ponto (Exclusivo no canal configurado).")
     async def open_timesheet(self, interaction: discord.Interaction):
+        db = await self.bot.db.for_guild(interaction.guild.id)
         # 1. Verifica Canal Permitido
-        async with self.bot.db.execute("SELECT ts_channel_operator FROM config WHERE guild_id = ?", (interaction.guild.id,)) as cursor:
-            row = await cursor.fetchone()
+        operator_channel_id = self.bot.config_cache.get(interaction.guild.id, 'ts_channel_operator')
             
-        if not row or not row[0]:
+        if not operator_channel_id:
             return await interaction.response.send_message("❌ Sistema não configurado. Peça a um admin.", ephemeral=True)
             
-        if interaction.channel.id != row[0]:
-            return await interaction.response.send_message(f"🚫 Use este comando apenas em <#{row[0]}>.", ephemeral=True)
+        if interaction.channel.id != operator_channel_id:
+            return await interaction.response.send_message(f"🚫 Use este comando apenas em <#{operator_channel_id}>.", ephemeral=True)
 
         # 2. Verifica se já existe sessão aberta
-        async with self.bot.db.execute("SELECT start_time, status, total_seconds FROM time_sessions WHERE user_id = ? AND guild_id = ? AND status != 'CLOSED' ORDER BY id DESC LIMIT 1", (interaction.user.id, interaction.guild.id)) as cursor:
+        async with db.execute("SELECT start_ts, status, total_seconds FROM time_sessions WHERE user_id = ? AND guild_id = ? AND status != 'CLOSED' ORDER BY id DESC LIMIT 1", (interaction.user.id, interaction.guild.id)) as cursor:
             session = await cursor.fetchone()
 
         # 3. Cria Embed Inicial (Design Senior)
@@ -84,8 +83,7 @@ class Timesheet(commands.Cog):
         status_txt = "🔴 **FORA DE SERVIÇO**"
         
         if session:
-            start_str, status, total_prev = session
-            ts_start = int(datetime.datetime.fromisoformat(start_str).timestamp())
+            ts_start, status, total_prev = session
             
             if status == 'OPEN':
                 embed.color = COLOR_ON_DUTY
@@ -125,17 +123,16 @@ class Timesheet(commands.Cog):
 
     async def update_management_panel(self, guild):
         """Atualiza a mensagem fixa no canal de gerência."""
+        db = await self.bot.db.for_guild(guild.id)
         # 1. Busca Configuração
-        async with self.bot.db.execute("SELECT ts_channel_management FROM config WHERE guild_id = ?", (guild.id,)) as cursor:
-            row = await cursor.fetchone()
-        
-        if not row or not row[0]: return # Não configurado
+        management_id = self.bot.config_cache.get(guild.id, 'ts_channel_management')
+        if not management_id: return # Não configurado
 
-        channel = guild.get_channel(row[0])
+        channel = guild.get_channel(management_id)
         if not channel: return
 
         # 2. Busca Sessões Abertas (Join com Users se possível, ou fetch manual)
-        async with self.bot.db.execute("SELECT user_id, start_time, status FROM time_sessions WHERE guild_id = ? AND status != 'CLOSED' ORDER BY start_time DESC", (guild.id,)) as cursor:
+        async with db.execute("SELECT user_id, start_ts, status FROM time_sessions WHERE guild_id = ? AND status != 'CLOSED' ORDER BY start_ts DESC", (guild.id,)) as cursor:
             sessions = await cursor.fetchall()
 
         # 3. Monta Texto
@@ -148,13 +145,10 @@ class Timesheet(commands.Cog):
             desc = f"**Nenhum operador em serviço.**\n{SEPARATOR}"
         else:
             lines = []
-            for uid, start_str, status in sessions:
+            for uid, ts, status in sessions:
                 member = guild.get_member(uid)
                 if not member: continue
                 
-                dt = datetime.datetime.fromisoformat(start_str)
-                ts = int(dt.timestamp())
-                
                 # Visual Limpo (Sem Emojis)
                 status_slug = "EM SERVIÇO" if status == 'OPEN' else "EM PAUSA"
                 lines.append(f"{member.mention}\n▸ {status_slug} • <t:{ts}:R>")
@@ -171,9 +165,9 @@ class Timesheet(commands.Cog):
                 break
         
         if target_msg:
-            await target_msg.edit(embed=embed)
+            await self.bot.outbound.edit(target_msg, PANEL, embed=embed)
         else:
-            await channel.send(embed=embed)
+            await self.bot.outbound.send(channel, PANEL, embed=embed)
 
 
 # ====================================================
@@ -193,20 +187,19 @@ class OperatorView(ui.View):
         discord.SelectOption(label="Encerrar Plantão", value="END", description="Finalizar e gerar relatório")
     ])
     async def callback(self, interaction: discord.Interaction, select: ui.Select):
+        db = await self.bot.db.for_guild(interaction.guild.id)
         action = select.values[0]
         guild_id = interaction.guild.id
         user_id = interaction.user.id
-        now = datetime.datetime.now()
+        now_epoch = now_ts()
+        now = from_ts(now_epoch)
         
         # Busca sessão atual
-        async with self.bot.db.execute("SELECT id, start_time, status, total_seconds FROM time_sessions WHERE user_id = ? AND guild_id = ? AND status != 'CLOSED' ORDER BY id DESC LIMIT 1", (user_id, guild_id)) as cursor:
+        async with db.execute("SELECT id, start_ts, status, total_seconds FROM time_sessions WHERE user_id = ? AND guild_id = ? AND status != 'CLOSED' ORDER BY id DESC LIMIT 1", (user_id, guild_id)) as cursor:
             session = await cursor.fetchone()
 
         # Busca Role Config
-        async with self.bot.db.execute("SELECT ts_role_id, ts_channel_history FROM config WHERE guild_id = ?", (guild_id,)) as cursor:
-            cfg = await cursor.fetchone()
-        role_id = cfg[0] if cfg else None
-        log_channel_id = cfg[1] if cfg else None
+        role_id, log_channel_id = self.bot.config_cache.get_many(guild_id, 'ts_role_id', 'ts_channel_history')
 
         role = interaction.guild.get_role(role_id) if role_id else None
 
@@ -218,15 +211,15 @@ class OperatorView(ui.View):
             if session:
                 return await interaction.response.send_message("⚠️ Você já tem uma sessão aberta!", ephemeral=True)
             
-            await self.bot.db.execute("INSERT INTO time_sessions (guild_id, user_id, start_time, status) VALUES (?, ?, ?, 'OPEN')", (guild_id, user_id, str(now)))
+            await db.execute("INSERT INTO time_sessions (guild_id, user_id, start_ts, status) VALUES (?, ?, ?, 'OPEN')", (guild_id, user_id, now_epoch))
             
             # Pega ID da sessão criada
-            async with self.bot.db.execute("SELECT id FROM time_sessions WHERE user_id = ? AND guild_id = ? ORDER BY id DESC LIMIT 1", (user_id, guild_id)) as cursor:
+            async with db.execute("SELECT id FROM time_sessions WHERE user_id = ? AND guild_id = ? ORDER BY id DESC LIMIT 1", (user_id, guild_id)) as cursor:
                  new_session = await cursor.fetchone()
             session_id = new_session[0]
 
             # Log Detalhado
-            await self.bot.db.execute("INSERT INTO timesheet_logs (guild_id, user_id, action, timestamp, session_id, details) VALUES (?, ?, 'START', ?, ?, 'Início de Turno')", (guild_id, user_id, now, session_id))
+            await db.execute("INSERT INTO timesheet_logs (guild_id, user_id, action, created_ts, session_id, details) VALUES (?, ?, 'START', ?, ?, 'Início de Turno')", (guild_id, user_id, now_epoch, session_id))
 
             if role: await interaction.user.add_roles(role, reason="Ponto Iniciado")
             msg_resp = "Plantão Iniciado!"
@@ -236,9 +229,9 @@ class OperatorView(ui.View):
             if not session: return await interaction.response.send_message("Nenhuma sessão aberta.", ephemeral=True)
             if session[2] == 'PAUSED': return await interaction.response.send_message("Já está pausado.", ephemeral=True)
             
-            await self.bot.db.execute("UPDATE time_sessions SET status = 'PAUSED' WHERE id = ?", (session[0],))
+            await db.execute("UPDATE time_sessions SET status = 'PAUSED' WHERE id = ?", (session[0],))
             # Log Detalhado
-            await self.bot.db.execute("INSERT INTO timesheet_logs (guild_id, user_id, action, timestamp, session_id, details) VALUES (?, ?, 'PAUSE', ?, ?, 'Pausa Iniciada')", (guild_id, user_id, now, session[0]))
+            await db.execute("INSERT INTO timesheet_logs (guild_id, user_id, action, created_ts, session_id, details) VALUES (?, ?, 'PAUSE', ?, ?, 'Pausa Iniciada')", (guild_id, user_id, now_epoch, session[0]))
             
             msg_resp = "Plantão Pausado."
             new_status = "PAUSED"
@@ -247,9 +240,9 @@ class OperatorView(ui.View):
             if not session: return await interaction.response.send_message("Nenhuma sessão aberta.", ephemeral=True)
             if session[2] == 'OPEN': return await interaction.response.send_message("Já está em andamento.", ephemeral=True)
             
-            await self.bot.db.execute("UPDATE time_sessions SET status = 'OPEN' WHERE id = ?", (session[0],))
+            await db.execute("UPDATE time_sessions SET status = 'OPEN' WHERE id = ?", (session[0],))
             # Log Detalhado
-            await self.bot.db.execute("INSERT INTO timesheet_logs (guild_id, user_id, action, timestamp, session_id, details) VALUES (?, ?, 'RESUME', ?, ?, 'Retorno de Pausa')", (guild_id, user_id, now, session[0]))
+            await db.execute("INSERT INTO timesheet_logs (guild_id, user_id, action, created_ts, session_id, details) VALUES (?, ?, 'RESUME', ?, ?, 'Retorno de Pausa')", (guild_id, user_id, now_epoch, session[0]))
             
             msg_resp = "Plantão Retomado."
             new_status = "OPEN"
@@ -258,13 +251,13 @@ class OperatorView(ui.View):
             if not session: return await interaction.response.send_message("Nenhuma sessão aberta.", ephemeral=True)
             
             # Calcula Total
-            start_dt = datetime.datetime.fromisoformat(session[1])
-            duration = (now - start_dt).total_seconds()
+            start_dt = from_ts(session[1])
+            duration = now_epoch - session[1]
             
-            await self.bot.db.execute("UPDATE time_sessions SET status = 'CLOSED', end_time = ?, total_seconds = ? WHERE id = ?", (str(now), int(duration), session[0]))
+            await db.execute("UPDATE time_sessions SET status = 'CLOSED', end_ts = ?, total_seconds = ? WHERE id = ?", (now_epoch, duration, session[0]))
             
             # Log Detalhado Final
-            await self.bot.db.execute("INSERT INTO timesheet_logs (guild_id, user_id, action, timestamp, session_id, details) VALUES (?, ?, 'END', ?, ?, 'Fim de Turno')", (guild_id, user_id, now, session[0]))
+            await db.execute("INSERT INTO timesheet_logs (guild_id, user_id, action, created_ts, session_id, details) VALUES (?, ?, 'END', ?, ?, 'Fim de Turno')", (guild_id, user_id, now_epoch, session[0]))
 
             if role: await interaction.user.remove_roles(role, reason="Ponto Encerrado")
             
@@ -278,12 +271,12 @@ class OperatorView(ui.View):
                 chan = interaction.guild.get_channel(log_channel_id)
                 if chan:
                     # Busca histórico de pausas
-                    async with self.bot.db.execute("SELECT action, timestamp FROM timesheet_logs WHERE session_id = ? ORDER BY id ASC", (session[0],)) as cursor:
+                    async with db.execute("SELECT action, created_ts FROM timesheet_logs WHERE session_id = ? ORDER BY id ASC", (session[0],)) as cursor:
                         logs = await cursor.fetchall()
                     
                     pauses_txt = ""
                     for act, ts in logs:
-                        dt_log = datetime.datetime.fromisoformat(str(ts))
+                        dt_log = from_ts(ts)
                         if act == 'PAUSE': pauses_txt += f"**Pausa:** {dt_log.strftime('%H:%M')}\n"
                         elif act == 'RESUME': pauses_txt += f"**Volta:** {dt_log.strftime('%H:%M')}\n"
                     
@@ -302,7 +295,7 @@ class OperatorView(ui.View):
                     
                     await chan.send(embed=e_log)
 
-        await self.bot.db.commit()
+        await db.commit()
         await interaction.response.send_message(msg_resp, ephemeral=True)
         
         # Atualiza a Embed do Operador (Design Consistent)
@@ -314,12 +307,12 @@ class OperatorView(ui.View):
                 embed.color = COLOR_ON_DUTY
                 # Se foi START, usa now, se foi RESUME, mantém start original (precisaria buscar do banco)
                 # Simplificação: Usamos timestamps relativos na visualização
-                display_ts = int(datetime.datetime.fromisoformat(session[1]).timestamp()) if session else int(now.timestamp())
+                display_ts = session[1] if session else now_epoch
                 embed.description = f"**EM SERVIÇO**\n{SEPARATOR}\n**Entrada:** <t:{display_ts}:t>\n**Tempo Decorrido:** <t:{display_ts}:R>\n{SEPARATOR}"
                 
             elif new_status == 'PAUSED':
                 embed.color = COLOR_PAUSED
-                embed.description = f"**EM PAUSA**\n{SEPARATOR}\n**Pausa em:** <t:{int(now.timestamp())}:t>\n**Status:** Aguardando retorno.\n{SEPARATOR}"
+                embed.description = f"**EM PAUSA**\n{SEPARATOR}\n**Pausa em:** <t:{now_epoch}:t>\n**Status:** Aguardando retorno.\n{SEPARATOR}"
                 
             elif new_status == 'CLOSED':
                 embed.color = COLOR_OFF_DUTY
@@ -331,7 +324,9 @@ class OperatorView(ui.View):
 
         # Atualiza Painel de Gerência
         cog = self.bot.get_cog("Timesheet")
-        if cog: await cog.update_management_panel(interaction.guild)
+        if cog:
+            await self.bot.ensure_members(interaction.guild) # Painel lista os membros em serviço
+            await cog.update_management_panel(interaction.guild)
 
 
 class TimesheetConfigView(ui.View):
@@ -341,8 +336,7 @@ class TimesheetConfigView(ui.View):
         self.user = user
 
     async def update_config(self, interaction, column, value):
-        await self.bot.db.execute(f"UPDATE config SET {column} = ? WHERE guild_id = ?", (value, interaction.guild.id))
-        await self.bot.db.commit()
+        await self.bot.config_cache.update(interaction.guild.id, **{column: value})
         await interaction.response.send_message(f"✅ Configuração atualizada!", ephemeral=True)
 
     @ui.select(cls=discord.ui.ChannelSelect, placeholder="Canal do Operador (/ponto)", channel_types=[discord.ChannelType.text])
@@ -39,6 +39,9 @@ class VerificationDropdown(discord.ui.Select):
             view = self.view
             guild = interaction.guild
             member = guild.get_member(view.user_id)
+            if not member: # Fora do cache: baixa a lista só na falta (resposta ainda pendente)
+                await interaction.client.ensure_members(guild)
+                member = guild.get_member(view.user_id)
             
             if member:
                 try:
@@ -80,14 +83,12 @@ class VerificationStartView(discord.ui.View):
     @discord.ui.button(label="Iniciar Verificação", style=discord.ButtonStyle.secondary, custom_id="verification:start_button", emoji="🛡️")
     async def verify_button(self, interaction: discord.Interaction, button: discord.ui.Button):
         # Fetch role_id from DB
-        async with self.bot.db.execute("SELECT verification_role_id FROM config WHERE guild_id = ?", (interaction.guild.id,)) as cursor:
-            res = await cursor.fetchone()
+        role_id = self.bot.config_cache.get(interaction.guild.id, 'verification_role_id')
         
-        if not res or not res[0]:
+        if not role_id:
             await interaction.response.send_message("❌ O sistema de verificação não está configurado corretamente (Cargo não definido).", ephemeral=True)
             return
 
-        role_id = res[0]
         role = interaction.guild.get_role(role_id)
         
         if not role:
@@ -141,8 +142,7 @@ class Verification(commands.Cog):
     @app_commands.checks.has_permissions(administrator=True)
     async def setup_verificacao(self, interaction: discord.Interaction, role: discord.Role, emoji: str = None):
         # Save role to DB
-        await self.bot.db.execute("UPDATE config SET verification_role_id = ?, verification_emoji = ? WHERE guild_id = ?", (role.id, emoji, interaction.guild.id))
-        await self.bot.db.commit()
+        await self.bot.config_cache.update(interaction.guild.id, verification_role_id=role.id, verification_emoji=emoji)
 
         embed = discord.Embed(
             title="🛡️ Verificação Obrigatória",
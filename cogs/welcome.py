@@ -2,9 +2,14 @@ import discord
 import sys
 import os
 import datetime
+import asyncio
+import time
+from collections import deque
 from discord.ext import commands
 from discord import app_commands, ui
 
+from utils.outbound import LOG, BULK
+
 try:
     sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
     import config
@@ -18,14 +23,59 @@ except ImportError:
         EMOJI_ROLES = "🛡️"
         EMOJI_WL = "📋"
 
+# ====================================================
+# 🌊 MODO RAJADA (RAIDS / EVENTOS)
+# ====================================================
+# JOIN_BURST_THRESHOLD entradas em JOIN_BURST_WINDOW segundos colocam a guild
+# em modo rajada até JOIN_BURST_COOLDOWN segundos sem nova rajada. Nele:
+#   - o canal recebe um resumo a cada JOIN_DIGEST_INTERVAL ("📥 37 novos membros")
+#     em vez de uma mensagem por membro;
+#   - as DMs entram na fila do worker com prioridade BULK (a fila tem limite,
+#     o excedente é descartado).
+# O embed de boas-vindas é montado uma vez por guild (template) e só os campos
+# do membro mudam; o template cai quando a config de welcome muda.
+JOIN_BURST_THRESHOLD = int(os.getenv("JOIN_BURST_THRESHOLD", 10))
+JOIN_BURST_WINDOW = int(os.getenv("JOIN_BURST_WINDOW", 10))
+JOIN_BURST_COOLDOWN = int(os.getenv("JOIN_BURST_COOLDOWN", 60))
+JOIN_DIGEST_INTERVAL = int(os.getenv("JOIN_DIGEST_INTERVAL", 15))
+JOIN_DM_QUEUE_MAX = int(os.getenv("JOIN_DM_QUEUE_MAX", 500))
+
+WELCOME_COLUMNS = {'welcome_color', 'welcome_banner', 'welcome_channel_id', 'welcome_dm_active',
+                   *(f'btn{i}_{field}' for i in range(1, 4) for field in ('url', 'label', 'emoji'))}
+
 class Welcome(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
+        self._templates = {}      # guild_id -> template pronto (embed base, view, canal, dm)
+        self._joins = {}          # guild_id -> deque(maxlen=THRESHOLD) com os horários das entradas
+        self._burst_until = {}    # guild_id -> fim do modo rajada (monotonic)
+        self._digest = {}         # guild_id -> [membros] aguardando o próximo resumo
+        self._digest_tasks = {}   # guild_id -> flusher do resumo
+        self._dms = deque()       # (membro, prioridade) para o worker de DMs
+        self._dm_task = None
+        self._dm_dropped = 0
 
     async def cog_load(self):
         self.bot.add_view(WelcomePanel(self.bot, self))
+        self.bot.config_cache.on_change.append(self._config_changed)
         print("[+] [Welcome] Painel persistente carregado.")
 
+    async def cog_unload(self):
+        if self._config_changed in self.bot.config_cache.on_change:
+            self.bot.config_cache.on_change.remove(self._config_changed)
+        for task in [self._dm_task, *self._digest_tasks.values()]:
+            if task: task.cancel()
+
+    def _config_changed(self, guild_id, columns):
+        if guild_id is None:
+            self._templates.clear()
+        elif columns is None or WELCOME_COLUMNS.intersection(columns):
+            self._templates.pop(guild_id, None)
+
+    @commands.Cog.listener()
+    async def on_guild_update(self, before, after):
+        self._templates.pop(after.id, None) # Nome/ícone entram no template
+
     # ====================================================
     # 🖥️ DASHBOARD (PAINEL ADMIN)
     # ====================================================
@@ -36,13 +86,7 @@ class Welcome(commands.Cog):
         await self.send_panel(interaction)
 
     async def send_panel(self, interaction: discord.Interaction, is_edit=False):
-        async with self.bot.db.execute("SELECT * FROM config WHERE guild_id = ?", (interaction.guild.id,)) as cursor:
-            row = await cursor.fetchone()
-            if row:
-                cols = [d[0] for d in cursor.description]
-                data = dict(zip(cols, row))
-            else:
-                data = {}
+        data = self.bot.config_cache.get(interaction.guild.id)
 
         w_id = data.get('welcome_channel_id')
         l_id = data.get('logs_channel_id')
@@ -82,58 +126,134 @@ class Welcome(commands.Cog):
         else: await interaction.followup.send(embed=embed, view=view)
 
     # ====================================================
-    # 🧠 LÓGICA DE PROCESSAMENTO
+    # 🧩 TEMPLATE E DETECÇÃO DE RAJADA
     # ====================================================
-    async def process_join(self, member):
-        async with self.bot.db.execute("SELECT * FROM config WHERE guild_id = ?", (member.guild.id,)) as cursor:
-            row = await cursor.fetchone()
-            if row:
-                cols = [d[0] for d in cursor.description]
-                data = dict(zip(cols, row))
-            else:
-                data = {}
+    def _template(self, guild):
+        """Parte do embed que não depende do membro (montada uma vez por guild)."""
+        template = self._templates.get(guild.id)
+        if template: return template
 
+        data = self.bot.config_cache.get(guild.id)
         color = data.get('welcome_color') or config.EMBED_COLOR
         banner = data.get('welcome_banner')
 
         embed = discord.Embed(color=color)
         embed.set_thumbnail(url=self.bot.user.display_avatar.url)
+        if banner: embed.set_image(url=banner)
+        elif guild.icon: embed.set_image(url=guild.icon.url)
+
+        template = self._templates[guild.id] = {
+            'embed': embed,
+            'view': UserWelcomeView(data), # Só botões de link: a mesma view serve para todos os envios
+            'channel_id': data.get('welcome_channel_id'),
+            'dm': data.get('welcome_dm_active', 1),
+            'color': color,
+        }
+        return template
+
+    def _member_embed(self, template, member):
+        embed = template['embed'].copy()
         embed.set_author(name=f"Bem-vindo(a) à {member.guild.name}!", icon_url=member.display_avatar.url)
-        
         embed.description = (
             f"Olá {member.mention}, seja muito bem-vindo(a)!\n\n"
             f"Fique à vontade para explorar os canais e interagir com a comunidade."
         )
-        
-        if banner: embed.set_image(url=banner)
-        elif member.guild.icon: embed.set_image(url=member.guild.icon.url)
-        
         embed.set_footer(text=f"ID: {member.id} • Membro #{member.guild.member_count}")
         embed.timestamp = datetime.datetime.now()
+        return embed
+
+    def _in_burst(self, guild_id):
+        """Registra a entrada e diz se a guild está em modo rajada."""
+        now = time.monotonic()
+        joins = self._joins.get(guild_id)
+        if joins is None:
+            joins = self._joins[guild_id] = deque(maxlen=JOIN_BURST_THRESHOLD)
+        joins.append(now)
+
+        if len(joins) == JOIN_BURST_THRESHOLD and joins[0] >= now - JOIN_BURST_WINDOW:
+            if self._burst_until.get(guild_id, 0) < now:
+                print(f"🌊 [WELCOME] Rajada de entradas na guild {guild_id}: boas-vindas agrupadas.")
+            self._burst_until[guild_id] = now + JOIN_BURST_COOLDOWN
+        return self._burst_until.get(guild_id, 0) > now
+
+    # ====================================================
+    # 🧠 LÓGICA DE PROCESSAMENTO
+    # ====================================================
+    async def process_join(self, member):
+        guild = member.guild
+        template = self._template(guild)
 
-        view = UserWelcomeView(data)
+        if self._in_burst(guild.id):
+            self._digest.setdefault(guild.id, []).append(member)
+            if guild.id not in self._digest_tasks:
+                self._digest_tasks[guild.id] = asyncio.create_task(self._digest_loop(guild))
+            if template['dm']: self._queue_dm(member, BULK)
+            return
 
         # Canal Público
-        channel_id = data.get('welcome_channel_id')
-        if channel_id:
-            channel = self.bot.get_channel(channel_id)
-            if channel:
-                try: await channel.send(content=f"{member.mention}", embed=embed, view=view)
-                except Exception as e: print(f"❌ Erro Welcome Canal: {e}")
+        channel = self.bot.get_channel(template['channel_id']) if template['channel_id'] else None
+        if channel:
+            try: await self.bot.outbound.send(channel, LOG, content=f"{member.mention}", embed=self._member_embed(template, member), view=template['view'])
+            except Exception as e: print(f"❌ Erro Welcome Canal: {e}")
 
         # DM
-        if data.get('welcome_dm_active', 1):
-            try:
-                dm_view = UserWelcomeView(data)
-                await member.send(embed=embed, view=dm_view)
-            except: pass
+        if template['dm']: self._queue_dm(member, LOG)
+
+    def _queue_dm(self, member, priority):
+        if len(self._dms) >= JOIN_DM_QUEUE_MAX:
+            self._dm_dropped += 1
+            if self._dm_dropped % 100 == 1:
+                print(f"⚠️ [WELCOME] Fila de DMs cheia: {self._dm_dropped} DM(s) de boas-vindas descartada(s).")
+            return
+        self._dms.append((member, priority))
+        if not self._dm_task or self._dm_task.done():
+            self._dm_task = asyncio.create_task(self._dm_worker())
+
+    async def _dm_worker(self):
+        """Uma DM por vez; o ritmo vem do balde de DMs do agendador de saída."""
+        while self._dms:
+            member, priority = self._dms.popleft()
+            template = self._template(member.guild)
+            try: await self.bot.outbound.dm(member, priority, embed=self._member_embed(template, member), view=template['view'])
+            except Exception as e: print(f"❌ Erro Welcome DM: {e}")
+
+    async def _digest_loop(self, guild):
+        """Resumo periódico das entradas enquanto a rajada durar."""
+        try:
+            while True:
+                await asyncio.sleep(JOIN_DIGEST_INTERVAL)
+                members = self._digest.pop(guild.id, [])
+                if members: await self._send_digest(guild, members)
+                if self._burst_until.get(guild.id, 0) <= time.monotonic() and not self._digest.get(guild.id):
+                    self._burst_until.pop(guild.id, None)
+                    print(f"✅ [WELCOME] Rajada encerrada na guild {guild.id}.")
+                    break
+        finally:
+            self._digest_tasks.pop(guild.id, None)
+
+    async def _send_digest(self, guild, members):
+        template = self._template(guild)
+        channel = self.bot.get_channel(template['channel_id']) if template['channel_id'] else None
+        if not channel: return
+
+        mentions, size = [], 0
+        for member in members:
+            size += len(member.mention) + 1
+            if size > 3900: break
+            mentions.append(member.mention)
+        rest = len(members) - len(mentions)
+
+        embed = discord.Embed(title=f"📥 {len(members)} novos membros", color=template['color'])
+        embed.description = " ".join(mentions) + (f"\n\n… e mais **{rest}**." if rest else "")
+        embed.set_footer(text=f"Entrada em massa: boas-vindas agrupadas • Membros: {guild.member_count}")
+        embed.timestamp = datetime.datetime.now()
+        try: await self.bot.outbound.send(channel, LOG, embed=embed, allowed_mentions=discord.AllowedMentions.none())
+        except Exception as e: print(f"❌ Erro Welcome Resumo: {e}")
 
     async def process_leave(self, member):
-        async with self.bot.db.execute("SELECT logs_channel_id FROM config WHERE guild_id = ?", (member.guild.id,)) as cursor:
-            res = await cursor.fetchone()
-        
-        if not res or not res[0]: return
-        channel = self.bot.get_channel(res[0])
+        logs_id = self.bot.config_cache.get(member.guild.id, 'logs_channel_id')
+        if not logs_id: return
+        channel = self.bot.get_channel(logs_id)
         if not channel: return
 
         roles = [r.name for r in member.roles if r.name != "@everyone"]
@@ -176,8 +296,7 @@ class StyleModal(ui.Modal, title="🎨 Editar Visual"):
         try: int_color = int(hex_code, 16)
         except: return await interaction.followup.send("❌ Cor inválida!")
 
-        await self.bot.db.execute("UPDATE config SET welcome_color = ?, welcome_banner = ? WHERE guild_id = ?", (int_color, self.banner_url.value, interaction.guild.id))
-        await self.bot.db.commit()
+        await self.bot.config_cache.update(interaction.guild.id, welcome_color=int_color, welcome_banner=self.banner_url.value)
         await interaction.followup.send("✅ Visual salvo!")
         await self.cog.send_panel(self.origin, is_edit=True)
 
@@ -200,8 +319,7 @@ class ButtonConfigModal(ui.Modal):
     async def on_submit(self, interaction: discord.Interaction):
         await interaction.response.defer(ephemeral=True)
         prefix = "wl_btn" if self.idx == "wl" else f"btn{self.idx}"
-        await self.bot.db.execute(f"UPDATE config SET {prefix}_label = ?, {prefix}_url = ?, {prefix}_emoji = ? WHERE guild_id = ?", (self.lbl.value, self.url.value, self.emj.value, interaction.guild.id))
-        await self.bot.db.commit()
+        await self.bot.config_cache.update(interaction.guild.id, **{f"{prefix}_label": self.lbl.value, f"{prefix}_url": self.url.value, f"{prefix}_emoji": self.emj.value})
         await interaction.followup.send("✅ Botão salvo!")
         await self.cog.send_panel(self.origin, is_edit=True)
 
@@ -226,8 +344,7 @@ class ButtonActionView(ui.View):
     async def delete_btn(self, interaction: discord.Interaction, button: ui.Button):
         await interaction.response.defer(ephemeral=True)
         prefix = "wl_btn" if self.idx == "wl" else f"btn{self.idx}"
-        await self.bot.db.execute(f"UPDATE config SET {prefix}_label = '', {prefix}_url = '', {prefix}_emoji = '' WHERE guild_id = ?", (interaction.guild.id,))
-        await self.bot.db.commit()
+        await self.bot.config_cache.update(interaction.guild.id, **{f"{prefix}_label": '', f"{prefix}_url": '', f"{prefix}_emoji": ''})
         msg = "✅ Botão resetado!" if self.idx == "wl" else "🗑️ Botão apagado!"
         await interaction.followup.send(msg)
         await self.cog.send_panel(self.origin, is_edit=True)
@@ -259,44 +376,32 @@ class WelcomePanel(ui.View):
     @ui.select(cls=discord.ui.ChannelSelect, placeholder="Canal de Entrada", channel_types=[discord.ChannelType.text], row=0, custom_id="welcome_sel_welcome")
     async def sel_welcome(self, interaction: discord.Interaction, select: ui.ChannelSelect):
         await interaction.response.defer()
-        await self.bot.db.execute("INSERT OR REPLACE INTO config (guild_id, welcome_channel_id) VALUES (?, ?)", (interaction.guild.id, select.values[0].id))
-        await self.bot.db.commit()
+        await self.bot.config_cache.update(interaction.guild.id, welcome_channel_id=select.values[0].id)
         await self.cog.send_panel(interaction, is_edit=True)
 
     @ui.select(cls=discord.ui.ChannelSelect, placeholder="Canal de Logs", channel_types=[discord.ChannelType.text], row=1, custom_id="welcome_sel_logs")
     async def sel_logs(self, interaction: discord.Interaction, select: ui.ChannelSelect):
         await interaction.response.defer()
-        exists = await self.bot.db.execute_fetchall("SELECT 1 FROM config WHERE guild_id = ?", (interaction.guild.id,))
-        if exists: await self.bot.db.execute("UPDATE config SET logs_channel_id = ? WHERE guild_id = ?", (select.values[0].id, interaction.guild.id))
-        else: await self.bot.db.execute("INSERT INTO config (guild_id, logs_channel_id) VALUES (?, ?)", (interaction.guild.id, select.values[0].id))
-        await self.bot.db.commit()
+        await self.bot.config_cache.update(interaction.guild.id, logs_channel_id=select.values[0].id)
         await self.cog.send_panel(interaction, is_edit=True)
 
     @ui.button(label="Editar Visual", style=discord.ButtonStyle.secondary, emoji="🎨", row=2, custom_id="welcome_btn_style")
     async def style_btn(self, interaction: discord.Interaction, button: ui.Button):
-        async with self.bot.db.execute("SELECT welcome_color, welcome_banner FROM config WHERE guild_id = ?", (interaction.guild.id,)) as cursor:
-            row = await cursor.fetchone()
-        col, ban = (row[0], row[1]) if row else (0, "")
+        col, ban = self.bot.config_cache.get_many(interaction.guild.id, 'welcome_color', 'welcome_banner')
         await interaction.response.send_modal(StyleModal(self.bot, self.cog, interaction, col, ban))
 
     @ui.button(label="Configurar Botões", style=discord.ButtonStyle.secondary, emoji="🔗", row=2, custom_id="welcome_btn_links")
     async def links_btn(self, interaction: discord.Interaction, button: ui.Button):
-        async with self.bot.db.execute("SELECT * FROM config WHERE guild_id = ?", (interaction.guild.id,)) as cursor:
-            row = await cursor.fetchone()
-            data = dict(zip([d[0] for d in cursor.description], row)) if row else {}
+        data = self.bot.config_cache.get(interaction.guild.id)
         await interaction.response.send_message("Selecione:", view=ButtonSelectView(self.bot, self.cog, interaction, data), ephemeral=True)
 
     @ui.button(label="Toggle DM", style=discord.ButtonStyle.secondary, emoji="📨", row=2, custom_id="welcome_btn_dm")
     async def toggle_dm(self, interaction: discord.Interaction, button: ui.Button):
         await interaction.response.defer()
-        async with self.bot.db.execute("SELECT welcome_dm_active FROM config WHERE guild_id = ?", (interaction.guild.id,)) as cursor:
-            row = await cursor.fetchone()
-        
-        current = row[0] if row else 1
+        current = self.bot.config_cache.get(interaction.guild.id, 'welcome_dm_active', 1)
         new_val = 0 if current else 1
         
-        await self.bot.db.execute("UPDATE config SET welcome_dm_active = ? WHERE guild_id = ?", (new_val, interaction.guild.id))
-        await self.bot.db.commit()
+        await self.bot.config_cache.update(interaction.guild.id, welcome_dm_active=new_val)
         await self.cog.send_panel(interaction, is_edit=True)
 
     @ui.button(label="Testar Entrada", style=discord.ButtonStyle.success, emoji="📥", row=3, custom_id="welcome_btn_test_join")
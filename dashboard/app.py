@@ -2,10 +2,14 @@ import os
 import asyncio
 import psutil
 from quart import Quart, render_template, redirect, url_for, request, session, jsonify
+import discord
 from discord.ext import commands
 
 import aiohttp
-from quart import Quart, render_template, redirect, url_for, request, session, jsonify, abort, Blueprint, send_from_directory
+import tempfile
+from utils.time_utils import fmt_ts
+from database.backup import create_snapshot, iter_snapshot, backup_filename, restore_database
+from quart import Quart, render_template, redirect, url_for, request, session, jsonify, abort, Blueprint, send_from_directory, Response
 
 # Inicializa o App Quart
 app = Quart(__name__, template_folder='templates', static_folder='static')
@@ -142,7 +146,9 @@ async def api_stats():
             "ram_percent": ram.percent,
             "ram_used_gb": round(ram.used / (1024**3), 2),
             "ram_total_gb": round(ram.total / (1024**3), 2)
-        }
+        },
+        # Fila de saída por classe de prioridade (utils/outbound.py)
+        "outbound": bot.outbound.metrics() if bot.outbound else None
     })
 
 # =========================================
@@ -237,7 +243,8 @@ async def api_licenses_add():
                 VALUES (?, ?, ?, ?, 'active', ?, ?)
             """, (new_key, guild_id, client_name, exp_date, data.get('max_users', 100), tier))
             
-        await bot.db.commit()
+        await bot.db.barrier() # Licença durável antes de responder ao painel
+        bot.licenses.invalidate(guild_id)
         return jsonify({"success": True})
         
     except Exception as e:
@@ -251,7 +258,8 @@ async def api_licenses_delete():
     guild_id = data.get('guild_id')
     
     await bot.db.execute("DELETE FROM licenses WHERE guild_id = ?", (guild_id,))
-    await bot.db.commit()
+    await bot.db.barrier()
+    bot.licenses.invalidate(guild_id)
     return jsonify({"success": True})
 
 @owner_bp.route('/api/licenses/renew', methods=['POST'])
@@ -264,7 +272,8 @@ async def api_licenses_renew():
     new_exp = (datetime.now() + timedelta(days=30)).strftime("%Y-%m-%d")
     
     await bot.db.execute("UPDATE licenses SET expiration_date = ?, status = 'active' WHERE guild_id = ?", (new_exp, guild_id))
-    await bot.db.commit()
+    await bot.db.barrier()
+    bot.licenses.invalidate(guild_id)
     return jsonify({"success": True})
 
 # =========================================
@@ -299,7 +308,7 @@ async def api_servers_list():
         # Pega logs de BOT_REMOVED e verifica se o bot NÃO está mais lá
         cleaning_queue = []
         if bot.db:
-            async with bot.db.execute("SELECT target, timestamp FROM audit_logs WHERE action = 'BOT_REMOVED' ORDER BY timestamp DESC") as cursor:
+            async with bot.db.execute("SELECT target, created_ts FROM audit_logs WHERE action = 'BOT_REMOVED' ORDER BY created_ts DESC") as cursor:
                 rows = await cursor.fetchall()
                 
             for row in rows:
@@ -308,7 +317,7 @@ async def api_servers_list():
                 if not bot.get_guild(g_id):
                     cleaning_queue.append({
                         "target_id": str(g_id),
-                        "timestamp": row[1]
+                        "timestamp": fmt_ts(row[1], "%Y-%m-%d %H:%M:%S", "")
                     })
 
         return jsonify({
@@ -335,30 +344,25 @@ async def api_servers_leave():
 async def api_servers_purge():
     data = await request.get_json()
     guild_id = data.get('guild_id')
+    dry_run = data.get('dry_run', False)
     
     if not bot.db: return jsonify({"error": "DB Error"}), 500
+    if not guild_id: return jsonify({"error": "Missing guild_id"}), 400
 
-    # LISTA DE TABELAS PARA LIMPAR
-    # Adicione aqui todas as tabelas que têm guild_id
-    tables = [
-        "config", "licenses", "active_tickets", "faction_actions", 
-        "ticket_panels" # Adicionar outras se existirem
-    ]
-    
-    deleted_count = 0
     try:
-        for table in tables:
-            # Verifica se tabela existe antes de tentar deletar (segurança)
-            # Simplificação: assume que existem. Em prod, verificar sqlite_master.
-            try:
-                await bot.db.execute(f"DELETE FROM {table} WHERE guild_id = ?", (guild_id,))
-            except: pass # Ignora erro se tabela não tiver guild_id ou não existir
-            
+        # Todas as tabelas com guild_id (inclusive licença e arquivo)
+        report = await bot.lifecycle.delete_guilds([guild_id], dry_run=dry_run)
+
         # Remove também da Audit Log para sair da fila
-        await bot.db.execute("DELETE FROM audit_logs WHERE target_id = ? AND action = 'BOT_REMOVED'", (guild_id,))
-        
-        await bot.db.commit()
-        return jsonify({"success": True, "message": "Dados limpos com sucesso!"})
+        if not dry_run:
+            async with bot.db.execute("DELETE FROM audit_logs WHERE target = ? AND action = 'BOT_REMOVED'", (guild_id,)) as cursor:
+                if cursor.rowcount: report['audit_logs'] = cursor.rowcount
+            await bot.db.commit()
+            bot.config_cache.drop(int(guild_id))
+            bot.licenses.invalidate(guild_id)
+
+        return jsonify({"success": True, "dry_run": dry_run, "tables": report, "deleted_rows": sum(report.values()),
+                        "message": "Simulação concluída." if dry_run else "Dados limpos com sucesso!"})
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
@@ -459,7 +463,7 @@ async def broadcast_page():
 
 @owner_bp.route('/api/broadcast', methods=['POST'])
 async def api_broadcast():
-    if not bot: return jsonify({"error": "Bot not ready"}), 503
+    if not bot or not bot.broadcasts: return jsonify({"error": "Bot not ready"}), 503
     
     data = await request.get_json()
     title = data.get('title')
@@ -467,34 +471,37 @@ async def api_broadcast():
     color = int(data.get('color', '#fbbf24').replace('#', ''), 16)
     image_url = data.get('image_url')
     target = data.get('target', 'owners')
+    if target not in ('owners', 'channels'): return jsonify({"error": "Destino inválido"}), 400
 
     # Cria o Embed
     embed = discord.Embed(title=title, description=description, color=color)
     if image_url: embed.set_image(url=image_url)
     embed.set_footer(text="Mensagem Oficial do Sistema")
 
-    sent_count = 0
-    failed_count = 0
-
-    for guild in bot.guilds:
-        try:
-            dest = None
-            if target == 'owners':
-                dest = guild.owner
-            else:
-                dest = guild.system_channel or guild.text_channels[0]
-            
-            if dest:
-                await dest.send(embed=embed)
-                sent_count += 1
-        except:
-            failed_count += 1
-            
-    return jsonify({
-        "success": True, 
-        "sent_count": sent_count, 
-        "failed_count": failed_count
-    })
+    # O envio roda em segundo plano (utils/broadcast.py); o painel acompanha pelo job
+    user = session.get('user') or {}
+    job_id = await bot.broadcasts.create(embed, target, int(user.get('id', 0)))
+    job = await bot.broadcasts.get(job_id)
+    return jsonify({"success": True, "job": job})
+
+@owner_bp.route('/api/broadcast/jobs')
+async def api_broadcast_jobs():
+    if not bot or not bot.broadcasts: return jsonify({"error": "Bot not ready"}), 503
+    return jsonify(await bot.broadcasts.recent())
+
+@owner_bp.route('/api/broadcast/<int:job_id>')
+async def api_broadcast_job(job_id):
+    if not bot or not bot.broadcasts: return jsonify({"error": "Bot not ready"}), 503
+    job = await bot.broadcasts.get(job_id)
+    if not job: return jsonify({"error": "Job não encontrado"}), 404
+    return jsonify(job)
+
+@owner_bp.route('/api/broadcast/<int:job_id>/cancel', methods=['POST'])
+async def api_broadcast_cancel(job_id):
+    if not bot or not bot.broadcasts: return jsonify({"error": "Bot not ready"}), 503
+    if not await bot.broadcasts.cancel(job_id):
+        return jsonify({"error": "Job não está em andamento"}), 400
+    return jsonify({"success": True})
 
 # =========================================
 # 🩺 HEALTH DOCTOR & GHOST JOIN (GOD MODE)
@@ -708,145 +715,71 @@ async def database_page():
 @owner_bp.route('/api/database/cleanup_inactive', methods=['POST'])
 async def api_database_cleanup_inactive():
     if not bot or not bot.db: return jsonify({"error": "Bot not ready"}), 503
+    data = await request.get_json(silent=True) or {}
+    dry_run = data.get('dry_run', False)
     
     try:
-        # 1. Identificar Guilds Ativas
-        active_ids = [g.id for g in bot.guilds]
-        
-        # 2. Identificar Guilds no Banco (Exceto Licenses e global_bans)
-        # Vamos varrer tabelas principais que usam guild_id
-        tables = [
-            "config", 
-            "active_tickets", 
-            "ticket_categories",
-            "staff_ratings",
-            "presence",
-            "suggestion_votes",
-            "faction_actions", 
-            "action_mvp_votes",
-            "active_pings",
-            "active_streams",
-            "embed_templates",
-            "org_punishments", 
-            "time_sessions"
-        ]
-        
-        deleted_count = 0
-        
-        for table in tables:
-            try:
-                # 3. Verificação de Segurança (Coluna Existe?)
-                # Isso impede erros caso o usuário tenha um banco antigo sem a migração
-                async with bot.db.execute(f"PRAGMA table_info({table})") as cursor:
-                    cols = [row[1] for row in await cursor.fetchall()]
-                
-                if "guild_id" not in cols:
-                    print(f"⚠️ [CLEANUP] Tabela {table} pulada (sem guild_id).")
-                    continue
-
-                # 4. Pega IDs distintos na tabela
-                async with bot.db.execute(f"SELECT DISTINCT guild_id FROM {table}") as cursor:
-                    rows = await cursor.fetchall()
-                    db_ids = [row[0] for row in rows if row[0]]
-                    
-                # 5. Identifica fantasmas (db_ids que nao estao em active_ids)
-                ghost_ids = [gid for gid in db_ids if gid not in active_ids]
-                
-                if ghost_ids:
-                    # Deleta em massa
-                    placeholders = ','.join('?' for _ in ghost_ids)
-                    await bot.db.execute(f"DELETE FROM {table} WHERE guild_id IN ({placeholders})", tuple(ghost_ids))
-                    deleted_count += bot.db.total_changes
-            except Exception as ex:
-                print(f"❌ [CLEANUP ERROR] Falha na tabela {table}: {ex}")
-                continue
-                
-        await bot.db.commit()
-        
-        return jsonify({"success": True, "deleted_rows": deleted_count})
+        # Guilds com dados no banco onde o bot não está mais (licenças são mantidas)
+        ghosts, report = await bot.lifecycle.cleanup_ghosts([g.id for g in bot.guilds], dry_run=dry_run)
+        if not dry_run:
+            for gid in ghosts: bot.config_cache.drop(gid)
+            if ghosts: print(f"🧹 [CLEANUP] {len(ghosts)} guilds fantasmas removidas: {report}")
+
+        return jsonify({"success": True, "dry_run": dry_run, "guilds": len(ghosts), "tables": report, "deleted_rows": sum(report.values())})
         
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
 @owner_bp.route('/api/database/stats')
 async def api_db_stats():
-    if not bot or not bot.db: return jsonify({"error": "Bot not ready"}), 503
+    if not bot or not bot.db or not bot.stats: return jsonify({"error": "Bot not ready"}), 503
     
     try:
-        # File Size
-        import os
-        db_path = "database/bot_data.db"
-        size_mb = os.path.getsize(db_path) / (1024 * 1024) if os.path.exists(db_path) else 0
-        
-        # Table Counts
-        tables = ["licenses", "config", "audit_logs", "faction_actions", "active_tickets"]
-        counts = {}
-        total_rows = 0
-        
-        for table in tables:
-            try:
-                async with bot.db.execute(f"SELECT COUNT(*) FROM {table}") as cursor:
-                    row = await cursor.fetchone()
-                    count = row[0]
-                    counts[table] = count
-                    total_rows += count
-            except:
-                counts[table] = 0
+        # Snapshot em cache (database/stats.py); ?refresh=1 força a recontagem completa
+        if request.args.get('refresh') == '1':
+            await bot.stats.refresh()
+        snap = await bot.stats.current()
 
         return jsonify({
-            "size_mb": round(size_mb, 2),
-            "total_rows": total_rows,
-            "details": counts
+            "size_mb": snap['size_mb'],
+            "total_rows": snap['total_rows'],
+            "details": {name: info['rows'] for name, info in snap['tables'].items()},
+            "tables": snap['tables'],
+            "recounted_at": snap['recounted_at'],
+            "generated_at": snap['generated_at'],
         })
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
 @owner_bp.route('/api/database/guilds')
 async def api_db_guilds():
-    if not bot or not bot.db: return jsonify({"error": "Bot not ready"}), 503
+    if not bot or not bot.db or not bot.stats: return jsonify({"error": "Bot not ready"}), 503
     
     try:
-        # Pega todos os guilds distintos da tabela CONFIG (que é a base)
-        # E cruza com nomes se possível via Bot, senão via banco
-        # Idealmente, pega da tabela que tem mais dados. Vamos usar Licenses + Configs
-        
-        guilds_data = {}
-        
-        # 1. Pega configs
-        async with bot.db.execute("SELECT guild_id FROM config") as cursor:
-            rows = await cursor.fetchall()
-            for row in rows:
-                guilds_data[row[0]] = {"id": str(row[0]), "source": "config"}
+        # Base: guilds com config (cache) + guilds com licença; linhas vêm do snapshot
+        snap = await bot.stats.current()
+        names = snap['names']
 
-        # 2. Pega licenças
-        async with bot.db.execute("SELECT guild_id, client_name FROM licenses") as cursor:
-            rows = await cursor.fetchall()
-            for row in rows:
-                gid = row[0]
-                if gid not in guilds_data:
-                    guilds_data[gid] = {"id": str(gid), "source": "license"}
-                guilds_data[gid]['name'] = row[1]
-        
-        # 3. Enriquece com dados do Bot (se online)
+        guilds_data = {}
+        for gid in bot.config_cache.guild_ids():
+            guilds_data[gid] = {"id": str(gid), "source": "config"}
+        for gid, name in names.items():
+            if gid not in guilds_data:
+                guilds_data[gid] = {"id": str(gid), "source": "license"}
+            if name: guilds_data[gid]['name'] = name
+        
+        # Enriquece com dados do Bot (se online)
         results = []
         for gid, data in guilds_data.items():
             guild = bot.get_guild(gid)
-            
-            # Conta items (simples)
-            items_count = 0 
-            # (Poderíamos fazer queries pesadas aqui, mas vamos simplificar)
-            
-            status = "unknown"
             if guild:
-                status = "online"
+                data['status'] = "online"
                 data['name'] = guild.name
                 data['member_count'] = guild.member_count
-                items_count = len(guild.text_channels) # Exemplo bobo de stats
             else:
-                status = "ghost" # Bot não está mais lá
+                data['status'] = "ghost" # Bot não está mais lá
             
-            data['status'] = status
-            data['items_count'] = items_count # Placeholder
+            data['items_count'] = snap['guilds'].get(gid, 0) # Linhas da guild em todas as tabelas
             results.append(data)
             
         return jsonify(results)
@@ -858,63 +791,58 @@ async def api_db_wipe():
     data = await request.get_json()
     guild_id = data.get('guild_id')
     keep_license = data.get('keep_license', True)
+    dry_run = data.get('dry_run', False)
     
     if not guild_id: return jsonify({"error": "Missing guild_id"}), 400
     
     try:
-        # LISTA DE TABELAS PARA LIMPAR
-        tables = [
-            "config", "ticket_categories", "active_tickets", "staff_ratings", 
-            "presence", "suggestion_votes", "faction_actions", "action_mvp_votes",
-            "active_pings", "embed_templates", "audit_logs"
-        ]
-        
-        deleted_count = 0
-        for table in tables:
-            try:
-                # Verifica se tabela tem coluna guild_id
-                # (Assumindo que todas listadas acima têm. Se não, try/except segura)
-                async with bot.db.execute(f"DELETE FROM {table} WHERE guild_id = ?", (guild_id,)) as cursor:
-                    deleted_count += cursor.rowcount
-            except:
-                pass
-        
-        # Limpa License se solicitado
-        if not keep_license:
-            async with bot.db.execute("DELETE FROM licenses WHERE guild_id = ?", (guild_id,)) as cursor:
-                deleted_count += cursor.rowcount
-                
-        await bot.db.commit()
-        return jsonify({"success": True, "deleted_rows": deleted_count})
+        keep = ('licenses',) if keep_license else ()
+        report = await bot.lifecycle.delete_guilds([guild_id], keep=keep, dry_run=dry_run)
+        if not dry_run:
+            bot.config_cache.drop(int(guild_id))
+            bot.licenses.invalidate(guild_id)
+        return jsonify({"success": True, "dry_run": dry_run, "tables": report, "deleted_rows": sum(report.values())})
         
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
 @owner_bp.route('/api/database/backup')
 async def api_db_backup():
+    # Snapshot consistente (API de backup do SQLite) enviado em pedaços
+    compress = request.args.get('gzip', '0') == '1'
     try:
-        return await send_from_directory('database', 'bot_data.db', as_attachment=True)
+        path = await create_snapshot(bot.db)
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
+    headers = {"Content-Disposition": f'attachment; filename="{backup_filename(compress)}"'}
+    if not compress:
+        headers["Content-Length"] = str(os.path.getsize(path))
+    mimetype = "application/gzip" if compress else "application/vnd.sqlite3"
+    return Response(iter_snapshot(path, compress), mimetype=mimetype, headers=headers)
+
 @owner_bp.route('/api/database/restore', methods=['POST'])
 async def api_db_restore():
     files = await request.files
     f = files.get('file')
     
-    if f:
-        # Salva como .db (sobrescrevendo?? Perigoso! Mas é o pedido)
-        # O ideal seria salvar um .bak antes
-        import shutil
-        shutil.copy("database/bot_data.db", "database/bot_data.db.bak")
-        
-        await f.save("database/bot_data.db")
-        
-        # Reinicia conexão DB no bot?? Complexo.
-        # Melhor pedir restart.
-        return jsonify({"success": True, "message": "Banco restaurado. REINICIE O BOT IMEDIATAMENTE."})
-        
-    return jsonify({"error": "No file"}), 400
+    if not f:
+        return jsonify({"error": "No file"}), 400
+
+    # Upload vai para um temporário; o banco em uso só muda depois de validado
+    upload = tempfile.NamedTemporaryFile(suffix='.upload', dir='database', delete=False)
+    upload.close()
+    try:
+        await f.save(upload.name)
+        await restore_database(bot, upload.name)
+        return jsonify({"success": True, "message": "Banco restaurado. Cópia anterior salva em bot_data.db.bak."})
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+    finally:
+        try: os.remove(upload.name)
+        except OSError: pass
 
 # =========================================
 # 📂 TRANSCRIPTS & ROOT
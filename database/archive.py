@@ -0,0 +1,170 @@
+import asyncio
+import os
+import time
+
+# ====================================================
+# 🧊 ARQUIVAMENTO DE DADOS FRIOS
+# ====================================================
+# Tabelas de log só crescem. Linhas mais velhas que a retenção de cada tabela
+# são movidas (em lotes curtos) para o banco anexado como "archive", que
+# o DatabasePool anexa em todas as conexões. Consultas "desde sempre" usam
+# all_time() para juntar as duas partes.
+#
+# Retenção em dias por tabela: ARCHIVE_<TABELA>_DAYS (0 desliga a tabela).
+#
+# O movimento é idempotente: o arquivo tem índice único na chave primária da
+# tabela quente e recebe INSERT OR IGNORE. Cada lote grava primeiro a cópia
+# (durável) e só depois apaga da quente; se o bot cair entre os dois, a
+# próxima rodada acha as mesmas linhas, ignora a cópia repetida e apaga.
+# (Em WAL o SQLite comita main e archive separadamente, então uma transação
+# só não garantiria isso.)
+
+ARCHIVE_INTERVAL = int(os.getenv("ARCHIVE_INTERVAL_HOURS", 6)) * 3600
+ARCHIVE_BATCH = int(os.getenv("ARCHIVE_BATCH", 500))
+ARCHIVE_PAUSE = 0.05  # Folga entre lotes para os comandos não esperarem o lock de escrita
+
+DISCORD_EPOCH_MS = 1420070400000
+
+# tabela: (coluna de idade, dias padrão, filtro extra)
+ARCHIVE_TABLES = {
+    'audit_logs': ('created_ts', 90, None),
+    'timesheet_logs': ('created_ts', 60, None),
+    'staff_ratings': ('created_ts', 180, None),
+    'org_punishments': ('created_ts', 365, None),
+    'sales': ('created_ts', 180, None),
+    # Sem coluna de data: a idade vem do snowflake do message_id
+    'faction_actions': ('message_id', 90, "status IN ('WIN', 'LOSS')"),
+}
+
+# Linhas dependentes que acompanham o pai: tabela -> [(filha, coluna que aponta pro rowid do pai)]
+ARCHIVE_CHILDREN = {
+    'faction_actions': [('action_participants', 'message_id')],
+}
+
+def retention_days(table):
+    return int(os.getenv(f"ARCHIVE_{table.upper()}_DAYS", ARCHIVE_TABLES[table][1]))
+
+def snowflake_from_ts(ts):
+    return (int(ts * 1000) - DISCORD_EPOCH_MS) << 22
+
+def all_time(table, columns="*"):
+    """Subconsulta com a tabela quente + arquivada (use com colunas explícitas)."""
+    return f"(SELECT {columns} FROM main.{table} UNION ALL SELECT {columns} FROM archive.{table})"
+
+class ArchiveEngine:
+    def __init__(self, db):
+        self.db = db
+        self._task = None
+        self.last_run = None
+        self.last_moved = {}
+
+    def _tables(self):
+        tables = []
+        for table in ARCHIVE_TABLES:
+            tables.append(table)
+            tables.extend(child for child, _ in ARCHIVE_CHILDREN.get(table, []))
+        return tables
+
+    async def _columns(self, db, schema, table):
+        async with db.execute(f"PRAGMA {schema}.table_info({table})") as cursor:
+            return [row[1] for row in await cursor.fetchall()]
+
+    async def _primary_key(self, db, table):
+        async with db.execute(f"PRAGMA main.table_info({table})") as cursor:
+            return [row[1] for row in sorted((r for r in await cursor.fetchall() if r[5]), key=lambda r: r[5])]
+
+    async def ensure_tables(self, db=None):
+        """Cria/atualiza as tabelas do arquivo com as mesmas colunas das quentes."""
+        db = db or self.db
+        for table in self._tables():
+            await db.execute(f"CREATE TABLE IF NOT EXISTS archive.{table} AS SELECT * FROM main.{table} WHERE 0")
+
+            # Colunas novas no schema quente (migrações) entram no arquivo também
+            archived = await self._columns(db, 'archive', table)
+            hot = await self._columns(db, 'main', table)
+            for col in hot:
+                if col not in archived:
+                    await db.execute(f"ALTER TABLE archive.{table} ADD COLUMN {col}")
+
+            if 'guild_id' in hot:
+                await db.execute(f"CREATE INDEX IF NOT EXISTS archive.idx_{table}_guild ON {table}(guild_id)")
+
+            # Chave única (a tabela do arquivo nasce sem PK): repetições de versões
+            # antigas são removidas uma vez, antes de criar o índice
+            pk = ", ".join(await self._primary_key(db, table))
+            async with db.execute("SELECT 1 FROM archive.sqlite_master WHERE name = ?", (f"uq_{table}_pk",)) as cursor:
+                has_index = await cursor.fetchone()
+            if pk and not has_index:
+                await db.execute(f"DELETE FROM archive.{table} WHERE rowid NOT IN (SELECT MIN(rowid) FROM archive.{table} GROUP BY {pk})")
+                await db.execute(f"CREATE UNIQUE INDEX archive.uq_{table}_pk ON {table}({pk})")
+        await db.barrier()
+
+    async def _pools(self):
+        """Banco compartilhado e, com sharding, cada shard de guild."""
+        yield self.db
+        if self.db.shards:
+            for guild_id in self.db.shards.guild_ids():
+                yield await self.db.shards.get(guild_id)
+
+    def start(self):
+        if not self._task:
+            self._task = asyncio.create_task(self._loop())
+
+    def stop(self):
+        if self._task:
+            self._task.cancel()
+            self._task = None
+
+    async def _loop(self):
+        while True:
+            await asyncio.sleep(ARCHIVE_INTERVAL)
+            try:
+                await self.run_once()
+            except Exception as e:
+                print(f"❌ [ARCHIVE] Falha no arquivamento: {e}")
+
+    async def run_once(self):
+        """Move todas as linhas vencidas, lote a lote. Retorna {tabela: linhas}."""
+        moved = {}
+        async for db in self._pools():
+            for table, (age_col, _, extra) in ARCHIVE_TABLES.items():
+                days = retention_days(table)
+                if days <= 0: continue
+
+                cutoff = time.time() - days * 86400
+                if age_col == 'message_id': cutoff = snowflake_from_ts(cutoff)
+                where = f"{age_col} < ?" + (f" AND {extra}" if extra else "")
+
+                total = 0
+                while True:
+                    count = await self._move_batch(db, table, where, int(cutoff))
+                    total += count
+                    if count < ARCHIVE_BATCH: break
+                    await asyncio.sleep(ARCHIVE_PAUSE)
+                if total: moved[table] = moved.get(table, 0) + total
+
+        self.last_run = int(time.time())
+        self.last_moved = moved
+        if moved:
+            print(f"🧊 [ARCHIVE] Linhas arquivadas: {moved}")
+        return moved
+
+    async def _move_batch(self, db, table, where, cutoff):
+        async with db.execute(f"SELECT rowid FROM main.{table} WHERE {where} LIMIT ?", (cutoff, ARCHIVE_BATCH)) as cursor:
+            ids = [row[0] for row in await cursor.fetchall()]
+        if not ids: return 0
+
+        marks = ", ".join("?" for _ in ids)
+        parts = [(child, f"{fk} IN ({marks})") for child, fk in ARCHIVE_CHILDREN.get(table, [])]
+        parts.append((table, f"rowid IN ({marks})"))
+        columns = {t: ", ".join(await self._columns(db, 'main', t)) for t, _ in parts}
+
+        # 1. Cópia durável (repetida = ignorada); 2. só então apaga da quente
+        async with db.write(durable=True) as conn:
+            for t, where in parts:
+                cols = columns[t]
+                await conn.execute(f"INSERT OR IGNORE INTO archive.{t} ({cols}) SELECT {cols} FROM main.{t} WHERE {where}", ids)
+        async with db.write(durable=True) as conn:
+            for t, where in parts:
+                await conn.execute(f"DELETE FROM main.{t} WHERE {where}", ids)
+        return len(ids)
@@ -0,0 +1,116 @@
+import asyncio
+import datetime
+import gzip
+import os
+import sqlite3
+import tempfile
+import zlib
+
+from database.migrations import run_migrations
+
+# ====================================================
+# 💾 BACKUP ONLINE E RESTAURAÇÃO A QUENTE
+# ====================================================
+# Backup: snapshot consistente pela API de backup do SQLite (o bot continua
+# escrevendo) num arquivo temporário, enviado em pedaços (opcionalmente gzip).
+# Restauração: o arquivo enviado é validado e copiado para dentro do banco
+# aberto pelo pool; migrações e caches são refeitos sem reiniciar o bot.
+
+BACKUP_PAGES = int(os.getenv("DB_BACKUP_PAGES", 256))  # Páginas por passo da API de backup
+CHUNK_SIZE = 64 * 1024
+GZIP_MAGIC = b'\x1f\x8b'
+
+def _temp_path(suffix):
+    # Mesma pasta do banco: evita copiar entre discos e some junto com ele
+    fd, path = tempfile.mkstemp(suffix=suffix, dir='database')
+    os.close(fd)
+    return path
+
+def _remove(path):
+    try: os.remove(path)
+    except OSError: pass
+
+def backup_filename(compress=False):
+    stamp = datetime.datetime.now().strftime('%Y%m%d_%H%M')
+    return f"bot_data_{stamp}.db" + (".gz" if compress else "")
+
+async def create_snapshot(pool):
+    """Gera o snapshot num arquivo temporário e retorna o caminho."""
+    path = _temp_path('.db')
+    try:
+        await pool.snapshot(path, pages=BACKUP_PAGES)
+    except Exception:
+        _remove(path)
+        raise
+    return path
+
+async def iter_snapshot(path, compress=False, remove=True):
+    """Lê o snapshot em pedaços (gzip em streaming se pedido) e apaga no final."""
+    encoder = zlib.compressobj(6, zlib.DEFLATED, 31) if compress else None # wbits 31 = formato gzip
+    try:
+        with open(path, 'rb') as f:
+            while True:
+                chunk = await asyncio.to_thread(f.read, CHUNK_SIZE)
+                if not chunk: break
+                if encoder:
+                    chunk = encoder.compress(chunk)
+                    if not chunk: continue
+                yield chunk
+        if encoder:
+            yield encoder.flush()
+    finally:
+        if remove: _remove(path)
+
+def _prepare_upload(path):
+    """Descompacta (se .gz) e valida o arquivo enviado. Retorna o caminho do .db."""
+    with open(path, 'rb') as f:
+        compressed = f.read(2) == GZIP_MAGIC
+
+    db_path = path
+    if compressed:
+        db_path = path + '.db'
+        with gzip.open(path, 'rb') as src, open(db_path, 'wb') as dst:
+            while True:
+                chunk = src.read(CHUNK_SIZE)
+                if not chunk: break
+                dst.write(chunk)
+
+    try:
+        conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+        try:
+            if conn.execute("PRAGMA quick_check").fetchone()[0] != 'ok':
+                raise ValueError("Arquivo corrompido (quick_check falhou).")
+            if not conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'config'").fetchone():
+                raise ValueError("Não parece um banco do bot (tabela config ausente).")
+        finally:
+            conn.close()
+    except sqlite3.DatabaseError as e:
+        raise ValueError(f"Arquivo inválido: {e}")
+    return db_path
+
+async def restore_database(bot, upload_path):
+    """Restaura o banco a partir de um arquivo (.db ou .db.gz) com o bot rodando."""
+    db_path = None
+    safety = None
+    try:
+        db_path = await asyncio.to_thread(_prepare_upload, upload_path)
+
+        # Cópia de segurança do estado atual antes de sobrescrever
+        safety = await create_snapshot(bot.db)
+        os.replace(safety, "database/bot_data.db.bak")
+        safety = None
+
+        # Backup de uma versão antiga: aplica as migrações que faltarem (ainda com os escritores parados)
+        await bot.db.restore_from(db_path, after=run_migrations)
+        if bot.archive: await bot.archive.ensure_tables()
+        await bot.db.barrier()
+
+        # Caches em memória apontavam para o banco anterior
+        await bot.config_cache.load()
+        bot.licenses.invalidate()
+        if bot.stats: await bot.stats.refresh()
+        bot.dispatch('database_restored')
+        print("✅ [BACKUP] Banco restaurado a quente.")
+    finally:
+        for path in (db_path, safety):
+            if path and path != upload_path: _remove(path)
@@ -1,443 +1,284 @@
 import aiosqlite
+import asyncio
 import os
+import sqlite3
+from contextlib import asynccontextmanager
+
+from aiosqlite.context import contextmanager as result_context # Mesmo retorno do aiosqlite: await ou async with
 
 DB_NAME = "database/bot_data.db"
 
+# Banco frio: linhas antigas das tabelas de log (ver database/archive.py)
+ARCHIVE_NAME = os.getenv("DB_ARCHIVE", "database/bot_archive.db")
+
+# Pool: 1 conexão de escrita + N somente-leitura (WAL permite leitura concorrente)
+DB_READERS = int(os.getenv("DB_READERS", 3))
+
+# Group commit: commit() só marca a transação como suja; um flusher em
+# background faz o COMMIT real a cada N ms ou a cada M statements.
+DB_COMMIT_INTERVAL = int(os.getenv("DB_COMMIT_INTERVAL_MS", 25)) / 1000
+DB_COMMIT_BATCH = int(os.getenv("DB_COMMIT_BATCH", 50))
+
+# Pragmas aplicados em todas as conexões do pool
+DB_PRAGMAS = (
+    "PRAGMA synchronous = NORMAL",   # Seguro em WAL, evita fsync por commit
+    "PRAGMA cache_size = -8000",     # ~8 MB de cache por conexão
+    "PRAGMA mmap_size = 67108864",   # 64 MB mapeados em memória
+    "PRAGMA temp_store = MEMORY",
+    "PRAGMA busy_timeout = 5000",
+)
+
 async def create_db():
+    """Garante a pasta do banco e aplica as migrações pendentes (ver database/schema.py)."""
+    from database.migrations import run_migrations
+
     if not os.path.exists('database'):
         os.makedirs('database')
 
     async with aiosqlite.connect(DB_NAME) as db:
-        # ====================================================
-        # 1. CRIAÇÃO DAS TABELAS
-        # ====================================================
-        await db.execute("""
-            CREATE TABLE IF NOT EXISTS config (
-                guild_id INTEGER PRIMARY KEY,
-                welcome_channel_id INTEGER, logs_channel_id INTEGER, sales_log_channel_id INTEGER,
-                welcome_banner TEXT, welcome_color INTEGER DEFAULT 0,
-                welcome_dm_active INTEGER DEFAULT 1,
-                wl_btn_label TEXT, wl_btn_url TEXT, wl_btn_emoji TEXT,
-                btn1_label TEXT, btn1_url TEXT, btn1_emoji TEXT,
-                btn2_label TEXT, btn2_url TEXT, btn2_emoji TEXT,
-                btn3_label TEXT, btn3_url TEXT, btn3_emoji TEXT,
-                status_channel_id INTEGER, status_message_id INTEGER, server_ip TEXT,
-                presence_interval INTEGER DEFAULT 60, presence_state TEXT DEFAULT 'online',
-                sugg_channel_id INTEGER, sugg_count INTEGER DEFAULT 0,
-                sugg_color INTEGER DEFAULT 0, sugg_up_emoji TEXT, sugg_down_emoji TEXT,
-                bug_public_channel_id INTEGER, bug_staff_channel_id INTEGER, bug_count INTEGER DEFAULT 0,
-                bug_emoji_public TEXT, bug_emoji_analyze TEXT, bug_emoji_fixed TEXT, bug_emoji_invalid TEXT,
-                ticket_panel_channel_id INTEGER,
-                ticket_category_id INTEGER,
-                ticket_logs_id INTEGER,
-                ticket_support_role_id INTEGER,
-                ticket_count INTEGER DEFAULT 0,
-                ticket_title TEXT, ticket_desc TEXT, ticket_banner TEXT, ticket_color INTEGER DEFAULT 0,
-                ticket_viewer_url TEXT,
-                tk_emoji_claim TEXT, tk_emoji_admin TEXT, tk_emoji_close TEXT, tk_emoji_cancel TEXT, tk_emoji_voice TEXT,
-                rating_channel_id INTEGER,
-                action_channel_id INTEGER,
-                action_logs_channel_id INTEGER,
-                action_role_id INTEGER,
-                action_emoji_join TEXT, action_emoji_leave TEXT,
-                action_emoji_win TEXT, action_emoji_loss TEXT,
-                action_emoji_notify TEXT, action_emoji_edit TEXT,
-                action_ranking_channel_id INTEGER,
-                action_ranking_channel_id INTEGER,
-                verification_role_id INTEGER,
-                ticket_backup_webhook TEXT,
-                verification_emoji TEXT,
-                giveaway_color INTEGER DEFAULT 3447003,
-                giveaway_emoji TEXT DEFAULT '🎉',
-                sales_panel_color INTEGER DEFAULT 3066993,
-                sales_btn_emoji TEXT DEFAULT '💰',
-                sales_emoji_normal TEXT DEFAULT '💵',
-                sales_emoji_partnership TEXT DEFAULT '🤝'
-            )
-        """)
-        
-        await db.execute("CREATE TABLE IF NOT EXISTS ticket_categories (id INTEGER PRIMARY KEY AUTOINCREMENT, guild_id INTEGER, label TEXT, description TEXT, emoji TEXT, location_id INTEGER)")
-        await db.execute("CREATE TABLE IF NOT EXISTS active_tickets (channel_id INTEGER PRIMARY KEY, guild_id INTEGER, user_id INTEGER, opened_at TEXT, claimed_by INTEGER)")
-        await db.execute("CREATE TABLE IF NOT EXISTS staff_ratings (id INTEGER PRIMARY KEY AUTOINCREMENT, guild_id INTEGER, staff_id INTEGER, user_id INTEGER, stars INTEGER, comment TEXT, date TEXT)")
-        await db.execute("CREATE TABLE IF NOT EXISTS presence (id INTEGER PRIMARY KEY AUTOINCREMENT, guild_id INTEGER, activity_type TEXT, activity_text TEXT, activity_url TEXT)")
-        await db.execute("CREATE TABLE IF NOT EXISTS suggestion_votes (message_id INTEGER, user_id INTEGER, vote_type TEXT, guild_id INTEGER, PRIMARY KEY (message_id, user_id))")
-        
-        # Tabela de Ações da Facção
-        await db.execute("""
-            CREATE TABLE IF NOT EXISTS faction_actions (
-                message_id INTEGER PRIMARY KEY,
-                channel_id INTEGER,
-                guild_id INTEGER,
-                responsible_id INTEGER,
-                action_name TEXT,
-                date_time TEXT,
-                slots INTEGER,
-                status TEXT, -- OPEN, FULL, WIN, LOSS
-                profit TEXT,
-                participants TEXT, -- JSON List
-                cancellations TEXT, -- JSON List
-                mvp_id INTEGER
-            )
-        """)
-        
-        await db.execute("CREATE TABLE IF NOT EXISTS action_mvp_votes (message_id INTEGER, voter_id INTEGER, target_id INTEGER, guild_id INTEGER, PRIMARY KEY (message_id, voter_id))")
-        
-        # Tabela de Pings Ativos (Auto-Update)
-        await db.execute("""
-            CREATE TABLE IF NOT EXISTS active_pings (
-                message_id INTEGER PRIMARY KEY,
-                channel_id INTEGER,
-                guild_id INTEGER,
-                user_id INTEGER
-            )
-        """)
-        
-        # Tabela de Streams Ativas (Fase 11)
-        await db.execute("""
-            CREATE TABLE IF NOT EXISTS active_streams (
-                message_id INTEGER PRIMARY KEY,
-                channel_id INTEGER,
-                guild_id INTEGER,
-                user_id INTEGER,
-                start_time TEXT,
-                platform TEXT DEFAULT 'twitch',
-                stream_url TEXT
-            )
-        """)
-        
-        # Tabela de Templates de Embed
-        await db.execute("""
-            CREATE TABLE IF NOT EXISTS embed_templates (
-                name TEXT,
-                data TEXT, -- JSON Dump
-                guild_id INTEGER,
-                PRIMARY KEY (name, guild_id)
-            )
-        """)
-
-        # ====================================================
-        # NOVO: Tabelas do Painel do Dono & Advanced Features
-        # ====================================================
-        await db.execute("""
-            CREATE TABLE IF NOT EXISTS licenses (
-                key TEXT PRIMARY KEY,
-                guild_id INTEGER,
-                client_name TEXT,
-                expiration_date TEXT,
-                status TEXT DEFAULT 'active',
-                max_users INTEGER DEFAULT 0,
-                tier TEXT DEFAULT 'start'
-            )
-        """)
-
-        # ====================================================
-        # FASE 12: Organization Management (Punishments & Timesheet)
-        # ====================================================
-        await db.execute("""
-            CREATE TABLE IF NOT EXISTS org_punishments (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                guild_id INTEGER,
-                user_id INTEGER,
-                staff_id INTEGER,
-                type TEXT, -- 'warn', 'feedback', 'ban'
-                reason TEXT, -- Hidden from user (Staff Only)
-                conclusion TEXT, -- Staff notes
-                timestamp TEXT DEFAULT CURRENT_TIMESTAMP
-            )
-        """)
-
-        await db.execute("""
-            CREATE TABLE IF NOT EXISTS time_sessions (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                guild_id INTEGER,
-                user_id INTEGER,
-                start_time TEXT,
-                end_time TEXT,
-                total_seconds INTEGER DEFAULT 0,
-                status TEXT DEFAULT 'OPEN' -- OPEN, PAUSED, CLOSED
-            )
-        """)
-        
-        # Tabela para Pausas (Para descontar do total)
-        await db.execute("""
-            CREATE TABLE IF NOT EXISTS time_pauses (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                session_id INTEGER,
-                start_time TEXT,
-                end_time TEXT,
-                FOREIGN KEY(session_id) REFERENCES time_sessions(id)
-            )
-        """)
-
-        await db.execute("""
-            CREATE TABLE IF NOT EXISTS timesheet_logs (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                guild_id INTEGER,
-                user_id INTEGER,
-                action TEXT,
-                timestamp TEXT,
-                session_id INTEGER,
-                details TEXT
-            )
-        """)
-
-        await db.execute("""
-            CREATE TABLE IF NOT EXISTS audit_logs (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                user_id INTEGER,
-                action TEXT,
-                target TEXT,
-                timestamp TEXT DEFAULT CURRENT_TIMESTAMP
-            )
-        """)
-
-        await db.execute("""
-            CREATE TABLE IF NOT EXISTS global_bans (
-                user_id INTEGER PRIMARY KEY,
-                reason TEXT,
-                proof_url TEXT,
-                added_by INTEGER,
-                timestamp TEXT DEFAULT CURRENT_TIMESTAMP
-            )
-        """)
-
-        # ====================================================
-        # FASE 13: Dynamic Tier Management
-        # ====================================================
-        await db.execute("""
-            CREATE TABLE IF NOT EXISTS tier_definitions (
-                tier_name TEXT,
-                module_name TEXT,
-                PRIMARY KEY (tier_name, module_name)
-            )
-        """)
-        
-        # ====================================================
-        # ATUALIZAÇÃO FORÇADA DE TIERS (Garanti que está sempre sync c/ código)
-        # ====================================================
-        print("🌱 [DATABASE] Seeding / Updating Default Tiers...")
-
-            
-        # Mapeamento oficial solicitado
-        # 'Sorteio' -> 'giveaway_system'
-        # 'Factionactions' -> 'faction_actions'
-        # 'Timessheet' -> 'timesheet'
-        defaults = {
-            'start': [
-                'admin', 'embed_creator', 'general', 'logs', 'tickets', 'webserver', 'welcome'
-            ],
-            'faction': [
-                'admin', 'embed_creator', 'faction_actions', 'general', 'hierarchy', 'logs', 
-                'punishments', 'sales', 'setagem', 'sorteio', 'streaming', 'suggestions', 
-                'tickets', 'timesheet', 'webserver', 'welcome'
-            ],
-            'police': [
-                'admin', 'embed_creator', 'faction_actions', 'general', 'hierarchy', 'logs', 
-                'punishments', 'setagem', 'sorteio', 'staff_stats', 'streaming', 
-                'suggestions', 'tickets', 'webserver', 'welcome'
-            ],
-            'v8': [
-                'admin', 'bugs', 'embed_creator', 'faction_actions', 'general', 'hierarchy', 
-                'logs', 'punishments', 'setagem', 'sorteio', 'staff_stats', 
-                'streaming', 'suggestions', 'tickets', 'verification', 'webserver', 'welcome'
-            ]
-        }
-        
-        # Limpa definições antigas desses tiers para garantir que fique igual ao solicitado
-        await db.execute("DELETE FROM tier_definitions WHERE tier_name IN ('start', 'faction', 'police', 'v8')")
-        
-        for tier, modules in defaults.items():
-            for module in modules:
-                await db.execute("INSERT INTO tier_definitions (tier_name, module_name) VALUES (?, ?)", (tier, module))
-        
-        # Migração Automática para Colunas Novas (Timesheet V2)
-        async with db.execute("PRAGMA table_info(config)") as cursor:
-            cols = [row[1] for row in await cursor.fetchall()]
-
-        new_cols = {
-            'ts_channel_operator': 'INTEGER',
-            'ts_channel_management': 'INTEGER',
-            'ts_channel_history': 'INTEGER',
-            'ts_role_id': 'INTEGER'
-        }
-
-        for col_name, col_type in new_cols.items():
-            if col_name not in cols:
-                print(f"⚠️ Migrando DB: Adicionando coluna '{col_name}' em config...")
-                await db.execute(f"ALTER TABLE config ADD COLUMN {col_name} {col_type}")
-            
-        await db.commit()
-
-        # ====================================================
-        # 2. MIGRAÇÃO SEGURA
-        # ====================================================
-        cols_config = [
-            ("tk_emoji_claim", "TEXT"), 
-            ("tk_emoji_admin", "TEXT"), 
-            ("tk_emoji_close", "TEXT"), 
-            ("tk_emoji_cancel", "TEXT"), 
-            ("tk_emoji_voice", "TEXT"),
-            ("ticket_viewer_url", "TEXT"),
-            ("rating_channel_id", "INTEGER"),
-            ("action_channel_id", "INTEGER"),
-            ("action_logs_channel_id", "INTEGER"),
-            ("action_role_id", "INTEGER"),
-            ("action_emoji_join", "TEXT"),
-            ("action_emoji_leave", "TEXT"),
-            ("action_emoji_win", "TEXT"),
-            ("action_emoji_loss", "TEXT"),
-            ("action_emoji_notify", "TEXT"),
-            ("action_emoji_edit", "TEXT"),
-            ("action_ranking_channel_id", "INTEGER"),
-            ("verification_role_id", "INTEGER"),
-            ("ticket_backup_webhook", "TEXT"),
-            ("ticket_backup_webhook", "TEXT"),
-            ("ticket_backup_webhook", "TEXT"),
-            ("verification_emoji", "TEXT"),
-            ("welcome_dm_active", "INTEGER DEFAULT 1"),
-            ("giveaway_color", "INTEGER DEFAULT 3447003"),
-            ("giveaway_emoji", "TEXT DEFAULT '🎉'"),
-            ("sales_panel_color", "INTEGER DEFAULT 3066993"),
-            ("sales_btn_emoji", "TEXT DEFAULT '💰'"),
-            ("sales_log_channel_id", "INTEGER"),
-            ("sales_emoji_normal", "TEXT DEFAULT '💵'"),
-            ("sales_emoji_partnership", "TEXT DEFAULT '🤝'"),
-            ("streaming_role_id", "INTEGER"),
-            ("ticket_panel_channel_id", "INTEGER"),
-            ("alignment_channel_id", "INTEGER"),
-            ("timesheet_channel_id", "INTEGER"),
-            ("timesheet_message_id", "INTEGER"),
-            ("punish_title", "TEXT DEFAULT '⚠️ Notificação Administrativa'"),
-            ("punish_desc", "TEXT DEFAULT 'Você recebeu um apontamento administrativo.'"),
-            ("punish_emoji_warn", "TEXT DEFAULT '🟧'"),
-            ("punish_emoji_feedback", "TEXT DEFAULT '🟨'"),
-            ("punish_emoji_ban", "TEXT DEFAULT '🟥'")
-        ]
-        
-        async with db.execute("PRAGMA table_info(config)") as cursor:
-            existing_config = [row[1] for row in await cursor.fetchall()]
-        
-        for c, t in cols_config:
-            if c not in existing_config:
-                try: 
-                    print(f"🔄 [DATABASE] Adicionando coluna: {c}")
-                    await db.execute(f"ALTER TABLE config ADD COLUMN {c} {t}")
-                except: pass
-                
-        # ====================================================
-        # MIGRAÇÕES (ALTER TABLE para bancos já existentes)
-        # ====================================================
-        try:
-            # Verifica colunas da tabela licenses
-            async with db.execute("PRAGMA table_info(licenses)") as cursor:
-                columns = [row[1] for row in await cursor.fetchall()]
-
-            if 'tier' not in columns:
-                print("⚠️ [MIGRATION] Adicionando coluna 'tier' à tabela licenses...")
-                await db.execute("ALTER TABLE licenses ADD COLUMN tier TEXT DEFAULT 'start'")
-                print("✅ [MIGRATION] Coluna 'tier' adicionada com sucesso.")
-            
-            if 'max_users' not in columns:
-                print("⚠️ [MIGRATION] Adicionando coluna 'max_users' à tabela licenses...")
-                await db.execute("ALTER TABLE licenses ADD COLUMN max_users INTEGER DEFAULT 0")
-
-        except Exception as e:
-            print(f"❌ [MIGRATION ERROR] Falha ao verificar/migrar tabela licenses: {e}")
-            
-        # ====================================================
-        # MIGRAÇÃO FORÇADA DE PUNIÇÕES (FIX)
-        # ====================================================
+        await run_migrations(db)
+
+# ====================================================
+# 🏊 POOL DE CONEXÕES (LEITOR / ESCRITOR)
+# ====================================================
+class DatabasePool:
+    """
+    Uma conexão de escrita e N conexões somente-leitura em modo WAL.
+    Chamadas diretas (bot.db.execute / commit / ...) vão para o escritor,
+    então o código antigo continua funcionando sem alterações; execute e
+    executemany passam pelo lock de escrita, um statement por vez.
+    Varreduras longas devem usar `async with bot.db.read() as conn:`.
+
+    commit() é agrupado (group commit): a escrita já está na transação
+    corrente e o fsync acontece no próximo flush. Quem precisa de
+    durabilidade antes de um efeito no Discord chama `await bot.db.barrier()`.
+
+    Ler a própria escrita: o escritor (bot.db.execute) enxerga na hora; os
+    leitores de read() só depois do COMMIT real. Quem grava e relê por
+    read() logo em seguida (painel, polling, outra task) usa
+    `write(durable=True)` ou `barrier()`; o commit() simples serve para
+    quem relê pelo escritor ou não relê.
+
+    write() e o flusher disputam o mesmo lock: o COMMIT em background nunca
+    cai no meio de um bloco write(), e um bloco que falha desfaz só as
+    próprias escritas (savepoint).
+    """
+    def __init__(self, path=DB_NAME, readers=DB_READERS, commit_interval=DB_COMMIT_INTERVAL, commit_batch=DB_COMMIT_BATCH, archive_path=ARCHIVE_NAME):
+        self.path = path
+        self.archive_path = archive_path
+        self.reader_count = max(0, readers)
+        self.commit_interval = commit_interval
+        self.commit_batch = max(1, commit_batch)
+        self.writer = None
+        self._readers = asyncio.Queue()
+        self._all_readers = []
+        self._write_lock = asyncio.Lock()
+        self._lock_owner = None # Task dentro do lock (barrier/commit dentro de write() não travam)
+        self._pending = 0
+        self._dirty = asyncio.Event()
+        self._flusher = None
+        self.shards = None # ShardRouter quando DB_SHARDING=1 (ver database/shards.py)
+
+    async def open(self):
+        self.writer = await aiosqlite.connect(self.path)
+        await self.writer.execute("PRAGMA journal_mode = WAL")
+        await self.writer.execute("PRAGMA foreign_keys = ON")
+        for pragma in DB_PRAGMAS:
+            await self.writer.execute(pragma)
+
+        # Arquivo frio anexado como schema "archive" em todas as conexões
+        if self.archive_path:
+            await self.writer.execute("ATTACH DATABASE ? AS archive", (self.archive_path,))
+            # Consome o resultado: com o statement aberto os leitores não conseguem anexar
+            async with self.writer.execute("PRAGMA archive.journal_mode = WAL") as cursor:
+                await cursor.fetchall()
+
+        for _ in range(self.reader_count):
+            conn = await aiosqlite.connect(f"file:{self.path}?mode=ro", uri=True)
+            await conn.execute("PRAGMA query_only = ON")
+            if self.archive_path:
+                await conn.execute("ATTACH DATABASE ? AS archive", (f"file:{self.archive_path}?mode=ro",))
+            for pragma in DB_PRAGMAS:
+                await conn.execute(pragma)
+            self._all_readers.append(conn)
+            self._readers.put_nowait(conn)
+
+        self._flusher = asyncio.create_task(self._flush_loop())
+        return self
+
+    def __getattr__(self, name):
+        # Delegação: execute, commit, execute_fetchall, total_changes...
+        writer = self.__dict__.get('writer')
+        if writer is None:
+            raise AttributeError(name)
+        return getattr(writer, name)
+
+    # --- ESCRITORES AVULSOS ---
+    # bot.db.execute(...) fora de write(): cada statement pega o lock, então
+    # não cai no meio de um bloco write() nem de um restore_from.
+    @result_context
+    async def execute(self, sql, parameters=None):
+        async with self._locked():
+            return await self.writer.execute(sql, parameters)
+
+    async def executemany(self, sql, parameters):
+        async with self._locked():
+            return await self.writer.executemany(sql, parameters)
+
+    async def execute_fetchall(self, sql, parameters=None):
+        async with self._locked():
+            return await self.writer.execute_fetchall(sql, parameters)
+
+    # --- GROUP COMMIT ---
+    async def commit(self):
+        """Reconhece a escrita imediatamente; o COMMIT real fica com o flusher."""
+        self._pending += 1
+        if self._pending >= self.commit_batch:
+            await self.barrier()
+        else:
+            self._dirty.set()
+
+    async def barrier(self):
+        """Força o COMMIT agora (durabilidade garantida ao retornar)."""
+        async with self._locked():
+            self._pending = 0
+            self._dirty.clear()
+            await self.writer.commit()
+
+    @asynccontextmanager
+    async def _locked(self):
+        """Lock de escrita; reentrante para a task que já está com ele."""
+        task = asyncio.current_task()
+        if self._lock_owner is task:
+            yield
+            return
+        async with self._write_lock:
+            self._lock_owner = task
+            try:
+                yield
+            finally:
+                self._lock_owner = None
+
+    async def _flush_loop(self):
+        while True:
+            await self._dirty.wait()
+            await asyncio.sleep(self.commit_interval)
+            if not self._dirty.is_set(): continue # Barreira já comitou
+            try:
+                await self.barrier()
+            except Exception as e:
+                print(f"❌ [DATABASE] Falha no group commit: {e}")
+
+    @asynccontextmanager
+    async def read(self):
+        """Empresta uma conexão somente-leitura (vê apenas dados já commitados)."""
+        if not self._all_readers:
+            yield self.writer
+            return
+        conn = await self._readers.get()
         try:
-            async with db.execute("PRAGMA table_info(config)") as cursor:
-                cols_check = [row[1] for row in await cursor.fetchall()]
-
-            if "punish_title" not in cols_check:
-                print("⚠️ [FIX] Forçando criação de colunas de Punição...")
-                try: await db.execute("ALTER TABLE config ADD COLUMN punish_title TEXT DEFAULT '⚠️ Notificação Administrativa'")
-                except: pass
-                try: await db.execute("ALTER TABLE config ADD COLUMN punish_desc TEXT DEFAULT 'Você recebeu um apontamento administrativo.'") 
-                except: pass
-                try: await db.execute("ALTER TABLE config ADD COLUMN punish_emoji_warn TEXT DEFAULT '🟧'")
-                except: pass
-                try: await db.execute("ALTER TABLE config ADD COLUMN punish_emoji_feedback TEXT DEFAULT '🟨'")
-                except: pass
-                try: await db.execute("ALTER TABLE config ADD COLUMN punish_emoji_ban TEXT DEFAULT '🟥'")
-                except: pass
-            
-            if "punish_color" not in cols_check:
-                print("⚠️ [FIX] Adicionando coluna punish_color...")
-                try: await db.execute("ALTER TABLE config ADD COLUMN punish_color INTEGER DEFAULT 16766720")
-                except: pass
-
-            if "punish_channel_id" not in cols_check:
-                print("⚠️ [FIX] Adicionando coluna punish_channel_id...")
-                try: await db.execute("ALTER TABLE config ADD COLUMN punish_channel_id INTEGER")
-                except: pass
-
-        except Exception as e:
-            print(f"❌ [FIX ERROR] Erro na migração de punições: {e}")
-            
-        await db.commit()
-        print("✅ [DATABASE] Banco de dados verificado e atualizado.")
-                
-        # Migração para faction_actions (MVP)
-        async with db.execute("PRAGMA table_info(faction_actions)") as cursor:
-            existing_actions = [row[1] for row in await cursor.fetchall()]
-        if "mvp_id" not in existing_actions:
-            try: await db.execute("ALTER TABLE faction_actions ADD COLUMN mvp_id INTEGER")
-            except: pass
+            yield conn
+        finally:
+            self._readers.put_nowait(conn)
 
-        # Migração para Giveaways (Title/Desc)
-        async with db.execute("PRAGMA table_info(giveaways)") as cursor:
-            existing_gw = [row[1] for row in await cursor.fetchall()]
-        
-        if "title" not in existing_gw:
-            try: await db.execute("ALTER TABLE giveaways ADD COLUMN title TEXT")
-            except: pass
-        if "description" not in existing_gw:
-            try: await db.execute("ALTER TABLE giveaways ADD COLUMN description TEXT")
-            except: pass
+    @asynccontextmanager
+    async def write(self, durable=False):
+        """Bloco de escrita serializado; faz commit (ou barreira) ao sair sem erro.
 
-        # Migrações extras
-        async with db.execute("PRAGMA table_info(active_tickets)") as cursor:
-            existing_tickets = [row[1] for row in await cursor.fetchall()]
-        if "guild_id" not in existing_tickets:
-            try: await db.execute("ALTER TABLE active_tickets ADD COLUMN guild_id INTEGER")
-            except: pass
+        Se o bloco levantar, as escritas dele são desfeitas (ROLLBACK TO do
+        savepoint); o que outros já gravaram na transação agrupada fica.
+        """
+        async with self._locked():
+            if not self.writer.in_transaction:
+                await self.writer.execute("BEGIN")
+            await self.writer.execute("SAVEPOINT pool_write")
+            try:
+                yield self.writer
+            except:
+                await self.writer.execute("ROLLBACK TO pool_write")
+                await self.writer.execute("RELEASE pool_write")
+                raise
+            await self.writer.execute("RELEASE pool_write")
+            if durable: await self.barrier()
+            else: await self.commit()
 
-        async with db.execute("PRAGMA table_info(staff_ratings)") as cursor:
-            existing_ratings = [row[1] for row in await cursor.fetchall()]
-        if "guild_id" not in existing_ratings:
-            try: await db.execute("ALTER TABLE staff_ratings ADD COLUMN guild_id INTEGER")
-            except: pass
+    @asynccontextmanager
+    async def quiesced(self):
+        """Lock de escrita com tudo já comitado: nada novo entra até o bloco sair."""
+        async with self._locked():
+            await self.barrier()
+            yield self.writer
 
-        async with db.execute("PRAGMA table_info(suggestion_votes)") as cursor:
-            existing_votes = [row[1] for row in await cursor.fetchall()]
-        if "guild_id" not in existing_votes:
-            try: await db.execute("ALTER TABLE suggestion_votes ADD COLUMN guild_id INTEGER")
-            except: pass
+    # --- SHARDING POR GUILD ---
+    async def for_guild(self, guild_id):
+        """Pool que guarda as tabelas da guild. Sem sharding é o próprio pool."""
+        if self.shards is None or guild_id is None:
+            return self
+        return await self.shards.get(guild_id)
 
-        async with db.execute("PRAGMA table_info(action_mvp_votes)") as cursor:
-            existing_mvp_votes = [row[1] for row in await cursor.fetchall()]
-        if "guild_id" not in existing_mvp_votes:
-            try: await db.execute("ALTER TABLE action_mvp_votes ADD COLUMN guild_id INTEGER")
-            except: pass
+    async def fan_out(self, sql, params=()):
+        """Leitura em todos os bancos de guild. Retorna [(guild_id, rows)] (guild_id None sem sharding)."""
+        if self.shards is None:
+            async with self.read() as conn:
+                async with conn.execute(sql, params) as cursor:
+                    return [(None, await cursor.fetchall())]
+        return await self.shards.fan_out(sql, params)
+
+    # --- BACKUP / RESTORE ONLINE ---
+    async def snapshot(self, dest, pages=256):
+        """Cópia consistente do banco em `dest` pela API de backup do SQLite.
 
-        # ====================================================
-        # 3. INDICES
-        # ====================================================
-        await db.execute("CREATE INDEX IF NOT EXISTS idx_cat_guild ON ticket_categories(guild_id)")
-        await db.execute("CREATE INDEX IF NOT EXISTS idx_ticket_guild ON active_tickets(guild_id)")
-        await db.execute("CREATE INDEX IF NOT EXISTS idx_rating_guild_staff ON staff_ratings(guild_id, staff_id)")
-        await db.execute("CREATE INDEX IF NOT EXISTS idx_sugg_guild ON suggestion_votes(guild_id)")
-        await db.execute("CREATE INDEX IF NOT EXISTS idx_mvp_guild ON action_mvp_votes(guild_id)")
+        Roda numa conexão própria (em thread) com uma transação de leitura
+        aberta: a cópia é feita em passos de `pages` páginas, todos sobre o
+        mesmo snapshot, e o escritor continua livre durante o processo.
+        """
+        def run():
+            src = sqlite3.connect(f"file:{self.path}?mode=ro", uri=True)
+            dst = sqlite3.connect(dest)
+            try:
+                src.execute("BEGIN")
+                src.execute("SELECT COUNT(*) FROM sqlite_master").fetchone()
+                src.backup(dst, pages=pages)
+                src.rollback()
+                dst.execute("PRAGMA journal_mode = DELETE") # Arquivo único, sem -wal
+            finally:
+                src.close()
+                dst.close()
+        await asyncio.to_thread(run)
 
-        await db.commit()
+    async def restore_from(self, source, after=None):
+        """Substitui o conteúdo do banco pelo de `source`, sem fechar o pool.
+
+        A cópia é um único passo da API de backup sobre a conexão de escrita;
+        os leitores passam a ver o banco novo na próxima leitura. Todo
+        escritor (write(), execute avulso, flusher) espera no lock até o fim,
+        incluindo `after(writer)` (ex.: run_migrations).
+        """
+        async with self._locked():
+            await self.barrier() # O destino não pode estar no meio de uma transação
+            async with aiosqlite.connect(source) as src:
+                await src.backup(self.writer)
+            if after: await after(self.writer)
+            await self.barrier()
+
+    async def close(self):
+        if self.shards:
+            await self.shards.close()
+        if self._flusher:
+            self._flusher.cancel()
+            self._flusher = None
+        if self.writer:
+            try: await self.barrier()
+            except: pass
+        for conn in self._all_readers:
+            try: await conn.close()
+            except: pass
+        self._all_readers = []
+        if self.writer:
+            await self.writer.close()
 
 async def get_db_connection():
-    db = await aiosqlite.connect(DB_NAME)
-    await db.execute("PRAGMA foreign_keys = ON") 
-    return db
+    return await DatabasePool().open()
 
 # A FUNÇÃO QUE FALTAVA ESTÁ AQUI EMBAIXO 👇
 async def check_guild_config(guild_id, db_connection):
@@ -0,0 +1,124 @@
+from database.bot_db import check_guild_config
+
+# ====================================================
+# 🧠 CACHE DE CONFIGURAÇÃO (WRITE-THROUGH)
+# ====================================================
+# A tabela config tem uma linha por guild e 80+ colunas, mas os eventos
+# quentes (mensagens, voz, entradas) só precisam de uma ou duas delas.
+# O cache é carregado inteiro no boot e toda escrita passa por update(),
+# então leitura vira consulta em dicionário, sem tocar no banco.
+#
+# on_change: callbacks síncronos (guild_id, colunas) chamados depois de cada
+# mudança; colunas None = linha inteira (guild_id None = cache inteiro).
+
+class GuildConfigCache:
+    def __init__(self, db):
+        self.db = db
+        self.columns = ()
+        self._rows = {}
+        self.on_change = []
+
+    def _changed(self, guild_id, columns=None):
+        for callback in self.on_change:
+            try: callback(guild_id, columns)
+            except Exception as e: print(f"⚠️ [CONFIG CACHE] Falha em on_change: {e}")
+
+    async def load(self):
+        """Carrega todas as linhas da config em uma única leitura."""
+        async with self.db.execute("SELECT * FROM config") as cursor:
+            self.columns = tuple(d[0] for d in cursor.description)
+            rows = await cursor.fetchall()
+
+        self._rows = {}
+        for row in rows:
+            data = dict(zip(self.columns, row))
+            self._rows[data['guild_id']] = data
+        print(f"✅ [CONFIG CACHE] {len(self._rows)} configurações em memória.")
+        self._changed(None)
+
+    async def _refresh_columns(self):
+        """Relê as colunas (o schema pode ter mudado depois do load)."""
+        async with self.db.execute("PRAGMA table_info(config)") as cursor:
+            self.columns = tuple(r[1] for r in await cursor.fetchall())
+
+    def get(self, guild_id, column=None, default=None):
+        """Retorna a linha inteira (cópia) ou o valor de uma coluna."""
+        row = self._rows.get(guild_id)
+        if column is None:
+            return dict(row) if row else {}
+        if not row:
+            return default
+        value = row.get(column)
+        return default if value is None else value
+
+    def get_many(self, guild_id, *columns):
+        """Retorna uma tupla com as colunas pedidas (None se não existir)."""
+        row = self._rows.get(guild_id) or {}
+        return tuple(row.get(c) for c in columns)
+
+    def has(self, guild_id):
+        return guild_id in self._rows
+
+    def guild_ids(self):
+        return list(self._rows.keys())
+
+    async def update(self, guild_id, commit=True, **values):
+        """Grava as colunas no banco (UPSERT) e atualiza o cache."""
+        if not values: return
+
+        missing = [c for c in values if c not in self.columns]
+        if missing:
+            await self._refresh_columns()
+            missing = [c for c in values if c not in self.columns]
+            if missing:
+                raise ValueError(f"Colunas inexistentes em config: {', '.join(missing)}")
+
+        cols = list(values.keys())
+        placeholders = ", ".join("?" for _ in cols)
+        assignments = ", ".join(f"{c} = excluded.{c}" for c in cols)
+        await self.db.execute(
+            f"INSERT INTO config (guild_id, {', '.join(cols)}) VALUES (?, {placeholders}) "
+            f"ON CONFLICT(guild_id) DO UPDATE SET {assignments}",
+            (guild_id, *values.values())
+        )
+        if commit:
+            await self.db.commit()
+
+        if guild_id not in self._rows:
+            await self.reload(guild_id)
+        else:
+            self._rows[guild_id].update(values)
+            self._changed(guild_id, tuple(values))
+
+    async def ensure(self, guild_id):
+        """Garante a linha padrão da guild no banco e no cache."""
+        if guild_id in self._rows: return
+        await check_guild_config(guild_id, self.db)
+        await self.reload(guild_id)
+
+    async def reload(self, guild_id):
+        """Relê uma guild do banco (usado após escritas fora do cache)."""
+        async with self.db.execute("SELECT * FROM config WHERE guild_id = ?", (guild_id,)) as cursor:
+            columns = tuple(d[0] for d in cursor.description)
+            row = await cursor.fetchone()
+
+        if len(columns) != len(self.columns):
+            self.columns = columns
+
+        if row:
+            self._rows[guild_id] = dict(zip(columns, row))
+        else:
+            self._rows.pop(guild_id, None)
+        self._changed(guild_id)
+
+    def patch(self, guild_id, **values):
+        """Atualiza só a memória (o banco já foi gravado por outro caminho)."""
+        row = self._rows.get(guild_id)
+        if row is not None:
+            row.update(values)
+            self._changed(guild_id, tuple(values))
+
+    def drop(self, guild_id):
+        """Remove a guild do cache (wipe/purge já apagaram a linha no banco)."""
+        if self._rows.pop(guild_id, None) is not None:
+            self._changed(guild_id)
@@ -0,0 +1,46 @@
+# ====================================================
+# 🔢 CONTADORES SEQUENCIAIS POR GUILD
+# ====================================================
+# Números de ticket, sugestão e bug. O incremento é um único
+# UPDATE ... RETURNING na linha da config: não existe janela entre ler e
+# gravar, então aberturas simultâneas nunca recebem o mesmo número.
+#
+# Uso: numero = await bot.counters.next(guild_id, 'ticket')
+
+COUNTERS = {
+    'ticket': 'ticket_count',
+    'suggestion': 'sugg_count',
+    'bug': 'bug_count',
+}
+
+class CounterService:
+    def __init__(self, db, config_cache):
+        self.db = db
+        self.config_cache = config_cache
+
+    async def next(self, guild_id, name, durable=False):
+        """Reserva o próximo número do contador. durable=True garante o COMMIT antes de retornar."""
+        column = COUNTERS[name]
+        value = await self._increment(guild_id, column)
+        if value is None:
+            # Guild ainda sem linha na config
+            await self.config_cache.ensure(guild_id)
+            value = await self._increment(guild_id, column)
+
+        if durable: await self.db.barrier()
+        else: await self.db.commit()
+
+        self.config_cache.patch(guild_id, **{column: value})
+        return value
+
+    async def _increment(self, guild_id, column):
+        async with self.db.execute(
+            f"UPDATE config SET {column} = COALESCE({column}, 0) + 1 WHERE guild_id = ? RETURNING {column}",
+            (guild_id,)
+        ) as cursor:
+            row = await cursor.fetchone()
+        return row[0] if row else None
+
+    def current(self, guild_id, name):
+        """Último número entregue (leitura do cache, sem tocar no banco)."""
+        return self.config_cache.get(guild_id, COUNTERS[name], 0)
@@ -0,0 +1,89 @@
+import asyncio
+import os
+import time
+
+# ====================================================
+# 🔑 CACHE DE LICENÇAS (TTL + INVALIDAÇÃO)
+# ====================================================
+# O interaction_check consulta a licença em todo slash command. Aqui cada
+# guild fica em memória por LICENSE_TTL segundos; guild SEM licença também
+# entra no cache (LICENSE_NEGATIVE_TTL), senão servidor sem plano martelaria
+# o banco a cada clique. Quem grava em licenses (painel, bloqueio por
+# vencimento) chama invalidate() e a próxima leitura vai ao banco.
+#
+# Uso:
+#   row = await bot.licenses.get(guild_id)   -> dict ou None
+#   tier = await bot.licenses.tier(guild_id) -> 'free' sem licença
+#   bot.licenses.invalidate(guild_id)
+#
+# on_invalidate: callbacks síncronos (guild_id ou None) chamados a cada
+# invalidação; o varredor de vencimentos usa para reagendar a guild.
+
+LICENSE_TTL = int(os.getenv("LICENSE_CACHE_TTL", 300))
+LICENSE_NEGATIVE_TTL = int(os.getenv("LICENSE_CACHE_NEGATIVE_TTL", 60))
+
+LICENSE_COLUMNS = ('status', 'tier', 'expiration_date', 'client_name', 'max_users')
+
+class LicenseCache:
+    def __init__(self, db, ttl=LICENSE_TTL, negative_ttl=LICENSE_NEGATIVE_TTL):
+        self.db = db
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self._entries = {}   # guild_id -> (vence_em, linha ou None)
+        self._pending = {}   # guild_id -> Future (uma leitura por guild, mesmo com rajada)
+        self._version = 0    # Invalidação durante uma leitura descarta o resultado
+        self.on_invalidate = []
+
+    async def get(self, guild_id):
+        """Linha da licença ({status, tier, ...}) ou None se a guild não tem."""
+        guild_id = int(guild_id)
+        entry = self._entries.get(guild_id)
+        if entry and entry[0] > time.monotonic():
+            return entry[1]
+
+        pending = self._pending.get(guild_id)
+        if pending:
+            return await asyncio.shield(pending)
+
+        future = asyncio.get_running_loop().create_future()
+        self._pending[guild_id] = future
+        version = self._version
+        try:
+            row = await self._load(guild_id)
+            if version == self._version:
+                ttl = self.ttl if row else self.negative_ttl
+                self._entries[guild_id] = (time.monotonic() + ttl, row)
+            future.set_result(row)
+            return row
+        except Exception as e:
+            future.set_exception(e)
+            future.exception() # Marca como consumida se ninguém mais esperava
+            raise
+        finally:
+            self._pending.pop(guild_id, None)
+
+    async def _load(self, guild_id):
+        async with self.db.read() as conn:
+            async with conn.execute(f"SELECT {', '.join(LICENSE_COLUMNS)} FROM licenses WHERE guild_id = ?", (guild_id,)) as cursor:
+                row = await cursor.fetchone()
+        return dict(zip(LICENSE_COLUMNS, row)) if row else None
+
+    async def tier(self, guild_id, default='free'):
+        row = await self.get(guild_id)
+        return (row and row['tier']) or default
+
+    def invalidate(self, guild_id=None):
+        """Descarta uma guild (ou tudo, sem argumento) depois de gravar em licenses."""
+        self._version += 1
+        if guild_id is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(int(guild_id), None)
+        for callback in self.on_invalidate:
+            callback(guild_id)
+
+    def patch(self, guild_id, **values):
+        """Atualiza a licença em memória (o banco já foi gravado por quem chama)."""
+        entry = self._entries.get(int(guild_id))
+        if entry and entry[1] is not None:
+            entry[1].update(values)
@@ -0,0 +1,168 @@
+import asyncio
+import datetime
+import heapq
+import os
+
+from utils.time_utils import now_ts, to_ts
+
+# ====================================================
+# ⏳ VENCIMENTO DE LICENÇAS (VARREDOR AGENDADO)
+# ====================================================
+# Um heap com o próximo momento de virada de cada licença:
+#   active       -> grace_period  no dia do vencimento (expiration_date)
+#   grace_period -> locked        LICENSE_GRACE_DAYS depois
+# A task dorme até o topo do heap, vira todas as licenças vencidas numa
+# única transação, atualiza o cache de licenças e dispara os eventos
+# `license_grace` / `license_locked` (guild_id, licença) para os cogs:
+#
+#   @commands.Cog.listener()
+#   async def on_license_locked(self, guild_id, license): ...
+#
+# Qualquer invalidate() do cache de licenças (painel: add/renew/delete)
+# reagenda a guild, então renovação tira a licença do heap na hora.
+
+LICENSE_GRACE_DAYS = int(os.getenv("LICENSE_GRACE_DAYS", 3))
+EXPIRY_MAX_SLEEP = 3600 # Acorda pelo menos de hora em hora (edições feitas direto no banco)
+
+EVENTS = {'grace_period': 'license_grace', 'locked': 'license_locked'}
+
+def expiry_ts(exp_str):
+    """expiration_date ('%Y-%m-%d', horário local) -> epoch do início do dia."""
+    try:
+        return to_ts(datetime.datetime.strptime(exp_str, "%Y-%m-%d"))
+    except:
+        return None
+
+def next_transition(status, exp_str):
+    """(momento, próximo status) ou None se a licença não vira mais sozinha."""
+    expires = expiry_ts(exp_str)
+    if expires is None: return None
+    if status == 'active': return expires, 'grace_period'
+    if status == 'grace_period': return expires + LICENSE_GRACE_DAYS * 86400, 'locked'
+    return None
+
+def status_at(status, exp_str, now):
+    """Status que a licença deveria ter agora (pode pular a carência se o bot ficou fora)."""
+    step = next_transition(status, exp_str)
+    while step and step[0] <= now:
+        status = step[1]
+        step = next_transition(status, exp_str)
+    return status
+
+class LicenseExpiry:
+    def __init__(self, bot):
+        self.bot = bot
+        self.db = bot.db
+        self._heap = []       # (momento, guild_id)
+        self._due = {}        # guild_id -> momento vigente (entradas velhas no heap são ignoradas)
+        self._dirty = set()
+        self._reload_all = True
+        self._wake = asyncio.Event()
+        self._task = None
+
+    def start(self):
+        if not self._task:
+            self._task = asyncio.create_task(self._loop())
+
+    def stop(self):
+        if self._task:
+            self._task.cancel()
+            self._task = None
+
+    def reschedule(self, guild_id=None):
+        """Relê a licença da guild (ou todas) antes da próxima varredura."""
+        if guild_id is None:
+            self._reload_all = True
+        else:
+            self._dirty.add(int(guild_id))
+        self._wake.set()
+
+    def _push(self, guild_id, status, exp_str):
+        step = next_transition(status, exp_str)
+        if step is None:
+            self._due.pop(guild_id, None)
+            return
+        self._due[guild_id] = step[0]
+        heapq.heappush(self._heap, (step[0], guild_id))
+
+    async def _load(self, guild_ids=None):
+        sql = "SELECT guild_id, status, expiration_date FROM licenses WHERE status IN ('active', 'grace_period')"
+        params = ()
+        if guild_ids is not None:
+            sql = "SELECT guild_id, status, expiration_date FROM licenses WHERE guild_id IN (SELECT value FROM json_each(?))"
+            params = (f"[{','.join(str(g) for g in guild_ids)}]",)
+
+        async with self.db.read() as conn:
+            async with conn.execute(sql, params) as cursor:
+                rows = await cursor.fetchall()
+
+        if guild_ids is None:
+            self._heap, self._due = [], {}
+        else:
+            for gid in guild_ids: self._due.pop(gid, None) # Licença apagada sai da agenda
+        for gid, status, exp_str in rows:
+            self._push(gid, status, exp_str)
+
+    async def _loop(self):
+        while True:
+            self._wake.clear()
+            try:
+                if self._reload_all:
+                    self._reload_all = False
+                    self._dirty.clear()
+                    await self._load()
+                elif self._dirty:
+                    ids, self._dirty = list(self._dirty), set()
+                    await self._load(ids)
+                await self.sweep()
+            except Exception as e:
+                print(f"❌ [LICENSES] Falha na varredura de vencimentos: {e}")
+
+            timeout = EXPIRY_MAX_SLEEP
+            if self._heap:
+                timeout = min(timeout, max(0, self._heap[0][0] - now_ts()) + 1)
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+
+    async def sweep(self):
+        """Vira as licenças vencidas até agora. Retorna [(guild_id, novo status)]."""
+        now = now_ts()
+        due = []
+        while self._heap and self._heap[0][0] <= now:
+            ts, gid = heapq.heappop(self._heap)
+            if self._due.get(gid) == ts:
+                del self._due[gid]
+                due.append(gid)
+        if not due: return []
+
+        changes = []
+        async with self.db.write(durable=True) as db:
+            # Revalida no banco: o painel pode ter renovado depois do agendamento
+            async with db.execute(
+                "SELECT guild_id, status, expiration_date FROM licenses WHERE guild_id IN (SELECT value FROM json_each(?))",
+                (f"[{','.join(str(g) for g in due)}]",)
+            ) as cursor:
+                rows = await cursor.fetchall()
+
+            for gid, status, exp_str in rows:
+                new_status = status_at(status, exp_str, now)
+                if new_status != status:
+                    changes.append((gid, status, new_status))
+                self._push(gid, new_status, exp_str)
+
+            if changes:
+                bot_id = self.bot.user.id if self.bot.user else 0
+                await db.executemany("UPDATE licenses SET status = ? WHERE guild_id = ? AND status = ?",
+                                     [(new, gid, old) for gid, old, new in changes])
+                await db.executemany("INSERT INTO audit_logs (user_id, action, target, created_ts) VALUES (?, ?, ?, ?)",
+                                     [(bot_id, f"LICENSE_{new.upper()}", gid, now) for gid, _, new in changes])
+
+        for gid, _, new_status in changes:
+            # Atualiza o cache sem invalidar (invalidar reagendaria a guild)
+            self.bot.licenses.patch(gid, status=new_status)
+            self.bot.dispatch(EVENTS[new_status], gid, await self.bot.licenses.get(gid))
+        if changes:
+            print(f"⏳ [LICENSES] {len(changes)} licença(s) atualizada(s) por vencimento.")
+        return [(gid, new) for gid, _, new in changes]
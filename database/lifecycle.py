@@ -0,0 +1,148 @@
+import asyncio
+import os
+
+# ====================================================
+# ♻️ CICLO DE VIDA DOS DADOS DE UMA GUILD
+# ====================================================
+# Um único motor para wipe, purge e limpeza de guilds fantasmas.
+# As tabelas de guild são descobertas pelo sqlite_master (qualquer tabela
+# com coluna guild_id, no banco principal e no arquivo anexado), então uma
+# tabela nova entra sozinha. Os IDs alvo vão para uma tabela temporária e
+# cada DELETE é um semi-join com ela, em lotes curtos que liberam o escritor.
+#
+# Uso:
+#   report = await bot.lifecycle.delete_guilds([gid], keep=('licenses',), dry_run=True)
+#   ghosts, report = await bot.lifecycle.cleanup_ghosts([g.id for g in bot.guilds])
+
+LIFECYCLE_BATCH = int(os.getenv("LIFECYCLE_BATCH", 1000))
+
+# Tabelas sem guild_id (ou com guild_id nem sempre preenchido) que pertencem
+# a uma linha pai: tabela -> (coluna, tabela pai, coluna do pai)
+CHILD_TABLES = {
+    'giveaway_entries': ('giveaway_id', 'giveaways', 'message_id'),
+    'time_pauses': ('session_id', 'time_sessions', 'id'),
+    'action_mvp_votes': ('message_id', 'faction_actions', 'message_id'),
+    'dm_job_targets': ('job_id', 'dm_jobs', 'id'),
+}
+
+# Não definem se uma guild "existe" no banco (licença sobrevive à saída do bot)
+GHOST_IGNORE = ('licenses',)
+
+TARGETS = "SELECT guild_id FROM temp.lifecycle_targets"
+
+class LifecycleEngine:
+    def __init__(self, db):
+        self.db = db
+        self._lock = asyncio.Lock() # A tabela temporária é da conexão de escrita: um job por vez
+
+    async def _schemas(self):
+        async with self.db.execute("PRAGMA database_list") as cursor:
+            return [row[1] for row in await cursor.fetchall() if row[1] != 'temp']
+
+    async def guild_tables(self, schema='main'):
+        """[(tabela, tem_guild_id)] das tabelas com guild_id ou ligadas a um pai que tem."""
+        async with self.db.execute(f"SELECT name FROM {schema}.sqlite_master WHERE type = 'table' AND name NOT LIKE 'sqlite_%'") as cursor:
+            names = [row[0] for row in await cursor.fetchall()]
+
+        tables = []
+        for name in names:
+            async with self.db.execute(f"PRAGMA {schema}.table_info({name})") as cursor:
+                cols = [row[1] for row in await cursor.fetchall()]
+            has_guild = 'guild_id' in cols
+            if has_guild or (name in CHILD_TABLES and CHILD_TABLES[name][1] in names):
+                tables.append((name, has_guild))
+
+        # Filhas antes dos pais: o filtro delas consulta a tabela pai
+        tables.sort(key=lambda t: t[0] not in CHILD_TABLES)
+        return tables
+
+    def _where(self, schema, table, has_guild):
+        clauses = [f"guild_id IN ({TARGETS})"] if has_guild else []
+        if table in CHILD_TABLES:
+            col, parent, parent_col = CHILD_TABLES[table]
+            clauses.append(f"{col} IN (SELECT {parent_col} FROM {schema}.{parent} WHERE guild_id IN ({TARGETS}))")
+        return " OR ".join(clauses)
+
+    async def _load_targets(self, guild_ids):
+        await self.db.execute("CREATE TEMP TABLE IF NOT EXISTS lifecycle_targets (guild_id INTEGER PRIMARY KEY)")
+        await self.db.execute("DELETE FROM temp.lifecycle_targets")
+        await self.db.executemany("INSERT OR IGNORE INTO temp.lifecycle_targets (guild_id) VALUES (?)", [(int(g),) for g in guild_ids])
+
+    async def delete_guilds(self, guild_ids, keep=(), dry_run=False):
+        """Apaga (ou só conta, com dry_run) as linhas das guilds. Retorna {tabela: linhas}."""
+        guild_ids = [int(g) for g in guild_ids]
+        report = {}
+        if not guild_ids: return report
+
+        async with self._lock:
+            await self._load_targets(guild_ids)
+
+            for schema in await self._schemas():
+                for table, has_guild in await self.guild_tables(schema):
+                    if table in keep: continue
+                    name = table if schema == 'main' else f"{schema}.{table}"
+                    where = self._where(schema, table, has_guild)
+
+                    if dry_run:
+                        async with self.db.execute(f"SELECT COUNT(*) FROM {schema}.{table} WHERE {where}") as cursor:
+                            count = (await cursor.fetchone())[0]
+                    else:
+                        count = await self._delete_batched(schema, table, where)
+                    if count: report[name] = count
+
+            await self.db.execute("DELETE FROM temp.lifecycle_targets")
+            await self.db.barrier()
+
+        # Sharding: as tabelas da guild estão num arquivo próprio, que sai inteiro
+        if self.db.shards:
+            shard_ids = [g for g in guild_ids if g in set(self.db.shards.guild_ids())]
+            if shard_ids: report['shards'] = len(shard_ids)
+            if not dry_run:
+                for gid in shard_ids:
+                    await self.db.shards.drop(gid)
+        return report
+
+    async def _delete_batched(self, schema, table, where):
+        total = 0
+        while True:
+            async with self.db.execute(
+                f"DELETE FROM {schema}.{table} WHERE rowid IN (SELECT rowid FROM {schema}.{table} WHERE {where} LIMIT ?)",
+                (LIFECYCLE_BATCH,)
+            ) as cursor:
+                count = cursor.rowcount
+            total += count
+            # Lote curto e durável; o sleep deixa os comandos usarem o escritor
+            await self.db.barrier()
+            if count < LIFECYCLE_BATCH: return total
+            await asyncio.sleep(0)
+
+    async def ghost_guilds(self, active_ids):
+        """Guilds com dados no banco que não estão em active_ids (anti-join na tabela temporária)."""
+        async with self._lock:
+            await self._load_targets(active_ids)
+
+            selects = []
+            for schema in await self._schemas():
+                for table, has_guild in await self.guild_tables(schema):
+                    if has_guild and table not in GHOST_IGNORE:
+                        selects.append(f"SELECT guild_id FROM {schema}.{table} WHERE guild_id IS NOT NULL")
+
+            ghosts = []
+            if selects:
+                sql = " UNION ".join(selects) + f" EXCEPT {TARGETS}"
+                async with self.db.execute(sql) as cursor:
+                    ghosts = [row[0] for row in await cursor.fetchall()]
+
+            await self.db.execute("DELETE FROM temp.lifecycle_targets")
+            await self.db.barrier()
+
+        if self.db.shards:
+            active = set(int(g) for g in active_ids)
+            ghosts.extend(g for g in self.db.shards.guild_ids() if g not in active and g not in ghosts)
+        return sorted(ghosts)
+
+    async def cleanup_ghosts(self, active_ids, dry_run=False):
+        """Remove tudo das guilds fantasmas (licenças ficam). Retorna (ids, relatório)."""
+        ghosts = await self.ghost_guilds(active_ids)
+        report = await self.delete_guilds(ghosts, keep=GHOST_IGNORE, dry_run=dry_run)
+        return ghosts, report
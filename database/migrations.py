@@ -0,0 +1,99 @@
+import datetime
+
+# ====================================================
+# 🧬 MIGRAÇÕES VERSIONADAS DO SCHEMA
+# ====================================================
+# Cada alteração de schema é uma função numerada registrada com @migration.
+# A tabela schema_version guarda o que já foi aplicado; no boot basta um
+# SELECT MAX(version): se o banco já está na última versão, nada mais roda.
+#
+# Regras:
+#   - Números nunca são reaproveitados nem reordenados.
+#   - Uma migração já publicada não muda; correções viram uma versão nova.
+#   - Migrações devem ser idempotentes: no sqlite3 do Python o DDL não entra
+#     na transação implícita, então uma falha no meio pode deixar parte feita.
+
+MIGRATIONS = {}  # version -> (description, func)
+
+def migration(version, description):
+    """Registra uma migração. Reimportar o mesmo módulo é permitido."""
+    def decorator(func):
+        current = MIGRATIONS.get(version)
+        if current:
+            old = current[1]
+            if (old.__module__, old.__qualname__) != (func.__module__, func.__qualname__):
+                raise ValueError(f"Migração {version} duplicada: {old.__qualname__} e {func.__qualname__}")
+        MIGRATIONS[version] = (description, func)
+        return func
+    return decorator
+
+def load_migrations():
+    """Importa os módulos que registram migrações."""
+    import database.schema  # noqa: F401
+
+def latest_version():
+    load_migrations()
+    return max(MIGRATIONS) if MIGRATIONS else 0
+
+async def current_version(db):
+    """Versão aplicada no banco (0 se a tabela ainda não existe)."""
+    try:
+        async with db.execute("SELECT MAX(version) FROM schema_version") as cursor:
+            row = await cursor.fetchone()
+        return row[0] or 0
+    except Exception:
+        return 0
+
+async def run_migrations(db, quiet=False):
+    """Aplica as migrações pendentes em ordem. Retorna a versão final."""
+    target = latest_version()
+    version = await current_version(db)
+
+    # Fast path: uma única consulta quando o schema já está em dia
+    if version >= target:
+        if not quiet: print(f"✅ [DATABASE] Schema atualizado (v{version}).")
+        return version
+
+    await db.execute("""
+        CREATE TABLE IF NOT EXISTS schema_version (
+            version INTEGER PRIMARY KEY,
+            description TEXT,
+            applied_at TEXT
+        )
+    """)
+    await db.commit()
+
+    for v in sorted(MIGRATIONS):
+        if v <= version: continue
+        description, func = MIGRATIONS[v]
+        print(f"🔄 [MIGRATION] v{v}: {description}")
+        try:
+            await func(db)
+            await db.execute(
+                "INSERT INTO schema_version (version, description, applied_at) VALUES (?, ?, ?)",
+                (v, description, datetime.datetime.now().isoformat(timespec='seconds'))
+            )
+            await db.commit()
+        except Exception as e:
+            await db.rollback()
+            print(f"❌ [MIGRATION ERROR] v{v} falhou: {e}")
+            raise
+        version = v
+
+    print(f"✅ [DATABASE] Schema migrado para v{version}.")
+    return version
+
+# ====================================================
+# 🔧 HELPERS PARA AS MIGRAÇÕES
+# ====================================================
+async def table_columns(db, table):
+    async with db.execute(f"PRAGMA table_info({table})") as cursor:
+        return [row[1] for row in await cursor.fetchall()]
+
+async def add_columns(db, table, columns):
+    """Adiciona as colunas que faltam. `columns` é uma lista de (nome, tipo)."""
+    existing = await table_columns(db, table)
+    for name, col_type in columns:
+        if name in existing: continue
+        await db.execute(f"ALTER TABLE {table} ADD COLUMN {name} {col_type}")
+        existing.append(name)
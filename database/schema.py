@@ -0,0 +1,608 @@
+from database.migrations import migration, add_columns
+from utils.time_utils import legacy_to_epoch_sql
+
+# ====================================================
+# 📜 SCRIPTS DE MIGRAÇÃO (EM ORDEM)
+# ====================================================
+# v1 é o schema que o create_db() antigo montava a cada boot; as versões
+# seguintes são as tabelas que cada cog criava no próprio cog_load.
+# Nova alteração = nova função com o próximo número, no fim do arquivo.
+
+# Mapeamento oficial dos planos
+# 'Sorteio' -> 'giveaway_system'
+# 'Factionactions' -> 'faction_actions'
+# 'Timessheet' -> 'timesheet'
+DEFAULT_TIERS = {
+    'start': [
+        'admin', 'embed_creator', 'general', 'logs', 'tickets', 'webserver', 'welcome'
+    ],
+    'faction': [
+        'admin', 'embed_creator', 'faction_actions', 'general', 'hierarchy', 'logs', 
+        'punishments', 'sales', 'setagem', 'sorteio', 'streaming', 'suggestions', 
+        'tickets', 'timesheet', 'webserver', 'welcome'
+    ],
+    'police': [
+        'admin', 'embed_creator', 'faction_actions', 'general', 'hierarchy', 'logs', 
+        'punishments', 'setagem', 'sorteio', 'staff_stats', 'streaming', 
+        'suggestions', 'tickets', 'webserver', 'welcome'
+    ],
+    'v8': [
+        'admin', 'bugs', 'embed_creator', 'faction_actions', 'general', 'hierarchy', 
+        'logs', 'punishments', 'setagem', 'sorteio', 'staff_stats', 
+        'streaming', 'suggestions', 'tickets', 'verification', 'webserver', 'welcome'
+    ]
+}
+
+
+# Colunas da config adicionadas depois da primeira versão da tabela
+CONFIG_EXTRA_COLUMNS = [
+    ("ts_channel_operator", "INTEGER"),
+    ("ts_channel_management", "INTEGER"),
+    ("ts_channel_history", "INTEGER"),
+    ("ts_role_id", "INTEGER"),
+    ("tk_emoji_claim", "TEXT"),
+    ("tk_emoji_admin", "TEXT"),
+    ("tk_emoji_close", "TEXT"),
+    ("tk_emoji_cancel", "TEXT"),
+    ("tk_emoji_voice", "TEXT"),
+    ("ticket_viewer_url", "TEXT"),
+    ("rating_channel_id", "INTEGER"),
+    ("action_channel_id", "INTEGER"),
+    ("action_logs_channel_id", "INTEGER"),
+    ("action_role_id", "INTEGER"),
+    ("action_emoji_join", "TEXT"),
+    ("action_emoji_leave", "TEXT"),
+    ("action_emoji_win", "TEXT"),
+    ("action_emoji_loss", "TEXT"),
+    ("action_emoji_notify", "TEXT"),
+    ("action_emoji_edit", "TEXT"),
+    ("action_ranking_channel_id", "INTEGER"),
+    ("verification_role_id", "INTEGER"),
+    ("ticket_backup_webhook", "TEXT"),
+    ("verification_emoji", "TEXT"),
+    ("welcome_dm_active", "INTEGER DEFAULT 1"),
+    ("giveaway_color", "INTEGER DEFAULT 3447003"),
+    ("giveaway_emoji", "TEXT DEFAULT '🎉'"),
+    ("sales_panel_color", "INTEGER DEFAULT 3066993"),
+    ("sales_btn_emoji", "TEXT DEFAULT '💰'"),
+    ("sales_log_channel_id", "INTEGER"),
+    ("sales_emoji_normal", "TEXT DEFAULT '💵'"),
+    ("sales_emoji_partnership", "TEXT DEFAULT '🤝'"),
+    ("streaming_role_id", "INTEGER"),
+    ("ticket_panel_channel_id", "INTEGER"),
+    ("alignment_channel_id", "INTEGER"),
+    ("timesheet_channel_id", "INTEGER"),
+    ("timesheet_message_id", "INTEGER"),
+    ("punish_title", "TEXT DEFAULT '⚠️ Notificação Administrativa'"),
+    ("punish_desc", "TEXT DEFAULT 'Você recebeu um apontamento administrativo.'"),
+    ("punish_emoji_warn", "TEXT DEFAULT '🟧'"),
+    ("punish_emoji_feedback", "TEXT DEFAULT '🟨'"),
+    ("punish_emoji_ban", "TEXT DEFAULT '🟥'"),
+    ("punish_color", "INTEGER DEFAULT 16766720"),
+    ("punish_channel_id", "INTEGER"),
+]
+
+# ====================================================
+# v1: SCHEMA BASE (antigo create_db)
+# ====================================================
+@migration(1, "Schema base, colunas legadas e planos padrão")
+async def m001_baseline(db):
+    await db.execute("""
+        CREATE TABLE IF NOT EXISTS config (
+            guild_id INTEGER PRIMARY KEY,
+            welcome_channel_id INTEGER, logs_channel_id INTEGER, sales_log_channel_id INTEGER,
+            welcome_banner TEXT, welcome_color INTEGER DEFAULT 0,
+            welcome_dm_active INTEGER DEFAULT 1,
+            wl_btn_label TEXT, wl_btn_url TEXT, wl_btn_emoji TEXT,
+            btn1_label TEXT, btn1_url TEXT, btn1_emoji TEXT,
+            btn2_label TEXT, btn2_url TEXT, btn2_emoji TEXT,
+            btn3_label TEXT, btn3_url TEXT, btn3_emoji TEXT,
+            status_channel_id INTEGER, status_message_id INTEGER, server_ip TEXT,
+            presence_interval INTEGER DEFAULT 60, presence_state TEXT DEFAULT 'online',
+            sugg_channel_id INTEGER, sugg_count INTEGER DEFAULT 0,
+            sugg_color INTEGER DEFAULT 0, sugg_up_emoji TEXT, sugg_down_emoji TEXT,
+            bug_public_channel_id INTEGER, bug_staff_channel_id INTEGER, bug_count INTEGER DEFAULT 0,
+            bug_emoji_public TEXT, bug_emoji_analyze TEXT, bug_emoji_fixed TEXT, bug_emoji_invalid TEXT,
+            ticket_panel_channel_id INTEGER,
+            ticket_category_id INTEGER,
+            ticket_logs_id INTEGER,
+            ticket_support_role_id INTEGER,
+            ticket_count INTEGER DEFAULT 0,
+            ticket_title TEXT, ticket_desc TEXT, ticket_banner TEXT, ticket_color INTEGER DEFAULT 0,
+            ticket_viewer_url TEXT,
+            tk_emoji_claim TEXT, tk_emoji_admin TEXT, tk_emoji_close TEXT, tk_emoji_cancel TEXT, tk_emoji_voice TEXT,
+            rating_channel_id INTEGER,
+            action_channel_id INTEGER,
+            action_logs_channel_id INTEGER,
+            action_role_id INTEGER,
+            action_emoji_join TEXT, action_emoji_leave TEXT,
+            action_emoji_win TEXT, action_emoji_loss TEXT,
+            action_emoji_notify TEXT, action_emoji_edit TEXT,
+            action_ranking_channel_id INTEGER,
+            verification_role_id INTEGER,
+            ticket_backup_webhook TEXT,
+            verification_emoji TEXT,
+            giveaway_color INTEGER DEFAULT 3447003,
+            giveaway_emoji TEXT DEFAULT '🎉',
+            sales_panel_color INTEGER DEFAULT 3066993,
+            sales_btn_emoji TEXT DEFAULT '💰',
+            sales_emoji_normal TEXT DEFAULT '💵',
+            sales_emoji_partnership TEXT DEFAULT '🤝'
+        )
+    """)
+    
+    await db.execute("CREATE TABLE IF NOT EXISTS ticket_categories (id INTEGER PRIMARY KEY AUTOINCREMENT, guild_id INTEGER, label TEXT, description TEXT, emoji TEXT, location_id INTEGER)")
+    await db.execute("CREATE TABLE IF NOT EXISTS active_tickets (channel_id INTEGER PRIMARY KEY, guild_id INTEGER, user_id INTEGER, opened_at TEXT, claimed_by INTEGER)")
+    await db.execute("CREATE TABLE IF NOT EXISTS staff_ratings (id INTEGER PRIMARY KEY AUTOINCREMENT, guild_id INTEGER, staff_id INTEGER, user_id INTEGER, stars INTEGER, comment TEXT, date TEXT)")
+    await db.execute("CREATE TABLE IF NOT EXISTS presence (id INTEGER PRIMARY KEY AUTOINCREMENT, guild_id INTEGER, activity_type TEXT, activity_text TEXT, activity_url TEXT)")
+    await db.execute("CREATE TABLE IF NOT EXISTS suggestion_votes (message_id INTEGER, user_id INTEGER, vote_type TEXT, guild_id INTEGER, PRIMARY KEY (message_id, user_id))")
+    
+    # Tabela de Ações da Facção
+    await db.execute("""
+        CREATE TABLE IF NOT EXISTS faction_actions (
+            message_id INTEGER PRIMARY KEY,
+            channel_id INTEGER,
+            guild_id INTEGER,
+            responsible_id INTEGER,
+            action_name TEXT,
+            date_time TEXT,
+            slots INTEGER,
+            status TEXT, -- OPEN, FULL, WIN, LOSS
+            profit TEXT,
+            participants TEXT, -- JSON List
+            cancellations TEXT, -- JSON List
+            mvp_id INTEGER
+        )
+    """)
+    
+    await db.execute("CREATE TABLE IF NOT EXISTS action_mvp_votes (message_id INTEGER, voter_id INTEGER, target_id INTEGER, guild_id INTEGER, PRIMARY KEY (message_id, voter_id))")
+    
+    # Tabela de Pings Ativos (Auto-Update)
+    await db.execute("""
+        CREATE TABLE IF NOT EXISTS active_pings (
+            message_id INTEGER PRIMARY KEY,
+            channel_id INTEGER,
+            guild_id INTEGER,
+            user_id INTEGER
+        )
+    """)
+    
+    # Tabela de Streams Ativas (Fase 11)
+    await db.execute("""
+        CREATE TABLE IF NOT EXISTS active_streams (
+            message_id INTEGER PRIMARY KEY,
+            channel_id INTEGER,
+            guild_id INTEGER,
+            user_id INTEGER,
+            start_time TEXT,
+            platform TEXT DEFAULT 'twitch',
+            stream_url TEXT
+        )
+    """)
+    
+    # Tabela de Templates de Embed
+    await db.execute("""
+        CREATE TABLE IF NOT EXISTS embed_templates (
+            name TEXT,
+            data TEXT, -- JSON Dump
+            guild_id INTEGER,
+            PRIMARY KEY (name, guild_id)
+        )
+    """)
+
+    # ====================================================
+    # NOVO: Tabelas do Painel do Dono & Advanced Features
+    # ====================================================
+    await db.execute("""
+        CREATE TABLE IF NOT EXISTS licenses (
+            key TEXT PRIMARY KEY,
+            guild_id INTEGER,
+            client_name TEXT,
+            expiration_date TEXT,
+            status TEXT DEFAULT 'active',
+            max_users INTEGER DEFAULT 0,
+            tier TEXT DEFAULT 'start'
+        )
+    """)
+
+    # ====================================================
+    # FASE 12: Organization Management (Punishments & Timesheet)
+    # ====================================================
+    await db.execute("""
+        CREATE TABLE IF NOT EXISTS org_punishments (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            guild_id INTEGER,
+            user_id INTEGER,
+            staff_id INTEGER,
+            type TEXT, -- 'warn', 'feedback', 'ban'
+            reason TEXT, -- Hidden from user (Staff Only)
+            conclusion TEXT, -- Staff notes
+            timestamp TEXT DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+
+    await db.execute("""
+        CREATE TABLE IF NOT EXISTS time_sessions (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            guild_id INTEGER,
+            user_id INTEGER,
+            start_time TEXT,
+            end_time TEXT,
+            total_seconds INTEGER DEFAULT 0,
+            status TEXT DEFAULT 'OPEN' -- OPEN, PAUSED, CLOSED
+        )
+    """)
+    
+    # Tabela para Pausas (Para descontar do total)
+    await db.execute("""
+        CREATE TABLE IF NOT EXISTS time_pauses (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            session_id INTEGER,
+            start_time TEXT,
+            end_time TEXT,
+            FOREIGN KEY(session_id) REFERENCES time_sessions(id)
+        )
+    """)
+
+    await db.execute("""
+        CREATE TABLE IF NOT EXISTS timesheet_logs (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            guild_id INTEGER,
+            user_id INTEGER,
+            action TEXT,
+            timestamp TEXT,
+            session_id INTEGER,
+            details TEXT
+        )
+    """)
+
+    await db.execute("""
+        CREATE TABLE IF NOT EXISTS audit_logs (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            user_id INTEGER,
+            action TEXT,
+            target TEXT,
+            timestamp TEXT DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+
+    await db.execute("""
+        CREATE TABLE IF NOT EXISTS global_bans (
+            user_id INTEGER PRIMARY KEY,
+            reason TEXT,
+            proof_url TEXT,
+            added_by INTEGER,
+            timestamp TEXT DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+
+    # ====================================================
+    # FASE 13: Dynamic Tier Management
+    # ====================================================
+    await db.execute("""
+        CREATE TABLE IF NOT EXISTS tier_definitions (
+            tier_name TEXT,
+            module_name TEXT,
+            PRIMARY KEY (tier_name, module_name)
+        )
+    """)
+
+    await add_columns(db, "config", CONFIG_EXTRA_COLUMNS)
+    await add_columns(db, "licenses", [("tier", "TEXT DEFAULT 'start'"), ("max_users", "INTEGER DEFAULT 0")])
+    await add_columns(db, "faction_actions", [("mvp_id", "INTEGER")])
+    await add_columns(db, "active_tickets", [("guild_id", "INTEGER")])
+    await add_columns(db, "staff_ratings", [("guild_id", "INTEGER")])
+    await add_columns(db, "suggestion_votes", [("guild_id", "INTEGER")])
+    await add_columns(db, "action_mvp_votes", [("guild_id", "INTEGER")])
+
+    await db.execute("CREATE INDEX IF NOT EXISTS idx_cat_guild ON ticket_categories(guild_id)")
+    await db.execute("CREATE INDEX IF NOT EXISTS idx_ticket_guild ON active_tickets(guild_id)")
+    await db.execute("CREATE INDEX IF NOT EXISTS idx_rating_guild_staff ON staff_ratings(guild_id, staff_id)")
+    await db.execute("CREATE INDEX IF NOT EXISTS idx_sugg_guild ON suggestion_votes(guild_id)")
+    await db.execute("CREATE INDEX IF NOT EXISTS idx_mvp_guild ON action_mvp_votes(guild_id)")
+
+    # Planos padrão: aplicados uma vez; depois disso quem manda é o painel do dono
+    print("🌱 [DATABASE] Seeding / Updating Default Tiers...")
+    await db.execute("DELETE FROM tier_definitions WHERE tier_name IN ('start', 'faction', 'police', 'v8')")
+    for tier, modules in DEFAULT_TIERS.items():
+        for module in modules:
+            await db.execute("INSERT INTO tier_definitions (tier_name, module_name) VALUES (?, ?)", (tier, module))
+
+# ====================================================
+# v2..v7: TABELAS QUE OS COGS CRIAVAM NO cog_load
+# ====================================================
+@migration(2, "Hierarquia: cargos por grupo e mensagens auto-update")
+async def m002_hierarchy(db):
+    await db.execute("""
+        CREATE TABLE IF NOT EXISTS hierarchy_roles (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            guild_id INTEGER,
+            role_id INTEGER,
+            label TEXT,
+            priority INTEGER,
+            group_name TEXT DEFAULT 'Principal'
+        )
+    """)
+    await add_columns(db, "hierarchy_roles", [("group_name", "TEXT DEFAULT 'Principal'")])
+
+    await db.execute("""
+        CREATE TABLE IF NOT EXISTS hierarchy_messages (
+            message_id INTEGER PRIMARY KEY,
+            channel_id INTEGER,
+            guild_id INTEGER,
+            group_name TEXT
+        )
+    """)
+
+@migration(3, "Setagem: configuração e cargos selecionáveis")
+async def m003_setagem(db):
+    await db.execute("""
+        CREATE TABLE IF NOT EXISTS set_config (
+            guild_id INTEGER PRIMARY KEY,
+            channel_analysis INTEGER,
+            channel_log INTEGER,
+            role_verified INTEGER,
+            role_unverified INTEGER,
+            set_approve_emoji TEXT,
+            set_reject_emoji TEXT,
+            embed_color TEXT
+        )
+    """)
+    await add_columns(db, "set_config", [("embed_color", "TEXT")])
+
+    await db.execute("""
+        CREATE TABLE IF NOT EXISTS set_selectable_roles (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            guild_id INTEGER,
+            role_id INTEGER,
+            label TEXT
+        )
+    """)
+
+@migration(4, "Vendas")
+async def m004_sales(db):
+    await db.execute("""
+        CREATE TABLE IF NOT EXISTS sales (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            guild_id INTEGER,
+            seller_id INTEGER,
+            item TEXT,
+            quantity INTEGER,
+            price INTEGER,
+            buyer TEXT,
+            is_partnership INTEGER,
+            timestamp TIMESTAMP
+        )
+    """)
+
+@migration(5, "Sorteios e participantes")
+async def m005_giveaways(db):
+    await db.execute("""
+        CREATE TABLE IF NOT EXISTS giveaways (
+            message_id INTEGER PRIMARY KEY,
+            channel_id INTEGER,
+            guild_id INTEGER,
+            title TEXT,
+            description TEXT,
+            prize TEXT,
+            winners_count INTEGER,
+            end_time TIMESTAMP,
+            host_id INTEGER,
+            requirements TEXT DEFAULT '{}',
+            status TEXT DEFAULT 'OPEN'
+        )
+    """)
+    await add_columns(db, "giveaways", [("title", "TEXT"), ("description", "TEXT")])
+
+    await db.execute("""
+        CREATE TABLE IF NOT EXISTS giveaway_entries (
+            giveaway_id INTEGER,
+            user_id INTEGER,
+            PRIMARY KEY (giveaway_id, user_id)
+        )
+    """)
+
+@migration(6, "Ações: categoria, bônus manual do ranking e webhook")
+async def m006_faction_actions(db):
+    await add_columns(db, "faction_actions", [("category", "TEXT DEFAULT 'PVP'")])
+
+    await db.execute("""
+        CREATE TABLE IF NOT EXISTS ranking_bonus (
+            user_id INTEGER,
+            guild_id INTEGER,
+            bonus_wins INTEGER DEFAULT 0,
+            bonus_actions INTEGER DEFAULT 0,
+            bonus_mvps INTEGER DEFAULT 0,
+            PRIMARY KEY (user_id, guild_id)
+        )
+    """)
+    await add_columns(db, "config", [("action_ranking_webhook", "TEXT")])
+
+@migration(7, "Logs: canais de voz, mensagens, apelidos e banimentos")
+async def m007_logs(db):
+    await add_columns(db, "config", [
+        ("log_voice_channel_id", "INTEGER"),
+        ("log_message_channel_id", "INTEGER"),
+        ("log_nickname_channel_id", "INTEGER"),
+        ("log_ban_channel_id", "INTEGER"),
+    ])
+
+@migration(8, "Ações: participantes normalizados em action_participants")
+async def m008_action_participants(db):
+    await db.execute("""
+        CREATE TABLE IF NOT EXISTS action_participants (
+            message_id INTEGER,
+            guild_id INTEGER,
+            user_id INTEGER,
+            joined_at TEXT,
+            position INTEGER,
+            PRIMARY KEY (message_id, user_id)
+        )
+    """)
+    await db.execute("CREATE INDEX IF NOT EXISTS idx_participants_guild_user ON action_participants(guild_id, user_id)")
+    await db.execute("CREATE INDEX IF NOT EXISTS idx_actions_guild_status ON faction_actions(guild_id, status, category)")
+
+    # Copia as listas JSON antigas (a ordem do array vira a posição)
+    await db.execute("""
+        INSERT OR IGNORE INTO action_participants (message_id, guild_id, user_id, joined_at, position)
+        SELECT fa.message_id, fa.guild_id, CAST(p.value AS INTEGER), NULL, p.key
+        FROM faction_actions fa, json_each(fa.participants) p
+        WHERE json_valid(fa.participants)
+    """)
+
+@migration(9, "Ações: contadores de ranking mantidos incrementalmente")
+async def m009_ranking_counters(db):
+    await db.execute("""
+        CREATE TABLE IF NOT EXISTS ranking_counters (
+            guild_id INTEGER,
+            user_id INTEGER,
+            category TEXT, -- Categoria da ação ou 'ALL' (geral + bônus manual)
+            total INTEGER DEFAULT 0,
+            wins INTEGER DEFAULT 0,
+            mvps INTEGER DEFAULT 0,
+            PRIMARY KEY (guild_id, user_id, category)
+        )
+    """)
+    await db.execute("CREATE INDEX IF NOT EXISTS idx_ranking_top ON ranking_counters(guild_id, category, total DESC)")
+
+    # Reconstrói a partir do histórico já normalizado (v8)
+    await db.execute("DELETE FROM ranking_counters")
+    await db.execute("""
+        INSERT INTO ranking_counters (guild_id, user_id, category, total, wins, mvps)
+        SELECT guild_id, user_id, category, SUM(total), SUM(wins), SUM(mvps) FROM (
+            SELECT p.guild_id, p.user_id, COALESCE(fa.category, 'PVP') AS category,
+                   COUNT(*) AS total, SUM(fa.status = 'WIN') AS wins, 0 AS mvps
+            FROM action_participants p
+            JOIN faction_actions fa ON fa.message_id = p.message_id
+            WHERE fa.status IN ('WIN', 'LOSS')
+            GROUP BY p.guild_id, p.user_id, category
+
+            UNION ALL
+            SELECT guild_id, mvp_id, COALESCE(category, 'PVP'), 0, 0, COUNT(*)
+            FROM faction_actions
+            WHERE status IN ('WIN', 'LOSS') AND mvp_id IS NOT NULL
+            GROUP BY guild_id, mvp_id, COALESCE(category, 'PVP')
+        )
+        GROUP BY guild_id, user_id, category
+    """)
+    await db.execute("""
+        INSERT INTO ranking_counters (guild_id, user_id, category, total, wins, mvps)
+        SELECT guild_id, user_id, 'ALL', SUM(total), SUM(wins), SUM(mvps) FROM (
+            SELECT guild_id, user_id, total, wins, mvps FROM ranking_counters
+            UNION ALL
+            SELECT guild_id, user_id, bonus_actions, bonus_wins, bonus_mvps FROM ranking_bonus
+        )
+        GROUP BY guild_id, user_id
+    """)
+
+@migration(10, "Índices para as consultas quentes apontadas pelo query_audit.py")
+async def m010_hot_indexes(db):
+    await db.execute("CREATE INDEX IF NOT EXISTS idx_licenses_guild ON licenses(guild_id)")
+    await db.execute("CREATE INDEX IF NOT EXISTS idx_sessions_user_guild_status ON time_sessions(user_id, guild_id, status)")
+    await db.execute("CREATE INDEX IF NOT EXISTS idx_sessions_guild_status ON time_sessions(guild_id, status)")
+    await db.execute("CREATE INDEX IF NOT EXISTS idx_tslogs_session ON timesheet_logs(session_id)")
+    await db.execute("CREATE INDEX IF NOT EXISTS idx_streams_user_guild ON active_streams(user_id, guild_id)")
+    await db.execute("CREATE INDEX IF NOT EXISTS idx_giveaways_status_end ON giveaways(status, end_time)")
+    await db.execute("CREATE INDEX IF NOT EXISTS idx_sales_guild_time ON sales(guild_id, timestamp)")
+    await db.execute("CREATE INDEX IF NOT EXISTS idx_punish_user_guild ON org_punishments(user_id, guild_id)")
+    await db.execute("CREATE INDEX IF NOT EXISTS idx_hierarchy_guild_group ON hierarchy_roles(guild_id, group_name)")
+    await db.execute("CREATE INDEX IF NOT EXISTS idx_set_roles_guild ON set_selectable_roles(guild_id)")
+    await db.execute("CREATE INDEX IF NOT EXISTS idx_embed_templates_guild ON embed_templates(guild_id)")
+    await db.execute("CREATE INDEX IF NOT EXISTS idx_ranking_bonus_guild ON ranking_bonus(guild_id)")
+
+    # set_users é criada pelo sistema externo de setagem; só indexa se existir
+    async with db.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'set_users'") as cursor:
+        if await cursor.fetchone():
+            await db.execute("CREATE INDEX IF NOT EXISTS idx_set_users_user ON set_users(user_id)")
+
+@migration(11, "Datas em epoch inteiro (vendas, avaliações, ponto, sorteios, auditoria)")
+async def m011_epoch_timestamps(db):
+    # (tabela, coluna antiga, coluna nova)
+    columns = [
+        ("sales", "timestamp", "created_ts"),
+        ("staff_ratings", "date", "created_ts"),
+        ("time_sessions", "start_time", "start_ts"),
+        ("time_sessions", "end_time", "end_ts"),
+        ("timesheet_logs", "timestamp", "created_ts"),
+        ("giveaways", "end_time", "end_ts"),
+        ("audit_logs", "timestamp", "created_ts"),
+    ]
+    for table, old, new in columns:
+        await add_columns(db, table, [(new, "INTEGER")])
+        await db.execute(f"UPDATE {table} SET {new} = {legacy_to_epoch_sql(old)} WHERE {new} IS NULL AND {old} IS NOT NULL")
+
+    await db.execute("DROP INDEX IF EXISTS idx_sales_guild_time")
+    await db.execute("DROP INDEX IF EXISTS idx_giveaways_status_end")
+    await db.execute("CREATE INDEX IF NOT EXISTS idx_sales_guild_created ON sales(guild_id, created_ts)")
+    await db.execute("CREATE INDEX IF NOT EXISTS idx_rating_guild_created ON staff_ratings(guild_id, created_ts)")
+    await db.execute("CREATE INDEX IF NOT EXISTS idx_giveaways_status_end_ts ON giveaways(status, end_ts)")
+    await db.execute("CREATE INDEX IF NOT EXISTS idx_audit_action_created ON audit_logs(action, created_ts)")
+
+@migration(12, "Punições: created_ts em epoch (retenção/arquivamento)")
+async def m012_punishments_epoch(db):
+    await add_columns(db, "org_punishments", [("created_ts", "INTEGER")])
+    # O DEFAULT CURRENT_TIMESTAMP antigo grava em UTC
+    await db.execute("UPDATE org_punishments SET created_ts = CAST(strftime('%s', timestamp) AS INTEGER) WHERE created_ts IS NULL AND timestamp IS NOT NULL")
+    await db.execute("CREATE INDEX IF NOT EXISTS idx_punish_created ON org_punishments(created_ts)")
+
+@migration(13, "Broadcast do painel: jobs e alvos (envio em segundo plano, retomável)")
+async def m013_broadcast_jobs(db):
+    await db.execute("""
+        CREATE TABLE IF NOT EXISTS broadcast_jobs (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            target TEXT,
+            payload TEXT,
+            status TEXT DEFAULT 'running',
+            total INTEGER DEFAULT 0,
+            sent INTEGER DEFAULT 0,
+            failed INTEGER DEFAULT 0,
+            created_by INTEGER,
+            created_ts INTEGER,
+            finished_ts INTEGER
+        )
+    """)
+    # target_id é a guild destino; não se chama guild_id para o job não ser
+    # tratado como dado da guild (wipe/purge/fantasmas do lifecycle)
+    await db.execute("""
+        CREATE TABLE IF NOT EXISTS broadcast_targets (
+            job_id INTEGER,
+            target_id INTEGER,
+            status TEXT DEFAULT 'pending',
+            attempts INTEGER DEFAULT 0,
+            error TEXT,
+            PRIMARY KEY (job_id, target_id)
+        )
+    """)
+    await db.execute("CREATE INDEX IF NOT EXISTS idx_broadcast_jobs_status ON broadcast_jobs(status)")
+    await db.execute("CREATE INDEX IF NOT EXISTS idx_broadcast_targets_status ON broadcast_targets(job_id, status)")
+
+@migration(14, "Campanhas de DM: jobs e alvos (fila persistente, retomável)")
+async def m014_dm_jobs(db):
+    await db.execute("""
+        CREATE TABLE IF NOT EXISTS dm_jobs (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            guild_id INTEGER,
+            author_id INTEGER,
+            payload TEXT,
+            button TEXT,
+            delay REAL DEFAULT 2,
+            status TEXT DEFAULT 'running',
+            total INTEGER DEFAULT 0,
+            sent INTEGER DEFAULT 0,
+            failed INTEGER DEFAULT 0,
+            created_ts INTEGER,
+            finished_ts INTEGER
+        )
+    """)
+    await db.execute("""
+        CREATE TABLE IF NOT EXISTS dm_job_targets (
+            job_id INTEGER,
+            user_id INTEGER,
+            status TEXT DEFAULT 'pending',
+            attempts INTEGER DEFAULT 0,
+            error TEXT,
+            PRIMARY KEY (job_id, user_id)
+        )
+    """)
+    await db.execute("CREATE INDEX IF NOT EXISTS idx_dm_jobs_guild ON dm_jobs(guild_id, status)")
+    await db.execute("CREATE INDEX IF NOT EXISTS idx_dm_job_targets_status ON dm_job_targets(job_id, status)")
@@ -0,0 +1,218 @@
+import asyncio
+import os
+import re
+import weakref
+from collections import OrderedDict
+
+import aiosqlite
+
+from database.bot_db import DatabasePool, DB_PRAGMAS
+from database.migrations import run_migrations
+
+# ====================================================
+# 🧩 SHARDING POR GUILD (OPCIONAL)
+# ====================================================
+# Com DB_SHARDING=1 as tabelas de uma guild (tickets, ações, vendas, ponto)
+# ficam em database/shards/guild_<id>.db, cada arquivo com o seu próprio
+# escritor: o pico de uma guild não trava a fila de escrita das outras.
+# Tabelas globais (licenses, global_bans, tier_definitions, audit_logs,
+# config...) continuam no banco compartilhado.
+#
+# Os cogs pegam o pool certo com `db = await bot.db.for_guild(guild_id)`;
+# sem sharding isso devolve o próprio bot.db. Leituras que cruzam guilds
+# (painel) usam `await bot.db.fan_out(sql, params)`.
+#
+# for_guild devolve um ShardHandle (mesma interface do pool). O pool
+# despejado do LRU só fecha quando o último handle vivo é coletado; um get()
+# antes disso reaproveita o mesmo pool (nunca dois escritores no arquivo).
+#
+# Para separar um banco existente: python split_shards.py
+
+DB_SHARDING = os.getenv("DB_SHARDING", "0") == "1"
+SHARD_DIR = os.getenv("DB_SHARD_DIR", "database/shards")
+SHARD_MAX_OPEN = int(os.getenv("DB_SHARD_MAX_OPEN", 64))  # Pools abertos ao mesmo tempo (LRU)
+SHARD_READERS = int(os.getenv("DB_SHARD_READERS", 1))
+SHARD_FANOUT = int(os.getenv("DB_SHARD_FANOUT", 8))       # Shards lidos em paralelo no fan_out
+
+# Tabelas que vivem no shard da guild
+SHARDED_TABLES = (
+    'active_tickets', 'ticket_categories', 'staff_ratings',
+    'faction_actions', 'action_participants', 'action_mvp_votes', 'ranking_counters', 'ranking_bonus',
+    'sales',
+    'time_sessions', 'timesheet_logs',
+)
+
+# Filtro de cópia para tabelas em que guild_id pode estar vazio (votos antigos)
+SHARD_FILTERS = {
+    'action_mvp_votes': "guild_id = ? OR message_id IN (SELECT message_id FROM faction_actions WHERE guild_id = ?)",
+}
+
+SHARD_FILE = re.compile(r'^guild_(\d+)\.db$')
+
+class ShardHandle:
+    """Referência a um pool de shard; enquanto existir, o pool não é fechado."""
+    __slots__ = ('pool', '__weakref__')
+
+    def __init__(self, pool):
+        self.pool = pool
+
+    def __getattr__(self, name):
+        return getattr(self.pool, name)
+
+class ShardRouter:
+    def __init__(self, directory=SHARD_DIR, max_open=SHARD_MAX_OPEN):
+        self.directory = directory
+        self.max_open = max(1, max_open)
+        self._open = OrderedDict()  # guild_id -> DatabasePool (mais recente no fim)
+        self._evicted = {}          # guild_id -> pool fora do LRU com handles ainda vivos
+        self._handles = {}          # pool -> handles vivos
+        self._closing = {}          # guild_id -> task fechando o pool
+        self._lock = asyncio.Lock()
+        self.on_open = []           # Callbacks async(pool) chamados ao abrir um shard
+
+    def path(self, guild_id):
+        return os.path.join(self.directory, f"guild_{int(guild_id)}.db")
+
+    def archive_path(self, guild_id):
+        return os.path.join(self.directory, f"guild_{int(guild_id)}.archive.db")
+
+    def guild_ids(self):
+        """Guilds que já têm arquivo de shard."""
+        if not os.path.isdir(self.directory): return []
+        ids = []
+        for name in os.listdir(self.directory):
+            match = SHARD_FILE.match(name)
+            if match: ids.append(int(match.group(1)))
+        return sorted(ids)
+
+    async def get(self, guild_id):
+        """Pool do shard da guild (abre e migra na primeira vez)."""
+        guild_id = int(guild_id)
+        pool = self._open.get(guild_id)
+        if pool:
+            self._open.move_to_end(guild_id)
+            return self._handle(pool)
+
+        async with self._lock:
+            pool = self._open.get(guild_id)
+            if pool: return self._handle(pool)
+
+            pool = self._evicted.pop(guild_id, None)
+            if pool is None:
+                closing = self._closing.get(guild_id)
+                if closing: await asyncio.wait([closing]) # Arquivo ainda com o escritor antigo
+
+                os.makedirs(self.directory, exist_ok=True)
+                path = self.path(guild_id)
+                async with aiosqlite.connect(path) as db:
+                    await run_migrations(db, quiet=True)
+
+                pool = await DatabasePool(path, readers=SHARD_READERS, archive_path=self.archive_path(guild_id)).open()
+                for callback in self.on_open:
+                    await callback(pool)
+            self._open[guild_id] = pool
+            handle = self._handle(pool) # Antes do despejo: o pool recém-aberto nunca fica sem dono
+
+            while len(self._open) > self.max_open:
+                old_id, old = self._open.popitem(last=False)
+                self._evicted[old_id] = old
+                self._maybe_close(old_id, old)
+        return handle
+
+    def open_pools(self):
+        """[(guild_id, handle)] dos shards abertos agora (não abre nenhum)."""
+        pools = list(self._open.items()) + list(self._evicted.items())
+        return [(guild_id, self._handle(pool)) for guild_id, pool in pools]
+
+    # ---------- Handles ----------
+    def _handle(self, pool):
+        handle = ShardHandle(pool)
+        self._handles[pool] = self._handles.get(pool, 0) + 1
+        weakref.finalize(handle, self._release, pool)
+        return handle
+
+    def _release(self, pool):
+        left = self._handles.get(pool, 0) - 1
+        if left > 0:
+            self._handles[pool] = left
+            return
+        self._handles.pop(pool, None)
+        for guild_id, evicted in list(self._evicted.items()):
+            if evicted is pool: self._maybe_close(guild_id, pool)
+
+    def _maybe_close(self, guild_id, pool):
+        """Fecha o pool despejado se ninguém mais o segura."""
+        if self._handles.get(pool) or self._evicted.get(guild_id) is not pool: return
+        del self._evicted[guild_id]
+        try:
+            task = asyncio.get_running_loop().create_task(self._close(guild_id, pool))
+        except RuntimeError:
+            return # Sem loop (desligamento): close() do router já fechou tudo
+        self._closing[guild_id] = task
+
+    async def _close(self, guild_id, pool):
+        try: await pool.close()
+        except Exception as e: print(f"⚠️ [SHARDS] Falha ao fechar shard: {e}")
+        finally:
+            if self._closing.get(guild_id) is asyncio.current_task():
+                del self._closing[guild_id]
+
+    async def _read(self, guild_id, sql, params):
+        pool = self._open.get(guild_id) or self._evicted.get(guild_id)
+        if pool:
+            handle = self._handle(pool) # Segura o pool durante a leitura
+            async with handle.read() as conn:
+                async with conn.execute(sql, params) as cursor:
+                    return await cursor.fetchall()
+
+        # Shard fechado: conexão somente-leitura avulsa, sem tirar os quentes do LRU
+        conn = await aiosqlite.connect(f"file:{self.path(guild_id)}?mode=ro", uri=True)
+        try:
+            for pragma in DB_PRAGMAS:
+                await conn.execute(pragma)
+            async with conn.execute(sql, params) as cursor:
+                return await cursor.fetchall()
+        finally:
+            await conn.close()
+
+    async def fan_out(self, sql, params=(), guild_ids=None):
+        """Roda a leitura em cada shard. Retorna [(guild_id, rows)]."""
+        ids = self.guild_ids() if guild_ids is None else guild_ids
+        limit = asyncio.Semaphore(SHARD_FANOUT)
+
+        async def one(guild_id):
+            async with limit:
+                try:
+                    return guild_id, await self._read(guild_id, sql, params)
+                except Exception as e:
+                    print(f"⚠️ [SHARDS] fan_out falhou na guild {guild_id}: {e}")
+                    return guild_id, []
+
+        return list(await asyncio.gather(*(one(g) for g in ids)))
+
+    async def drop(self, guild_id):
+        """Apaga o shard da guild (wipe/purge do painel)."""
+        guild_id = int(guild_id)
+        pool = self._open.pop(guild_id, None) or self._evicted.pop(guild_id, None)
+        if pool: await pool.close()
+        closing = self._closing.get(guild_id)
+        if closing: await asyncio.wait([closing])
+
+        removed = False
+        for base in (self.path(guild_id), self.archive_path(guild_id)):
+            for suffix in ('', '-wal', '-shm'):
+                try:
+                    os.remove(base + suffix)
+                    removed = True
+                except OSError:
+                    pass
+        return removed
+
+    async def close(self):
+        pools = list(self._open.values()) + list(self._evicted.values())
+        self._open.clear()
+        self._evicted.clear()
+        for pool in pools:
+            try: await pool.close()
+            except: pass
+        if self._closing: await asyncio.wait(list(self._closing.values()))
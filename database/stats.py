@@ -0,0 +1,235 @@
+import asyncio
+import os
+import time
+
+from database.shards import SHARDED_TABLES
+
+# ====================================================
+# 📈 ESTATÍSTICAS DO BANCO (SNAPSHOT EM CACHE)
+# ====================================================
+# O painel lê um snapshot em memória, nunca conta na hora.
+#   - Recontagem completa (COUNT, dbstat, pegada por guild) numa conexão de
+#     leitura a cada STATS_REFRESH_MINUTES.
+#   - Entre recontagens, triggers TEMP na conexão de escrita somam cada
+#     INSERT/DELETE numa tabela em memória (stats_delta), que entra no
+#     snapshot quando alguém pede. Nada disso vai para o disco.
+# A recontagem lê um snapshot só (transação de leitura no leitor) aberto com
+# o escritor parado, no mesmo instante em que os deltas são zerados: o que
+# for comitado depois entra só no delta, nunca nos dois.
+# Com sharding, cada shard aberto tem os próprios triggers; um shard fechado
+# pelo LRU perde o delta dele até a próxima recontagem, e um shard aberto no
+# meio da recontagem pode contar em dobro o que gravar nesse intervalo.
+# REPLACE sobre linha existente também escapa do trigger de DELETE. Em todos
+# esses casos a diferença some na recontagem seguinte.
+
+STATS_REFRESH = int(os.getenv("STATS_REFRESH_MINUTES", 30)) * 60
+
+class StatsCollector:
+    def __init__(self, db):
+        self.db = db
+        self._base = None          # Última recontagem completa
+        self._task = None
+        self._lock = asyncio.Lock()
+
+    async def _tables(self, conn):
+        """[(tabela, tem_guild_id)] do banco principal."""
+        async with conn.execute("SELECT name FROM main.sqlite_master WHERE type = 'table' AND name NOT LIKE 'sqlite_%'") as cursor:
+            names = [row[0] for row in await cursor.fetchall()]
+        tables = []
+        for name in names:
+            async with conn.execute(f"PRAGMA main.table_info({name})") as cursor:
+                cols = [row[1] for row in await cursor.fetchall()]
+            tables.append((name, 'guild_id' in cols))
+        return tables
+
+    # --- CONTAGEM INCREMENTAL (WRITE PATH) ---
+    async def install(self, db=None):
+        """Cria a tabela de deltas e os triggers TEMP (somem ao fechar a conexão)."""
+        db = db or self.db
+        await db.execute("""
+            CREATE TEMP TABLE IF NOT EXISTS stats_delta (
+                tbl TEXT, guild_id INTEGER, delta INTEGER,
+                PRIMARY KEY (tbl, guild_id)
+            )
+        """)
+        for table, has_guild in await self._tables(db):
+            for event, row, step in (('INSERT', 'NEW', 1), ('DELETE', 'OLD', -1)):
+                gid = f"COALESCE({row}.guild_id, 0)" if has_guild else "0"
+                await db.execute(f"""
+                    CREATE TEMP TRIGGER IF NOT EXISTS stats_{event.lower()}_{table} AFTER {event} ON main.{table}
+                    BEGIN
+                        INSERT INTO stats_delta (tbl, guild_id, delta) VALUES ('{table}', {gid}, {step})
+                        ON CONFLICT(tbl, guild_id) DO UPDATE SET delta = delta + {step};
+                    END
+                """)
+        await db.commit()
+
+    def _writers(self):
+        """Banco compartilhado e os shards abertos (cada um com o seu delta)."""
+        pools = [(None, self.db)]
+        if self.db.shards:
+            pools += self.db.shards.open_pools()
+        return pools
+
+    async def _deltas(self):
+        rows = []
+        for guild_id, db in self._writers():
+            try:
+                async with db.execute("SELECT tbl, guild_id, delta FROM temp.stats_delta WHERE delta != 0") as cursor:
+                    found = await cursor.fetchall()
+            except Exception:
+                continue # Shard aberto antes do coletor existir
+            # No shard o guild_id da linha pode estar vazio (votos antigos)
+            rows += [(t, g or guild_id, d) for t, g, d in found]
+        return rows
+
+    # --- RECONTAGEM COMPLETA ---
+    def start(self):
+        if not self._task:
+            self._task = asyncio.create_task(self._loop())
+
+    def stop(self):
+        if self._task:
+            self._task.cancel()
+            self._task = None
+
+    async def _loop(self):
+        while True:
+            try:
+                await self.refresh()
+            except Exception as e:
+                print(f"❌ [STATS] Falha na recontagem: {e}")
+            await asyncio.sleep(STATS_REFRESH)
+
+    async def _recount(self, pool, work):
+        """Roda work(conn) num snapshot de leitura aberto junto com o zero dos deltas do pool."""
+        async with pool.read() as conn:
+            exclusive = conn is pool.writer # Pool sem leitores: conta no próprio escritor, com o lock
+            async with pool.quiesced() as writer:
+                try: await writer.execute("DELETE FROM temp.stats_delta")
+                except Exception: pass # Shard aberto antes do coletor existir
+                await pool.barrier()
+                if exclusive: return await work(conn)
+
+                await conn.execute("BEGIN")
+                async with conn.execute("SELECT COUNT(*) FROM main.sqlite_master") as cursor:
+                    await cursor.fetchall() # A primeira leitura fixa o snapshot
+            try:
+                return await work(conn)
+            finally:
+                await conn.rollback()
+
+    async def refresh(self):
+        """Recontagem completa num snapshot de leitura; zera os deltas no mesmo instante."""
+        async with self._lock:
+            await self.install() # Tabelas criadas por migrações novas ganham trigger
+
+            started = time.perf_counter()
+            tables, guilds, names = {}, {}, {}
+
+            async def count_main(conn):
+                nonlocal names
+                for table, has_guild in await self._tables(conn):
+                    info = {'rows': 0, 'bytes': 0, 'index_bytes': 0}
+                    if has_guild:
+                        async with conn.execute(f"SELECT guild_id, COUNT(*) FROM {table} GROUP BY guild_id") as cursor:
+                            for gid, count in await cursor.fetchall():
+                                info['rows'] += count
+                                if gid: guilds[gid] = guilds.get(gid, 0) + count
+                    else:
+                        async with conn.execute(f"SELECT COUNT(*) FROM {table}") as cursor:
+                            info['rows'] = (await cursor.fetchone())[0]
+                    tables[table] = info
+
+                # Páginas por tabela/índice (índices somam na tabela dona)
+                async with conn.execute("""
+                    SELECT m.tbl_name, m.type, SUM(s.pgsize)
+                    FROM dbstat('main') s JOIN main.sqlite_master m ON m.name = s.name
+                    GROUP BY m.tbl_name, m.type
+                """) as cursor:
+                    for tbl, kind, size in await cursor.fetchall():
+                        if tbl not in tables: continue
+                        tables[tbl]['index_bytes' if kind == 'index' else 'bytes'] += size or 0
+
+                try:
+                    async with conn.execute("SELECT guild_id, client_name FROM licenses") as cursor:
+                        names = {gid: name for gid, name in await cursor.fetchall()}
+                except Exception:
+                    pass
+
+            await self._recount(self.db, count_main)
+
+            # Sharding: tabelas de guild estão nos arquivos de cada guild
+            if self.db.shards:
+                sharded = [table for table in SHARDED_TABLES if table in tables]
+
+                async def count_shard(conn):
+                    counts = []
+                    for table in sharded:
+                        async with conn.execute(f"SELECT COUNT(*) FROM {table}") as cursor:
+                            counts.append((table, (await cursor.fetchone())[0]))
+                    return counts
+
+                def add(gid, table, count):
+                    if not count: return
+                    tables[table]['rows'] += count
+                    guilds[gid] = guilds.get(gid, 0) + count
+
+                # Shards abertos têm delta: snapshot junto com o zero, como no principal
+                open_ids = set()
+                for gid, pool in self.db.shards.open_pools():
+                    open_ids.add(gid)
+                    try:
+                        for table, count in await self._recount(pool, count_shard):
+                            add(gid, table, count)
+                    except Exception as e:
+                        print(f"⚠️ [STATS] Recontagem falhou na guild {gid}: {e}")
+
+                closed = [gid for gid in self.db.shards.guild_ids() if gid not in open_ids]
+                for table in sharded:
+                    for gid, rows in await self.db.shards.fan_out(f"SELECT COUNT(*) FROM {table}", guild_ids=closed):
+                        add(gid, table, rows[0][0] if rows else 0)
+
+            self._base = {
+                'recounted_at': int(time.time()),
+                'recount_ms': int((time.perf_counter() - started) * 1000),
+                'tables': tables,
+                'guilds': guilds,
+                'names': names,
+            }
+            print(f"📈 [STATS] Recontagem: {sum(t['rows'] for t in tables.values())} linhas em {self._base['recount_ms']} ms.")
+
+    # --- LEITURA (PAINEL) ---
+    def _files_size(self):
+        total = 0
+        paths = [self.db.path, self.db.archive_path]
+        if self.db.shards:
+            for g in self.db.shards.guild_ids():
+                paths += [self.db.shards.path(g), self.db.shards.archive_path(g)]
+        for base in filter(None, paths):
+            for suffix in ('', '-wal'):
+                try: total += os.path.getsize(base + suffix)
+                except OSError: pass
+        return total
+
+    async def current(self):
+        """Snapshot = última recontagem + deltas dos triggers."""
+        if self._base is None:
+            await self.refresh()
+
+        tables = {name: dict(info) for name, info in self._base['tables'].items()}
+        guilds = dict(self._base['guilds'])
+        for table, gid, delta in await self._deltas():
+            tables.setdefault(table, {'rows': 0, 'bytes': 0, 'index_bytes': 0})['rows'] += delta
+            if gid: guilds[gid] = guilds.get(gid, 0) + delta
+
+        return {
+            'generated_at': int(time.time()),
+            'recounted_at': self._base['recounted_at'],
+            'recount_ms': self._base['recount_ms'],
+            'size_mb': round(self._files_size() / (1024 * 1024), 2),
+            'total_rows': sum(t['rows'] for t in tables.values()),
+            'tables': tables,
+            'guilds': {gid: rows for gid, rows in guilds.items() if rows > 0},
+            'names': self._base['names'],
+        }
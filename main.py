@@ -9,6 +9,7 @@ if os.path.exists("/app/.lib"):
 import discord
 import asyncio
 import traceback
+from types import MappingProxyType
 from discord.ext import commands
 from dotenv import load_dotenv
 
@@ -16,16 +17,32 @@ from dotenv import load_dotenv
 load_dotenv()
 
 # Importação completa do banco de dados
-from database.bot_db import create_db, get_db_connection, check_guild_config
+from database.bot_db import create_db, get_db_connection
+from database.config_cache import GuildConfigCache
+from database.archive import ArchiveEngine
+from database.counters import CounterService
+from database.lifecycle import LifecycleEngine
+from database.stats import StatsCollector
+from database.license_cache import LicenseCache
+from database.license_expiry import LicenseExpiry
+from database.shards import ShardRouter, DB_SHARDING
+from utils.time_utils import now_ts
+from utils.message_router import MessageRouter
+from utils.outbound import OutboundScheduler
+from utils.broadcast import BroadcastEngine
+from utils.dm_campaigns import DMCampaignQueue
+from utils.intents import enabled_cogs, build_intents, member_cache_flags, MEMBER_LIST_MODULES, CHUNK_AT_STARTUP
 from dashboard.app import init_dashboard, run_dashboard
 TOKEN = os.getenv('DISCORD_TOKEN')
 
 # ====================================================
 # 🚀 CONFIGURAÇÃO OFICIAL (INTENTS)
 # ====================================================
-# Isso exige que as 3 chaves (Presence, Server Members, Message Content)
-# estejam ativadas no Discord Developer Portal.
-intents = discord.Intents.all()
+# Só as intents que os cogs carregados declaram (utils/intents.py).
+# As privilegiadas usadas (Presence, Server Members, Message Content)
+# precisam estar ativadas no Discord Developer Portal.
+COGS = enabled_cogs()
+intents = build_intents(COGS)
 
 import logging
 from collections import deque
@@ -50,12 +67,27 @@ logging.getLogger().addHandler(console_handler)
 
 class CityBot(commands.Bot):
     def __init__(self):
-        super().__init__(command_prefix='!', intents=intents, help_command=None, case_insensitive=True)
+        super().__init__(command_prefix='!', intents=intents, help_command=None, case_insensitive=True,
+                         member_cache_flags=member_cache_flags(intents),
+                         chunk_guilds_at_startup=CHUNK_AT_STARTUP and intents.members,
+                         enable_raw_presences=intents.presences) # Presença de quem não está no cache (Streaming)
         self.db = None
+        self.config_cache = None # Cache write-through da tabela config
+        self.router = None # Roteador de mensagens por canal (utils/message_router.py)
+        self.outbound = None # Fila de envios com prioridade e limites por rota (utils/outbound.py)
+        self.broadcasts = None # Jobs de broadcast do painel, retomáveis (utils/broadcast.py)
+        self.campaigns = None # Campanhas de DM persistentes (utils/dm_campaigns.py)
+        self.archive = None # Arquivamento de logs antigos (database/archive.py)
+        self.counters = None # Números de ticket/sugestão/bug (database/counters.py)
+        self.lifecycle = None # Wipe/purge/limpeza de guilds (database/lifecycle.py)
+        self.stats = None # Estatísticas do banco em cache (database/stats.py)
+        self.licenses = None # Licenças em cache com TTL (database/license_cache.py)
+        self.license_expiry = None # Varredor de vencimentos (database/license_expiry.py)
         self.synced = False
         self.maintenance_mode = False # Flag do Modo Manutenção
         self.log_handler = console_handler # Referência para o Dashboard acessar
-        self.tier_map = {} # Permissões Dinâmicas
+        self.tier_map = MappingProxyType({}) # Permissões Dinâmicas: tier -> (módulos,)
+        self.command_matrix = MappingProxyType({}) # tier -> frozenset(comandos liberados)
 
     async def load_tier_permissions(self):
         """Carrega as permissões de tiers do banco de dados."""
@@ -71,16 +103,64 @@ class CityBot(commands.Bot):
                 if tier not in new_map: new_map[tier] = []
                 new_map[tier].append(module)
                 
-            self.tier_map = new_map
+            self.tier_map = MappingProxyType({tier: tuple(modules) for tier, modules in new_map.items()})
+            self.build_command_matrix()
             print(f"✅ [TIERS] Definições carregadas: {len(rows)} regras.")
         except Exception as e:
             print(f"❌ [TIERS] Falha ao carregar tiers: {e}")
 
+    @staticmethod
+    def command_module(command):
+        """Módulo (nome da classe do Cog, minúsculo) dono do comando. Ex: tickets, admin"""
+        binding = getattr(command, 'binding', None) # Menus de contexto não têm
+        return binding.__class__.__name__.lower() if binding else "unknown"
+
+    def build_command_matrix(self):
+        """Compila tier_map em {tier: frozenset(nome qualificado)} para o interaction_check.
+        
+        O dicionário novo é montado inteiro e trocado numa única atribuição:
+        quem está no meio de um check continua vendo a matriz antiga, completa.
+        """
+        by_module = {}
+        # Só folhas: interaction.command nunca é um Group
+        commands_list = [c for c in self.tree.walk_commands() if not isinstance(c, discord.app_commands.Group)]
+        for kind in (discord.AppCommandType.user, discord.AppCommandType.message):
+            commands_list += self.tree.get_commands(type=kind)
+        for command in commands_list:
+            by_module.setdefault(self.command_module(command), []).append(command.qualified_name)
+
+        matrix = {}
+        for tier, modules in self.tier_map.items():
+            allowed = set(by_module.get('general', ()))
+            for module in modules:
+                allowed.update(by_module.get(module, ()))
+            matrix[tier] = frozenset(allowed)
+        self.command_matrix = MappingProxyType(matrix)
+
+    async def ensure_members(self, guild):
+        """Baixa a lista de membros da guild na primeira vez que um módulo precisa dela."""
+        if guild.chunked or not self.intents.members: return
+        try:
+            await guild.chunk()
+            print(f"👥 [MEMBERS] {guild.name}: {guild.member_count} membros em cache (sob demanda).")
+        except Exception as e:
+            print(f"⚠️ [MEMBERS] Falha ao baixar membros de {guild.id}: {e}")
+
+    async def add_cog(self, cog, *args, **kwargs):
+        await super().add_cog(cog, *args, **kwargs)
+        self.build_command_matrix() # Comandos novos entram na matriz (load/reload de cog)
+
+    async def remove_cog(self, name, *args, **kwargs):
+        cog = await super().remove_cog(name, *args, **kwargs)
+        self.build_command_matrix()
+        return cog
+
     # ====================================================
     # 🔧 COMANDO DE EMERGÊNCIA: FIX BOT
     # ====================================================
     async def on_message(self, message):
         if message.author.bot: return
+        if self.router: self.router.dispatch(message) # Handlers dos cogs interessados no canal
         
         # Apenas administradores
         if message.content == "!fix_bot" and message.author.guild_permissions.administrator:
@@ -95,18 +175,17 @@ class CityBot(commands.Bot):
                 # 2. Recarrega Cogs (Reler arquivos do disco)
                 await status_msg.edit(content="🔄 [2/4] Recarregando módulos (Cogs)...")
                 loaded = []
-                if os.path.exists('./cogs'):
-                    for filename in os.listdir('./cogs'):
-                        if filename.endswith('.py'):
-                            cog_name = f'cogs.{filename[:-3]}'
-                            try:
-                                await self.reload_extension(cog_name)
-                                loaded.append(filename)
-                            except commands.ExtensionNotLoaded:
-                                await self.load_extension(cog_name)
-                                loaded.append(filename)
-                            except Exception as e:
-                                await message.channel.send(f"⚠️ Erro ao carregar `{filename}`: {e}")
+                for name in COGS:
+                    filename = f'{name}.py'
+                    cog_name = f'cogs.{name}'
+                    try:
+                        await self.reload_extension(cog_name)
+                        loaded.append(filename)
+                    except commands.ExtensionNotLoaded:
+                        await self.load_extension(cog_name)
+                        loaded.append(filename)
+                    except Exception as e:
+                        await message.channel.send(f"⚠️ Erro ao carregar `{filename}`: {e}")
 
                 # 3. Sincroniza Comandos APENAS para esta Guild (Instantâneo)
                 await status_msg.edit(content=f"☁️ [3/4] Sincronizando Tree LOCAL (Cogs: {len(loaded)})...")
@@ -165,83 +244,36 @@ class CityBot(commands.Bot):
         if not interaction.guild: return True # DMs liberadas
         if not interaction.command: return True # Componentes soltos
 
-        # Pega o nome do Cog
-        cog_name = interaction.command.binding.__class__.__name__.lower() if interaction.command.binding else "unknown" # Ex: tickets, admin
-        if not cog_name: return True 
-        
         # Dono Bypass
         if interaction.user.id == int(os.getenv('OWNER_ID', 0)): return True
 
-        # Verifica Banco
-        guild_id = interaction.guild.id
-        async with self.db.execute("SELECT status, tier FROM licenses WHERE guild_id = ?", (guild_id,)) as cursor:
-            row = await cursor.fetchone()
+        # Verifica Licença (cache em memória, invalidado pelo painel)
+        row = await self.licenses.get(interaction.guild.id)
 
         if not row:
             await interaction.response.send_message("🔒 **Este servidor não possui uma licença ativa.**", ephemeral=True)
             return False
 
-        status, tier = row
-        if status != 'active':
+        status, tier = row['status'], row['tier']
+        if status not in ('active', 'grace_period'): # Carência ainda libera os comandos
              await interaction.response.send_message("🔒 **Licença Suspensa ou Expirada.**", ephemeral=True)
              return False
 
-        # Verifica Permissão Dinâmica
-        allowed_cogs = self.tier_map.get(tier, [])
-        if 'general' not in allowed_cogs: allowed_cogs.append('general')
-        
-        if cog_name not in allowed_cogs:
+        # Verifica Permissão Dinâmica (matriz pré-compilada: uma consulta em hash)
+        allowed = self.command_matrix.get(tier)
+        if allowed is not None and interaction.command.qualified_name in allowed:
+            # Módulo que lê membros do cache: baixa a lista em segundo plano (não segura a resposta)
+            if not interaction.guild.chunked and self.command_module(interaction.command) in MEMBER_LIST_MODULES:
+                asyncio.create_task(self.ensure_members(interaction.guild))
+            return True
+
+        # Caminho lento só na negação: comando registrado depois da última compilação
+        cog_name = self.command_module(interaction.command)
+        if cog_name not in self.tier_map.get(tier, ()) and cog_name != 'general':
              await interaction.response.send_message(f"💎 **Recurso Bloqueado.**\nO módulo `{cog_name}` não está incluso no plano **{tier.upper()}**.", ephemeral=True)
              return False
 
         return True
-        
-        # HACK: Mapear comandos para Cogs ou usar a estrutura de module.
-        # interaction.command.binding é a instância da classe (Cog).
-        cog_name = "Unknown"
-        if hasattr(interaction.command, 'binding'):
-            cog = interaction.command.binding
-            # Se for instância de Cog, pega o nome da classe
-            if isinstance(cog, commands.Cog):
-                 cog_name = cog.__class__.__name__
-            else:
-                 cog_name = str(cog)
-        
-        # Se não achou cog, libera (ex: comandos soltos no main)
-        if cog_name == "Unknown": return True
-
-        normalized_cog = cog_name.lower().replace('cogs.', '')
-        
-        # Exceções
-        if normalized_cog in ['sales', 'admin', 'general']: return True 
-
-        # Database Check
-        tier = 'free'
-        try:
-             async with self.db.execute("SELECT tier FROM licenses WHERE guild_id = ?", (interaction.guild.id,)) as cursor:
-                 row = await cursor.fetchone()
-             if row: tier = row[0]
-        except:
-             pass
-
-        # Se não tem licença nenhuma
-        if tier == 'free':
-             await interaction.response.send_message("🚫 **Licença Inválida.** Adquira um plano.", ephemeral=True)
-             return False
-
-        allowed_cogs = self.TIER_MAP.get(tier, [])
-        # Check permission
-        is_allowed = False
-        for allowed in allowed_cogs:
-             if allowed.lower() in normalized_cog:
-                 is_allowed = True
-                 break
-        
-        if not is_allowed:
-             await interaction.response.send_message(f"🔒 **Funcionalidade Bloqueada.** Seu plano ({tier.upper()}) não cobre `{cog_name}`.", ephemeral=True)
-             return False
-
-        return True
 
     async def setup_hook(self):
         print("⚙️ [SYSTEM] Iniciando setup...")
@@ -251,6 +283,42 @@ class CityBot(commands.Bot):
         self.db = await get_db_connection()
         print("✅ [DATABASE] Conexão estabelecida.")
 
+        # 1.0 Cache de Configuração (leitura única da tabela config)
+        self.config_cache = GuildConfigCache(self.db)
+        await self.config_cache.load()
+        self.router = MessageRouter(self.config_cache)
+        self.router.rebuild()
+        self.licenses = LicenseCache(self.db)
+        self.license_expiry = LicenseExpiry(self)
+        self.licenses.on_invalidate.append(self.license_expiry.reschedule)
+        self.license_expiry.start()
+        self.counters = CounterService(self.db, self.config_cache)
+        self.lifecycle = LifecycleEngine(self.db)
+
+        # 1.0.1 Arquivamento de logs antigos (banco frio anexado)
+        self.archive = ArchiveEngine(self.db)
+        await self.archive.ensure_tables()
+        self.archive.start()
+
+        # 1.0.2 Sharding por guild (opcional): cada guild com o próprio arquivo/escritor
+        if DB_SHARDING:
+            self.db.shards = ShardRouter()
+            self.db.shards.on_open.append(self.archive.ensure_tables)
+            print(f"🧩 [SHARDS] Sharding ativo ({len(self.db.shards.guild_ids())} guilds em {self.db.shards.directory}).")
+
+        # 1.0.3 Estatísticas do banco: triggers de contagem + recontagem periódica
+        self.stats = StatsCollector(self.db)
+        await self.stats.install()
+        if self.db.shards: self.db.shards.on_open.append(self.stats.install)
+        self.stats.start()
+
+        # 1.0.4 Agendador de saída (painéis, logs e DMs em massa disputam o limite global)
+        self.outbound = OutboundScheduler()
+        self.broadcasts = BroadcastEngine(self)
+        await self.broadcasts.resume() # Jobs cortados por reinício continuam dos alvos pendentes
+        self.campaigns = DMCampaignQueue(self)
+        await self.campaigns.resume()
+
         # 1.1 Carrega Tiers
         await self.load_tier_permissions()
         
@@ -260,15 +328,14 @@ class CityBot(commands.Bot):
         
         # 2. Carrega Cogs (Plugins)
         print("🔄 [SYSTEM] Carregando Cogs...")
-        if os.path.exists('./cogs'):
-            for filename in os.listdir('./cogs'):
-                if filename.endswith('.py'):
-                    try:
-                        await self.load_extension(f'cogs.{filename[:-3]}')
-                        print(f'   ├─ 🧩 {filename} carregado.')
-                    except Exception as e:
-                        print(f'   └─ ❌ FALHA CRÍTICA em {filename}:')
-                        traceback.print_exc()
+        for name in COGS:
+            try:
+                await self.load_extension(f'cogs.{name}')
+                print(f'   ├─ 🧩 {name}.py carregado.')
+            except Exception as e:
+                print(f'   └─ ❌ FALHA CRÍTICA em {name}.py:')
+                traceback.print_exc()
+        print(f"📡 [INTENTS] Ativas: {', '.join(n for n, v in self.intents if v)}")
 
         # 3. Inicia Painel Web (Background Task)
         print("🌐 [SYSTEM] Iniciando Dashboard...")
@@ -284,6 +351,12 @@ class CityBot(commands.Bot):
         #     print(f"⚠️ [SYSTEM] Aviso na sincronização (Rate Limit ou Erro): {e}")
 
     async def close(self):
+        if self.archive: self.archive.stop()
+        if self.stats: self.stats.stop()
+        if self.license_expiry: self.license_expiry.stop()
+        if self.broadcasts: self.broadcasts.stop()
+        if self.campaigns: self.campaigns.stop()
+        if self.outbound: self.outbound.stop()
         if self.db: await self.db.close()
         await super().close()
 
@@ -298,8 +371,8 @@ class CityBot(commands.Bot):
         # 4. Verifica Configurações dos Servidores
         print("🔍 [SYSTEM] Verificando configurações dos servidores...")
         for guild in self.guilds:
-            if self.db:
-                await check_guild_config(guild.id, self.db)
+            if self.config_cache:
+                await self.config_cache.ensure(guild.id)
         print(f"✅ [SYSTEM] Configurações validadas para {len(self.guilds)} servidores.")
         
         # 5. Define Status
@@ -311,16 +384,15 @@ class CityBot(commands.Bot):
 
     async def on_guild_join(self, guild):
         print(f"➕ [GUILD JOIN] Novo servidor: {guild.name} (ID: {guild.id})")
-        if self.db:
-            await check_guild_config(guild.id, self.db)
+        if self.config_cache:
+            await self.config_cache.ensure(guild.id)
 
     async def on_guild_remove(self, guild):
         print(f"➖ [GUILD LEAVE] Removido de: {guild.name} (ID: {guild.id})")
         # Registra na Audit Log para aparecer na "Fila de Limpeza" do painel
         if self.db:
-            from datetime import datetime
-            await self.db.execute("INSERT INTO audit_logs (user_id, action, target, timestamp) VALUES (?, ?, ?, ?)",
-                                  (self.user.id, "BOT_REMOVED", guild.id, datetime.now().strftime("%Y-%m-%d %H:%M:%S")))
+            await self.db.execute("INSERT INTO audit_logs (user_id, action, target, created_ts) VALUES (?, ?, ?, ?)",
+                                  (self.user.id, "BOT_REMOVED", guild.id, now_ts()))
             await self.db.commit()
 
     async def on_command_error(self, ctx, error):
@@ -0,0 +1,206 @@
+import ast
+import asyncio
+import os
+import re
+import sqlite3
+import sys
+import tempfile
+
+import aiosqlite
+
+# Adiciona o diretório atual ao path para permitir imports
+sys.path.append(os.getcwd())
+
+from database.migrations import run_migrations
+from database.archive import ArchiveEngine
+
+# ====================================================
+# 🔎 AUDITORIA DE PLANOS DE CONSULTA
+# ====================================================
+# Extrai todo literal SQL de cogs/, dashboard/app.py e main.py, roda
+# EXPLAIN QUERY PLAN num banco temporário com o schema atual (todas as
+# migrações aplicadas) e aponta consultas filtradas que varrem a tabela.
+#
+# Uso:
+#   python query_audit.py           -> relatório + índices sugeridos
+#   python query_audit.py --check   -> sai com código 1 se houver varredura nova
+
+SOURCES = ['cogs', 'dashboard/app.py', 'main.py']
+SQL_START = re.compile(r'^\s*(SELECT|INSERT|UPDATE|DELETE|WITH|REPLACE)\b', re.IGNORECASE)
+
+# Tabelas criadas fora das migrações deste projeto
+EXTERNAL_TABLES = {'set_users'}
+
+# Varreduras aceitas de propósito: (arquivo, tabela) -> motivo
+KNOWN_SCANS = {
+    ('cogs/tickets.py', 'config'): "cog_load: uma leitura por boot",
+    ('cogs/presence.py', 'presence'): "tabela minúscula (status do bot)",
+    ('dashboard/app.py', 'licenses'): "painel do dono, lista todas as licenças",
+    ('dashboard/app.py', 'audit_logs'): "painel do dono, baixa frequência",
+}
+
+def iter_files():
+    for src in SOURCES:
+        if os.path.isfile(src):
+            yield src
+            continue
+        for root, _, files in os.walk(src):
+            for name in sorted(files):
+                if name.endswith('.py'):
+                    yield os.path.join(root, name).replace(os.sep, '/')
+
+def extract_sql(path):
+    """Retorna [(linha, sql, dinâmico)] com as strings que parecem SQL (f-strings com o campo vazio)."""
+    with open(path, encoding='utf-8') as f:
+        tree = ast.parse(f.read(), filename=path)
+
+    found = []
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Constant) and isinstance(node.value, str):
+            text, dynamic = node.value, False
+        elif isinstance(node, ast.JoinedStr):
+            parts = []
+            for value in node.values:
+                if isinstance(value, ast.Constant): parts.append(str(value.value))
+                else: parts.append("")
+            text, dynamic = "".join(parts), True
+        else:
+            continue
+        if SQL_START.match(text):
+            found.append((node.lineno, " ".join(text.split()), dynamic))
+
+    # Strings dentro de f-strings também aparecem como Constant; mantém só a maior
+    unique = []
+    for line, sql, dynamic in sorted(found, key=lambda f: (f[0], -len(f[1]))):
+        if unique and unique[-1][0] == line and sql in unique[-1][1]: continue
+        unique.append((line, sql, dynamic))
+    return unique
+
+def table_aliases(sql):
+    """Mapeia alias -> tabela a partir das cláusulas FROM/JOIN/UPDATE/INTO."""
+    aliases = {}
+    pattern = r'\b(?:FROM|JOIN|UPDATE|INTO)\s+(\w+)(?:\s+(?:AS\s+)?(?!WHERE|ON|SET|JOIN|LEFT|INNER|GROUP|ORDER|LIMIT|VALUES|USING)(\w+))?'
+    for table, alias in re.findall(pattern, sql, re.IGNORECASE):
+        aliases[table] = table
+        if alias: aliases[alias] = table
+    return aliases
+
+def filter_columns(sql, columns):
+    """Colunas filtradas no WHERE: igualdade primeiro, depois a primeira de intervalo."""
+    where = re.split(r'\bWHERE\b', sql, maxsplit=1, flags=re.IGNORECASE)
+    if len(where) < 2: return []
+    clause = re.split(r'\b(?:GROUP BY|ORDER BY|LIMIT|RETURNING)\b', where[1], flags=re.IGNORECASE)[0]
+
+    equal, ranged = [], []
+    for col, op in re.findall(r'(?:\w+\.)?(\w+)\s*(=|!=|<>|<=|>=|<|>|\bIN\b|\bIS\b)', clause, re.IGNORECASE):
+        if col not in columns: continue
+        target = equal if op.upper() in ('=', 'IN', 'IS') else ranged
+        if col not in equal and col not in ranged: target.append(col)
+    return equal + ranged[:1]
+
+async def build_schema(path):
+    async with aiosqlite.connect(path) as db:
+        await run_migrations(db)
+
+def attach_archive(conn):
+    """Anexa um arquivo vazio com as mesmas tabelas (consultas em archive.*)."""
+    conn.execute("ATTACH DATABASE ':memory:' AS archive")
+    for table in ArchiveEngine(None)._tables():
+        conn.execute(f"CREATE TABLE archive.{table} AS SELECT * FROM main.{table} WHERE 0")
+        cols = [r[1] for r in conn.execute(f"PRAGMA main.table_info({table})")]
+        if 'guild_id' in cols:
+            conn.execute(f"CREATE INDEX archive.idx_{table}_guild ON {table}(guild_id)")
+
+def audit():
+    tmp = tempfile.NamedTemporaryFile(suffix='.db', delete=False)
+    tmp.close()
+    try:
+        asyncio.run(build_schema(tmp.name))
+        conn = sqlite3.connect(tmp.name)
+        attach_archive(conn)
+        return run_audit(conn)
+    finally:
+        try: conn.close()
+        except: pass
+        os.remove(tmp.name)
+
+def run_audit(conn):
+    table_cols = {}
+    for (name,) in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'"):
+        table_cols[name] = [r[1] for r in conn.execute(f"PRAGMA table_info({name})")]
+
+    findings, skipped, allowed = [], [], []
+    suggestions = {}
+    total = 0
+
+    for path in iter_files():
+        for line, sql, dynamic in extract_sql(path):
+            total += 1
+            try:
+                plan = conn.execute("EXPLAIN QUERY PLAN " + sql, [None] * sql.count('?')).fetchall()
+            except sqlite3.Error as e:
+                missing = re.search(r'no such table: (\w+)', str(e))
+                if missing and missing.group(1) in EXTERNAL_TABLES:
+                    skipped.append((path, line, sql, f"tabela externa {missing.group(1)}"))
+                elif dynamic:
+                    skipped.append((path, line, sql, "SQL dinâmico"))
+                else:
+                    findings.append((path, line, sql, None, f"erro: {e}"))
+                continue
+
+            aliases = table_aliases(sql)
+            has_filter = re.search(r'\bWHERE\b', sql, re.IGNORECASE)
+            for row in plan:
+                detail = row[-1]
+                scan = re.match(r'SCAN (\w+)', detail)
+                if not scan or scan.group(1) in ('CONSTANT',): continue
+                table = aliases.get(scan.group(1), scan.group(1))
+                if table not in table_cols: continue  # subquery / CTE
+                if not has_filter: continue            # listagem completa intencional
+
+                if (path, table) in KNOWN_SCANS:
+                    allowed.append((path, line, table, KNOWN_SCANS[(path, table)]))
+                    continue
+
+                findings.append((path, line, sql, table, detail))
+                cols = filter_columns(sql, table_cols[table])
+                if cols: suggestions.setdefault(table, set()).add(tuple(cols))
+
+    return total, findings, skipped, allowed, index_statements(suggestions)
+
+def index_statements(suggestions):
+    """Um CREATE INDEX por combinação, descartando as que são prefixo de outra."""
+    stmts = []
+    for table, combos in suggestions.items():
+        for cols in sorted(combos):
+            if any(other != cols and other[:len(cols)] == cols for other in combos): continue
+            name = f"idx_{table}_{'_'.join(cols)}"
+            stmts.append(f"CREATE INDEX IF NOT EXISTS {name} ON {table}({', '.join(cols)})")
+    return stmts
+
+def main():
+    check = '--check' in sys.argv
+    total, findings, skipped, allowed, suggestions = audit()
+
+    print(f"[DEBUG] {total} consultas analisadas.")
+    for path, line, table, reason in allowed:
+        print(f"[OK] {path}:{line} varre {table} (aceito: {reason})")
+    for path, line, sql, reason in skipped:
+        print(f"[PULADA] {path}:{line} ({reason})")
+    for path, line, sql, table, detail in findings:
+        print(f"[FALHA] {path}:{line} -> {detail}")
+        print(f"        {sql[:160]}")
+
+    if suggestions:
+        print("\n# Índices sugeridos (colar como nova migração em database/schema.py):")
+        print("@migration(N, \"Índices para consultas sem índice\")")
+        print("async def mNNN_indexes(db):")
+        for stmt in suggestions:
+            print(f"    await db.execute(\"{stmt}\")")
+
+    print(f"[FIM] {len(findings)} problema(s) encontrado(s).")
+    if check and findings:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
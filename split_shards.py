@@ -0,0 +1,123 @@
+import asyncio
+import os
+import sqlite3
+import sys
+
+import aiosqlite
+
+# Adiciona o diretório atual ao path para permitir imports
+sys.path.append(os.getcwd())
+
+from database.bot_db import DB_NAME, ARCHIVE_NAME
+from database.migrations import run_migrations
+from database.shards import ShardRouter, SHARDED_TABLES, SHARD_FILTERS
+
+# ====================================================
+# 🧩 SEPARA O BANCO ÚNICO EM SHARDS POR GUILD
+# ====================================================
+# Copia as tabelas de guild (SHARDED_TABLES) de bot_data.db e do arquivo
+# frio para database/shards/guild_<id>.db. Rode com o bot DESLIGADO e
+# depois ligue com DB_SHARDING=1.
+#
+# Uso:
+#   python split_shards.py            -> copia (o banco compartilhado fica intacto)
+#   python split_shards.py --delete   -> copia e apaga as linhas copiadas do compartilhado
+#   python split_shards.py --force    -> recria shards que já existem
+
+def columns(conn, schema, table):
+    return [r[1] for r in conn.execute(f"PRAGMA {schema}.table_info({table})")]
+
+def where_for(table):
+    where = SHARD_FILTERS.get(table, "guild_id = ?")
+    return where, where.count('?')
+
+def guild_ids(conn):
+    ids = set()
+    for table in SHARDED_TABLES:
+        if 'guild_id' not in columns(conn, 'main', table): continue
+        ids.update(r[0] for r in conn.execute(f"SELECT DISTINCT guild_id FROM {table} WHERE guild_id IS NOT NULL"))
+    return sorted(ids)
+
+def copy_tables(conn, src, dest, guild_id):
+    """Copia as linhas da guild de src.* para dest.* (colunas em comum). Retorna o total."""
+    total = 0
+    for table in SHARDED_TABLES:
+        src_cols = columns(conn, src, table)
+        if not src_cols: continue
+        if dest == 'archive':
+            conn.execute(f"CREATE TABLE IF NOT EXISTS archive.{table} AS SELECT * FROM {src}.{table} WHERE 0")
+        dest_cols = columns(conn, dest, table)
+        cols = ", ".join(c for c in src_cols if c in dest_cols)
+
+        where, marks = where_for(table)
+        before = conn.total_changes
+        conn.execute(f"INSERT OR IGNORE INTO {dest}.{table} ({cols}) SELECT {cols} FROM {src}.{table} WHERE {where}", (guild_id,) * marks)
+        total += conn.total_changes - before
+    return total
+
+def delete_tables(conn, schema, guild_id):
+    # Ordem inversa: filhas (votos) antes de faction_actions, que é usada no filtro
+    for table in reversed(SHARDED_TABLES):
+        if not columns(conn, schema, table): continue
+        where, marks = where_for(table)
+        where = where.replace("FROM faction_actions", f"FROM {schema}.faction_actions")
+        conn.execute(f"DELETE FROM {schema}.{table} WHERE {where}", (guild_id,) * marks)
+
+async def create_shard(path):
+    async with aiosqlite.connect(path) as db:
+        await run_migrations(db, quiet=True)
+
+def main():
+    delete = '--delete' in sys.argv
+    force = '--force' in sys.argv
+
+    if not os.path.exists(DB_NAME):
+        print(f"[ERRO] {DB_NAME} nao encontrado.")
+        sys.exit(1)
+
+    router = ShardRouter()
+    os.makedirs(router.directory, exist_ok=True)
+    has_archive = os.path.exists(ARCHIVE_NAME)
+
+    src = sqlite3.connect(DB_NAME)
+    if has_archive: src.execute("ATTACH DATABASE ? AS archive", (ARCHIVE_NAME,))
+    ids = guild_ids(src)
+    print(f"[DEBUG] {len(ids)} guilds com dados em {DB_NAME}.")
+
+    existing = set(router.guild_ids())
+    for guild_id in ids:
+        if guild_id in existing and not force:
+            print(f"[PULADA] guild {guild_id}: shard já existe (use --force).")
+            continue
+        if guild_id in existing:
+            asyncio.run(router.drop(guild_id))
+
+        path = router.path(guild_id)
+        asyncio.run(create_shard(path))
+
+        conn = sqlite3.connect(path)
+        try:
+            conn.execute("ATTACH DATABASE ? AS src", (DB_NAME,))
+            copied = copy_tables(conn, 'src', 'main', guild_id)
+            archived = 0
+            if has_archive:
+                conn.execute("ATTACH DATABASE ? AS srcarchive", (ARCHIVE_NAME,))
+                conn.execute("ATTACH DATABASE ? AS archive", (router.archive_path(guild_id),))
+                archived = copy_tables(conn, 'srcarchive', 'archive', guild_id)
+            conn.commit()
+        finally:
+            conn.close()
+
+        if delete:
+            delete_tables(src, 'main', guild_id)
+            if has_archive: delete_tables(src, 'archive', guild_id)
+            src.commit()
+        print(f"[OK] guild {guild_id}: {copied} linhas (+{archived} arquivadas) -> {path}")
+
+    src.close()
+    if not delete:
+        print("[INFO] Banco compartilhado intacto. Depois de validar, rode com --delete para liberar o espaço.")
+    print("[FIM] Ligue o bot com DB_SHARDING=1.")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,170 @@
+import asyncio
+import json
+import os
+
+import aiohttp
+import discord
+
+from utils.outbound import BULK
+from utils.time_utils import now_ts
+
+# ====================================================
+# 📢 BROADCAST EM SEGUNDO PLANO (JOBS RETOMÁVEIS)
+# ====================================================
+# O painel cria um job e responde na hora; o envio roda aqui, com no máximo
+# BROADCAST_CONCURRENCY destinos em andamento (os envios passam pelo
+# agendador de saída com prioridade BULK). Cada guild alvo é uma linha em
+# broadcast_targets: pending -> sent/failed, gravada assim que o envio
+# termina. Erro temporário (5xx, 429, rede) tenta de novo com espera
+# dobrando; sem permissão/canal/guild falha direto.
+#
+# Se o bot cair no meio, resume() no boot continua os jobs 'running' só com
+# os alvos ainda pendentes: quem já recebeu não recebe de novo.
+#
+# Uso:
+#   job_id = await bot.broadcasts.create(embed, 'owners', user_id)
+#   job = await bot.broadcasts.get(job_id)  -> {total, sent, failed, status, ...}
+#   await bot.broadcasts.cancel(job_id)
+
+BROADCAST_CONCURRENCY = int(os.getenv("BROADCAST_CONCURRENCY", 5))
+BROADCAST_MAX_ATTEMPTS = int(os.getenv("BROADCAST_MAX_ATTEMPTS", 3))
+BROADCAST_BACKOFF = float(os.getenv("BROADCAST_BACKOFF", 2)) # Segundos antes da 2ª tentativa (dobra a cada uma)
+
+JOB_COLUMNS = ('id', 'target', 'status', 'total', 'sent', 'failed', 'created_by', 'created_ts', 'finished_ts')
+
+def is_retryable(error):
+    """Falha temporária (vale tentar de novo) ou definitiva."""
+    if isinstance(error, (discord.Forbidden, discord.NotFound)):
+        return False
+    if isinstance(error, discord.HTTPException):
+        return error.status == 429 or error.status >= 500
+    return isinstance(error, (asyncio.TimeoutError, aiohttp.ClientError, OSError))
+
+class BroadcastEngine:
+    def __init__(self, bot):
+        self.bot = bot
+        self.db = bot.db
+        self._tasks = {} # job_id -> task
+
+    async def create(self, embed, target, user_id=0):
+        """Grava o job com uma linha por guild atual e começa o envio."""
+        guild_ids = [g.id for g in self.bot.guilds]
+        async with self.db.write(durable=True) as db:
+            cursor = await db.execute(
+                "INSERT INTO broadcast_jobs (target, payload, status, total, created_by, created_ts) VALUES (?, ?, 'running', ?, ?, ?)",
+                (target, json.dumps(embed.to_dict()), len(guild_ids), user_id, now_ts())
+            )
+            job_id = cursor.lastrowid
+            await db.executemany("INSERT INTO broadcast_targets (job_id, target_id) VALUES (?, ?)",
+                                 [(job_id, gid) for gid in guild_ids])
+        self._start(job_id)
+        print(f"📢 [BROADCAST] Job #{job_id} criado: {len(guild_ids)} destino(s) ({target}).")
+        return job_id
+
+    async def resume(self):
+        """Retoma os jobs interrompidos (bot reiniciou no meio do envio)."""
+        async with self.db.read() as conn:
+            async with conn.execute("SELECT id FROM broadcast_jobs WHERE status = 'running'") as cursor:
+                job_ids = [row[0] for row in await cursor.fetchall()]
+        for job_id in job_ids:
+            self._start(job_id)
+        if job_ids:
+            print(f"📢 [BROADCAST] Retomando {len(job_ids)} job(s) interrompido(s).")
+
+    async def get(self, job_id):
+        async with self.db.read() as conn:
+            async with conn.execute(f"SELECT {', '.join(JOB_COLUMNS)} FROM broadcast_jobs WHERE id = ?", (job_id,)) as cursor:
+                row = await cursor.fetchone()
+        return dict(zip(JOB_COLUMNS, row)) if row else None
+
+    async def recent(self, limit=10):
+        async with self.db.read() as conn:
+            async with conn.execute(f"SELECT {', '.join(JOB_COLUMNS)} FROM broadcast_jobs ORDER BY id DESC LIMIT ?", (limit,)) as cursor:
+                return [dict(zip(JOB_COLUMNS, row)) for row in await cursor.fetchall()]
+
+    async def cancel(self, job_id):
+        """Para o job; os alvos pendentes ficam pendentes (não são retomados)."""
+        async with self.db.write(durable=True) as db: # Leitores (polling do painel) veem na hora
+            cursor = await db.execute("UPDATE broadcast_jobs SET status = 'cancelled', finished_ts = ? WHERE id = ? AND status = 'running'",
+                                      (now_ts(), job_id))
+            changed = cursor.rowcount
+        task = self._tasks.pop(job_id, None)
+        if task: task.cancel()
+        return changed > 0
+
+    def stop(self):
+        """Desligamento: interrompe sem mudar o status (o próximo boot retoma)."""
+        for task in self._tasks.values():
+            task.cancel()
+        self._tasks.clear()
+
+    # ---------- Execução ----------
+    def _start(self, job_id):
+        if job_id in self._tasks: return
+        self._tasks[job_id] = asyncio.create_task(self._run(job_id))
+
+    async def _run(self, job_id):
+        try:
+            await self.bot.wait_until_ready() # guild.owner_id / canais vêm do cache do gateway
+            async with self.db.read() as conn:
+                async with conn.execute("SELECT target, payload FROM broadcast_jobs WHERE id = ? AND status = 'running'", (job_id,)) as cursor:
+                    job = await cursor.fetchone()
+                if not job: return
+                async with conn.execute("SELECT target_id FROM broadcast_targets WHERE job_id = ? AND status = 'pending'", (job_id,)) as cursor:
+                    pending = [row[0] for row in await cursor.fetchall()]
+
+            target, payload = job
+            embed = discord.Embed.from_dict(json.loads(payload))
+            semaphore = asyncio.Semaphore(BROADCAST_CONCURRENCY)
+
+            async def deliver(guild_id):
+                async with semaphore:
+                    await self._deliver(job_id, target, embed, guild_id)
+
+            await asyncio.gather(*(deliver(gid) for gid in pending))
+
+            async with self.db.write(durable=True) as db:
+                await db.execute("UPDATE broadcast_jobs SET status = 'done', finished_ts = ? WHERE id = ? AND status = 'running'",
+                                 (now_ts(), job_id))
+            job = await self.get(job_id)
+            print(f"✅ [BROADCAST] Job #{job_id} concluído: {job['sent']} enviados, {job['failed']} falhas.")
+        except asyncio.CancelledError:
+            pass
+        except Exception as e:
+            print(f"❌ [BROADCAST] Job #{job_id} interrompido (será retomado no próximo boot): {e}")
+        finally:
+            if self._tasks.get(job_id) is asyncio.current_task():
+                del self._tasks[job_id]
+
+    async def _deliver(self, job_id, target, embed, guild_id):
+        attempts = 0
+        while True:
+            attempts += 1
+            try:
+                await self._send(target, embed, guild_id)
+                status, error = 'sent', None
+            except Exception as e:
+                if attempts < BROADCAST_MAX_ATTEMPTS and is_retryable(e):
+                    await asyncio.sleep(BROADCAST_BACKOFF * 2 ** (attempts - 1))
+                    continue
+                status, error = 'failed', (str(e) or type(e).__name__)[:200]
+            break
+
+        # Durável: depois do commit esse alvo nunca mais é reenviado
+        async with self.db.write(durable=True) as db:
+            await db.execute("UPDATE broadcast_targets SET status = ?, attempts = ?, error = ? WHERE job_id = ? AND target_id = ?",
+                             (status, attempts, error, job_id, guild_id))
+            await db.execute("UPDATE broadcast_jobs SET sent = sent + ?, failed = failed + ? WHERE id = ?",
+                             (status == 'sent', status == 'failed', job_id))
+
+    async def _send(self, target, embed, guild_id):
+        guild = self.bot.get_guild(guild_id)
+        if not guild: raise LookupError("Bot não está mais no servidor")
+
+        if target == 'owners':
+            owner = self.bot.get_user(guild.owner_id) or await self.bot.fetch_user(guild.owner_id)
+            await self.bot.outbound.dm(owner, BULK, embed=embed)
+        else:
+            channel = guild.system_channel or (guild.text_channels[0] if guild.text_channels else None)
+            if not channel: raise LookupError("Servidor sem canal de texto")
+            await self.bot.outbound.send(channel, BULK, embed=embed)
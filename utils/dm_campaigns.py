@@ -0,0 +1,250 @@
+import asyncio
+import json
+import logging
+import os
+import time
+from collections import deque
+
+import discord
+
+from utils.broadcast import is_retryable
+from utils.outbound import BULK
+from utils.time_utils import now_ts
+
+# ====================================================
+# 📬 CAMPANHAS DE DM (FILA PERSISTENTE + RITMO ADAPTATIVO)
+# ====================================================
+# /campanha_dm grava a campanha em dm_jobs e um alvo por membro em
+# dm_job_targets (pending -> sent/failed). DM_CAMPAIGN_WORKERS workers
+# consomem os pendentes; todos passam pelo mesmo marcador de ritmo, então
+# a campanha nunca dispara mais rápido que o intervalo atual.
+#
+# Ritmo: começa no delay escolhido (mínimo). 429 (Retry-After lido pelo
+# discord.py), RateLimited e "abrindo DMs rápido demais" (40003) alargam o
+# intervalo; envios bem-sucedidos voltam aos poucos para o delay base.
+#
+# Cada resultado é gravado (durável) junto com os contadores do job; o
+# painel lê só os contadores. Reinício do bot: resume() continua as
+# campanhas 'running' a partir dos alvos pendentes.
+#
+# Uso:
+#   job_id = await bot.campaigns.create(guild_id, author_id, embed, button, user_ids, delay)
+#   await bot.campaigns.pause(job_id) / resume_job(job_id) / cancel(job_id)
+
+DM_CAMPAIGN_WORKERS = int(os.getenv("DM_CAMPAIGN_WORKERS", 3))
+DM_CAMPAIGN_MAX_DELAY = float(os.getenv("DM_CAMPAIGN_MAX_DELAY", 60)) # Teto do intervalo adaptativo (s)
+DM_MAX_ATTEMPTS = 3
+DM_TOO_FAST = 40003 # "You are opening direct messages too fast"
+
+JOB_COLUMNS = ('id', 'guild_id', 'author_id', 'delay', 'status', 'total', 'sent', 'failed', 'created_ts', 'finished_ts')
+
+class AdaptivePacer:
+    """Intervalo entre envios compartilhado pelos workers de uma campanha."""
+    def __init__(self, base):
+        self.base = base
+        self.interval = base
+        self._next = 0
+
+    async def wait(self):
+        """Reserva o próximo horário livre e dorme até ele."""
+        now = time.monotonic()
+        at = max(now, self._next)
+        self._next = at + self.interval
+        if at > now: await asyncio.sleep(at - now)
+
+    def success(self):
+        self.interval = max(self.base, self.interval * 0.95)
+
+    def limited(self, retry_after=None):
+        self.interval = min(DM_CAMPAIGN_MAX_DELAY, max(self.interval * 2, retry_after or 0))
+        self._next = max(self._next, time.monotonic() + (retry_after or self.interval))
+
+class _RateLimitListener(logging.Handler):
+    """Lê os avisos de 429 do discord.py (Retry-After) e freia as campanhas."""
+    def __init__(self, queue):
+        super().__init__(logging.WARNING)
+        self.queue = queue
+
+    def emit(self, record):
+        if not str(record.msg).startswith('We are being rate limited') or not record.args: return
+        retry_after = record.args[-1]
+        if isinstance(retry_after, (int, float)):
+            self.queue.rate_limited(retry_after)
+
+class DMCampaignQueue:
+    def __init__(self, bot):
+        self.bot = bot
+        self.db = bot.db
+        self._tasks = {}   # job_id -> task
+        self._status = {}  # job_id -> status vigente (workers param quando deixa de ser 'running')
+        self.pacers = {}   # job_id -> AdaptivePacer das campanhas rodando
+        self._listener = _RateLimitListener(self)
+        logging.getLogger('discord.http').addHandler(self._listener)
+
+    # ---------- API ----------
+    async def create(self, guild_id, author_id, embed, button, user_ids, delay):
+        """Grava a campanha (um alvo por membro) e começa o envio."""
+        user_ids = sorted(set(user_ids))
+        async with self.db.write(durable=True) as db:
+            cursor = await db.execute(
+                "INSERT INTO dm_jobs (guild_id, author_id, payload, button, delay, status, total, created_ts) VALUES (?, ?, ?, ?, ?, 'running', ?, ?)",
+                (guild_id, author_id, json.dumps(embed.to_dict()), json.dumps(button) if button else None, delay, len(user_ids), now_ts())
+            )
+            job_id = cursor.lastrowid
+            await db.executemany("INSERT INTO dm_job_targets (job_id, user_id) VALUES (?, ?)", [(job_id, uid) for uid in user_ids])
+        self._start(job_id)
+        print(f"📬 [CAMPANHA] #{job_id} criada na guild {guild_id}: {len(user_ids)} membro(s).")
+        return job_id
+
+    async def resume(self):
+        """Boot: continua as campanhas que estavam rodando."""
+        async with self.db.read() as conn:
+            async with conn.execute("SELECT id FROM dm_jobs WHERE status = 'running'") as cursor:
+                job_ids = [row[0] for row in await cursor.fetchall()]
+        for job_id in job_ids:
+            self._start(job_id)
+        if job_ids:
+            print(f"📬 [CAMPANHA] Retomando {len(job_ids)} campanha(s) interrompida(s).")
+
+    async def pause(self, job_id):
+        return await self._set_status(job_id, 'paused', ('running',))
+
+    async def resume_job(self, job_id):
+        if not await self._set_status(job_id, 'running', ('paused',)): return False
+        self._start(job_id)
+        return True
+
+    async def cancel(self, job_id):
+        """Cancela; os alvos pendentes ficam registrados como pendentes."""
+        return await self._set_status(job_id, 'cancelled', ('running', 'paused'), finished=True)
+
+    async def get(self, job_id):
+        async with self.db.read() as conn:
+            async with conn.execute(f"SELECT {', '.join(JOB_COLUMNS)} FROM dm_jobs WHERE id = ?", (job_id,)) as cursor:
+                row = await cursor.fetchone()
+        if not row: return None
+        job = dict(zip(JOB_COLUMNS, row))
+        pacer = self.pacers.get(job_id)
+        job['interval'] = pacer.interval if pacer else job['delay']
+        return job
+
+    async def for_guild(self, guild_id, limit=10):
+        async with self.db.read() as conn:
+            async with conn.execute(f"SELECT {', '.join(JOB_COLUMNS)} FROM dm_jobs WHERE guild_id = ? ORDER BY id DESC LIMIT ?", (guild_id, limit)) as cursor:
+                return [dict(zip(JOB_COLUMNS, row)) for row in await cursor.fetchall()]
+
+    async def failures(self, job_id, limit=5):
+        """Motivos de falha mais comuns da campanha: [(erro, quantidade)]."""
+        async with self.db.read() as conn:
+            async with conn.execute(
+                "SELECT error, COUNT(*) FROM dm_job_targets WHERE job_id = ? AND status = 'failed' GROUP BY error ORDER BY COUNT(*) DESC LIMIT ?",
+                (job_id, limit)
+            ) as cursor:
+                return await cursor.fetchall()
+
+    def rate_limited(self, retry_after=None):
+        for pacer in self.pacers.values():
+            pacer.limited(retry_after)
+
+    def stop(self):
+        """Desligamento: para os workers sem mudar o status (o próximo boot retoma)."""
+        logging.getLogger('discord.http').removeHandler(self._listener)
+        for task in self._tasks.values():
+            task.cancel()
+        self._tasks.clear()
+
+    # ---------- Execução ----------
+    async def _set_status(self, job_id, status, allowed, finished=False):
+        async with self.db.write(durable=True) as db: # Painel relê pelos leitores logo depois
+            cursor = await db.execute(
+                f"UPDATE dm_jobs SET status = ?, finished_ts = ? WHERE id = ? AND status IN ({', '.join('?' for _ in allowed)})",
+                (status, now_ts() if finished else None, job_id, *allowed)
+            )
+            changed = cursor.rowcount > 0
+        if changed: self._status[job_id] = status
+        return changed
+
+    def _start(self, job_id):
+        self._status[job_id] = 'running'
+        task = self._tasks.get(job_id)
+        if task and not task.done(): return # Pausa ainda terminando o envio atual: o mesmo task continua
+        self._tasks[job_id] = asyncio.create_task(self._run(job_id))
+
+    async def _run(self, job_id):
+        try:
+            await self.bot.wait_until_ready()
+            async with self.db.read() as conn:
+                async with conn.execute("SELECT payload, button, delay FROM dm_jobs WHERE id = ?", (job_id,)) as cursor:
+                    job = await cursor.fetchone()
+                if not job: return
+                async with conn.execute("SELECT user_id FROM dm_job_targets WHERE job_id = ? AND status = 'pending'", (job_id,)) as cursor:
+                    pending = deque(row[0] for row in await cursor.fetchall())
+
+            payload, button, delay = job
+            embed = discord.Embed.from_dict(json.loads(payload))
+            button = json.loads(button) if button else None
+            pacer = self.pacers[job_id] = AdaptivePacer(delay)
+
+            # Repete se a campanha foi retomada enquanto a pausa esperava os envios em curso
+            while pending and self._status.get(job_id) == 'running':
+                workers = [asyncio.create_task(self._worker(job_id, pending, pacer, embed, button))
+                           for _ in range(min(DM_CAMPAIGN_WORKERS, len(pending)))]
+                try:
+                    await asyncio.gather(*workers)
+                finally:
+                    for worker in workers: worker.cancel()
+
+            if not pending and self._status.get(job_id) == 'running':
+                async with self.db.write(durable=True) as db:
+                    await db.execute("UPDATE dm_jobs SET status = 'done', finished_ts = ? WHERE id = ? AND status = 'running'",
+                                     (now_ts(), job_id))
+                self._status[job_id] = 'done'
+                print(f"✅ [CAMPANHA] #{job_id} concluída.")
+        except asyncio.CancelledError:
+            pass
+        except Exception as e:
+            print(f"❌ [CAMPANHA] #{job_id} interrompida (retoma no próximo boot): {e}")
+        finally:
+            self.pacers.pop(job_id, None)
+            if self._tasks.get(job_id) is asyncio.current_task():
+                del self._tasks[job_id]
+            if self._status.get(job_id) != 'paused': self._status.pop(job_id, None)
+
+    def _view(self, button):
+        if not button: return None
+        view = discord.ui.View()
+        # Botões de link são sempre cinza (limitação do Discord)
+        view.add_item(discord.ui.Button(label=button['label'], url=button['url'], style=discord.ButtonStyle.link, emoji=button.get('emoji')))
+        return view
+
+    async def _worker(self, job_id, pending, pacer, embed, button):
+        while pending and self._status.get(job_id) == 'running':
+            user_id = pending.popleft()
+            attempts = 0
+            while True:
+                attempts += 1
+                await pacer.wait()
+                if self._status.get(job_id) != 'running': # Pausada/cancelada durante a espera
+                    pending.appendleft(user_id)
+                    return
+                try:
+                    user = self.bot.get_user(user_id) or await self.bot.fetch_user(user_id)
+                    await self.bot.outbound.dm(user, BULK, embed=embed, view=self._view(button))
+                    pacer.success()
+                    status, error = 'sent', None
+                except Exception as e:
+                    if isinstance(e, discord.RateLimited):
+                        pacer.limited(e.retry_after)
+                    elif isinstance(e, discord.HTTPException) and e.code == DM_TOO_FAST:
+                        pacer.limited()
+                    retry = is_retryable(e) or isinstance(e, discord.RateLimited) or getattr(e, 'code', None) == DM_TOO_FAST
+                    if attempts < DM_MAX_ATTEMPTS and retry:
+                        continue
+                    status, error = 'failed', (str(e) or type(e).__name__)[:200]
+                break
+
+            async with self.db.write(durable=True) as db:
+                await db.execute("UPDATE dm_job_targets SET status = ?, attempts = ?, error = ? WHERE job_id = ? AND user_id = ?",
+                                 (status, attempts, error, job_id, user_id))
+                await db.execute("UPDATE dm_jobs SET sent = sent + ?, failed = failed + ? WHERE id = ?",
+                                 (status == 'sent', status == 'failed', job_id))
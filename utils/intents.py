@@ -0,0 +1,78 @@
+import os
+
+import discord
+
+# ====================================================
+# 📡 INTENTS E CACHE DE MEMBROS POR MÓDULO
+# ====================================================
+# Em vez de Intents.all(), cada cog declara aqui o que precisa do gateway;
+# o bot liga só a união dos cogs que vai carregar (DISABLED_COGS tira cogs
+# e, com eles, as intents que só eles usavam).
+#
+# Membros: nenhuma guild é "chunkada" no boot. A lista completa de membros
+# é baixada por guild, na primeira vez que um módulo que depende dela é
+# usado ali (bot.ensure_members). Guild sem uso nunca ocupa RAM com membros.
+
+# Comandos de barra, roteador de mensagens e !fix_bot
+BASE_INTENTS = ('guilds', 'guild_messages', 'message_content', 'dm_messages')
+
+# cog (arquivo em cogs/) -> intents extras
+COG_INTENTS = {
+    'admin': ('members', 'emojis_and_stickers'), # Campanhas por cargo (role.members), bot.emojis
+    'bugs': (),
+    'embed_creator': (),
+    'faction_actions': ('members',),
+    'general': ('members',),
+    'giveaway_system': ('members',),
+    'hierarchy': ('members',),                  # role.members
+    'logs': ('members', 'voice_states', 'moderation'),  # apelidos, voz, banimentos
+    'monitor': (),
+    'presence': (),
+    'punishments': ('members',),
+    'sales': ('members',),
+    'setagem': ('members',),
+    'staff_stats': ('members',),
+    'streaming': ('members', 'presences'),      # Fim da live pelo status (on_raw_presence_update: sem cache de membros)
+    'suggestions': (),
+    'tickets': ('members', 'voice_states'),
+    'timesheet': ('members',),
+    'verification': ('members',),
+    'webserver': (),
+    'welcome': ('members',),                    # Entrada/saída
+}
+
+# Módulos cujos comandos leem membros do cache (get_member, role.members):
+# usar um deles numa guild dispara o download da lista de membros dela.
+MEMBER_LIST_MODULES = frozenset({
+    'admin', 'factionactions', 'general', 'giveawaysystem', 'hierarchy', 'punishments',
+    'sales', 'setagem', 'staffstats', 'streaming', 'tickets', 'timesheet', 'verification',
+})
+
+CHUNK_AT_STARTUP = os.getenv("MEMBER_CHUNK_AT_STARTUP", "0") == "1"
+
+def enabled_cogs(directory='./cogs'):
+    """Cogs que o bot vai carregar (arquivos .py menos DISABLED_COGS)."""
+    disabled = {c.strip() for c in os.getenv("DISABLED_COGS", "").split(",") if c.strip()}
+    if not os.path.exists(directory): return []
+    return sorted(f[:-3] for f in os.listdir(directory) if f.endswith('.py') and f[:-3] not in disabled)
+
+def build_intents(cogs):
+    """Intents mínimas para os cogs dados (cog sem declaração liga o padrão)."""
+    intents = discord.Intents.none()
+    for name in BASE_INTENTS:
+        setattr(intents, name, True)
+
+    for cog in cogs:
+        needs = COG_INTENTS.get(cog)
+        if needs is None:
+            print(f"⚠️ [INTENTS] Cog '{cog}' sem declaração em utils/intents.py: usando Intents.default() + members.")
+            intents.value |= discord.Intents.default().value
+            intents.members = True
+            continue
+        for name in needs:
+            setattr(intents, name, True)
+    return intents
+
+def member_cache_flags(intents):
+    """Membros entram no cache ao entrar/interagir, em voz, ou pelo chunk sob demanda."""
+    return discord.MemberCacheFlags.from_intents(intents)
@@ -0,0 +1,102 @@
+import asyncio
+import os
+from collections import Counter, deque
+
+import discord
+
+from utils.outbound import LOG
+
+# ====================================================
+# 📦 FILA DE LOGS AGRUPADOS POR CANAL
+# ====================================================
+# Cada evento vira um embed na fila do canal de log; um flusher por canal
+# junta até 10 embeds (limite do Discord, 6000 caracteres somados) numa
+# mensagem só. Envia quando a fila enche ou depois de LOG_BATCH_INTERVAL.
+# Em rajada (raid, troca de canais de voz) a fila é limitada: o excedente
+# é descartado e vira um embed de resumo ("37 eventos suprimidos").
+#
+# Uso:
+#   self.sink = LogSink(bot.outbound)    # lotes saem com prioridade LOG
+#   self.sink.push(log_channel, embed)   # não bloqueia o evento
+
+LOG_BATCH_INTERVAL = float(os.getenv("LOG_BATCH_INTERVAL", 2))
+LOG_QUEUE_MAX = int(os.getenv("LOG_QUEUE_MAX", 200))  # Embeds pendentes por canal
+EMBEDS_PER_MESSAGE = 10
+CHARS_PER_MESSAGE = 6000
+
+class LogSink:
+    def __init__(self, outbound=None, interval=LOG_BATCH_INTERVAL, max_queue=LOG_QUEUE_MAX):
+        self.outbound = outbound  # Agendador de saída (utils/outbound.py); None = envio direto
+        self.interval = interval
+        self.max_queue = max_queue
+        self._queues = {}   # channel_id -> deque[Embed]
+        self._dropped = {}  # channel_id -> Counter(título)
+        self._full = {}     # channel_id -> Event (fila chegou a uma mensagem cheia)
+        self._tasks = {}    # channel_id -> flusher
+
+    def push(self, channel, embed):
+        """Enfileira o embed no canal; o envio acontece no flusher."""
+        cid = channel.id
+        queue = self._queues.setdefault(cid, deque())
+        if len(queue) >= self.max_queue:
+            self._dropped.setdefault(cid, Counter())[embed.title or "Evento"] += 1
+        else:
+            queue.append(embed)
+
+        if cid not in self._tasks:
+            self._tasks[cid] = asyncio.create_task(self._drain(channel))
+        elif len(queue) >= EMBEDS_PER_MESSAGE and cid in self._full:
+            self._full[cid].set()
+
+    def _summary(self, dropped):
+        total = sum(dropped.values())
+        embed = discord.Embed(title="⚠️ Logs Suprimidos", color=0x95a5a6)
+        embed.description = (f"**{total}** evento(s) não foram registrados individualmente (rajada).\n\n"
+                             + "\n".join(f"`{count}x` {title}" for title, count in dropped.most_common(10)))
+        return embed
+
+    def _take(self, cid):
+        """Próxima mensagem: até 10 embeds dentro do limite de caracteres."""
+        queue = self._queues.get(cid) or deque()
+        batch, chars = [], 0
+        while queue and len(batch) < EMBEDS_PER_MESSAGE:
+            size = len(queue[0])
+            if batch and chars + size > CHARS_PER_MESSAGE: break
+            batch.append(queue.popleft())
+            chars += size
+
+        # Resumo do descarte sai quando a fila esvazia (junto, se couber)
+        if not queue and self._dropped.get(cid) and len(batch) < EMBEDS_PER_MESSAGE:
+            summary = self._summary(self._dropped[cid])
+            if not batch or chars + len(summary) <= CHARS_PER_MESSAGE:
+                del self._dropped[cid]
+                batch.append(summary)
+        return batch
+
+    async def _drain(self, channel):
+        cid = channel.id
+        try:
+            while self._queues.get(cid) or self._dropped.get(cid):
+                # Espera juntar uma mensagem cheia ou o intervalo passar
+                if len(self._queues.get(cid) or ()) < EMBEDS_PER_MESSAGE:
+                    event = self._full.setdefault(cid, asyncio.Event())
+                    event.clear()
+                    try: await asyncio.wait_for(event.wait(), self.interval)
+                    except asyncio.TimeoutError: pass
+
+                batch = self._take(cid)
+                if not batch: break
+                try:
+                    if self.outbound: await self.outbound.send(channel, LOG, embeds=batch)
+                    else: await channel.send(embeds=batch)
+                except (discord.Forbidden, discord.NotFound):
+                    # Canal apagado ou sem permissão: descarta o que estava pendente
+                    self._queues.pop(cid, None)
+                    self._dropped.pop(cid, None)
+                    break
+                except Exception as e:
+                    print(f"⚠️ [LOGS] Falha ao enviar lote de {len(batch)} log(s) em {cid}: {e}")
+        finally:
+            self._tasks.pop(cid, None)
+            self._full.pop(cid, None)
+            if not self._queues.get(cid): self._queues.pop(cid, None)
@@ -0,0 +1,73 @@
+import asyncio
+import traceback
+
+# ====================================================
+# 📨 ROTEADOR DE MENSAGENS (ÍNDICE POR CANAL)
+# ====================================================
+# Mensagem é o evento mais frequente do bot. Em vez de cada cog ter um
+# on_message que descobre sozinho que o canal não é dele, o cog se inscreve
+# pela coluna da config que guarda o canal:
+#
+#   self.bot.router.subscribe(self.handle_suggestion, 'sugg_channel_id')
+#   self.bot.router.subscribe(self.count_message)   # toda mensagem
+#
+# O roteador monta channel_id -> handlers a partir do cache de config e
+# refaz o índice quando uma coluna inscrita muda (GuildConfigCache.on_change).
+# Uma mensagem comum custa uma consulta em dicionário; mensagens de bots e
+# DMs nem chegam aos handlers.
+
+class MessageRouter:
+    def __init__(self, config_cache):
+        self.config_cache = config_cache
+        self._columns = {}   # coluna da config -> [handlers]
+        self._global = ()    # Handlers de toda mensagem de guild
+        self._index = {}     # channel_id -> (handlers,)
+        config_cache.on_change.append(self._config_changed)
+
+    def subscribe(self, handler, column=None):
+        """Inscreve handler(message) no canal da coluna (ou em todas as mensagens)."""
+        if column is None:
+            self._global = self._global + (handler,)
+        else:
+            self._columns.setdefault(column, []).append(handler)
+            self.rebuild()
+
+    def unsubscribe(self, handler):
+        """Remove o handler de todas as inscrições (cog_unload)."""
+        self._global = tuple(h for h in self._global if h != handler)
+        for column in list(self._columns):
+            self._columns[column] = [h for h in self._columns[column] if h != handler]
+            if not self._columns[column]: del self._columns[column]
+        self.rebuild()
+
+    def rebuild(self):
+        """Remonta o índice inteiro e troca numa atribuição."""
+        index = {}
+        for guild_id in self.config_cache.guild_ids():
+            for column, handlers in self._columns.items():
+                channel_id = self.config_cache.get(guild_id, column)
+                try: channel_id = int(channel_id or 0)
+                except (TypeError, ValueError): continue
+                if channel_id:
+                    index.setdefault(channel_id, []).extend(handlers)
+        self._index = {channel_id: tuple(handlers) for channel_id, handlers in index.items()}
+
+    def _config_changed(self, guild_id, columns):
+        # columns None = linha/tabela inteira (load, reload, drop)
+        if columns is None or any(c in self._columns for c in columns):
+            self.rebuild()
+
+    def dispatch(self, message):
+        """Agenda os handlers interessados na mensagem (não bloqueia o evento)."""
+        if message.author.bot or not message.guild: return
+        for handler in self._global:
+            asyncio.create_task(self._run(handler, message))
+        for handler in self._index.get(message.channel.id, ()):
+            asyncio.create_task(self._run(handler, message))
+
+    async def _run(self, handler, message):
+        try:
+            await handler(message)
+        except Exception:
+            print(f"❌ [ROUTER] Erro em {getattr(handler, '__qualname__', handler)}:")
+            traceback.print_exc()
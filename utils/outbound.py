@@ -0,0 +1,261 @@
+import asyncio
+import heapq
+import itertools
+import os
+import time
+from collections import Counter, deque
+
+# ====================================================
+# 🚦 AGENDADOR DE SAÍDA (PRIORIDADE + LIMITES POR ROTA)
+# ====================================================
+# Todo envio em massa do bot passa por aqui em vez de chamar channel.send /
+# message.edit / member.send direto. Cada envio entra numa fila com classe
+# de prioridade; o despachante só solta o próximo quando o balde da rota
+# (canal, DM, webhook da interação) e o balde global têm vaga, então uma
+# campanha de DM nunca esgota o limite global na frente de um painel.
+#
+#   await bot.outbound.send(channel, PANEL, embed=embed)
+#   await bot.outbound.edit(message, PANEL, embed=embed)   # coalesce
+#   await bot.outbound.dm(member, BULK, embed=embed)
+#   await bot.outbound.edit_original(interaction, embeds=[...])
+#
+# Edições repetidas da mesma mensagem ainda na fila viram uma só (campos
+# mesclados, vale o último); todos os que pediram recebem o mesmo resultado.
+# Respostas diretas de interação (response.send_message) não passam pela
+# fila: OUTBOUND_GLOBAL_RATE fica abaixo do limite do Discord para sobrar
+# folga para elas.
+
+INTERACTION, PANEL, LOG, BULK = 0, 1, 2, 3
+PRIORITY_NAMES = {INTERACTION: 'interaction', PANEL: 'panel', LOG: 'log', BULK: 'bulk'}
+
+# Tipo de rota -> (envios, por segundos); um balde por rota (tipo, id)
+ROUTE_LIMITS = {
+    'channel': (5, 5.0),       # POST /channels/{id}/messages
+    'edit': (5, 5.0),          # PATCH /channels/{id}/messages/{id}
+    'interaction': (5, 2.0),   # Webhook da interação (follow-up / edição da original)
+    'dm': (int(os.getenv("OUTBOUND_DM_RATE", 1)), 1.0),  # Abrir DM + enviar, somado entre usuários
+}
+OUTBOUND_GLOBAL_RATE = int(os.getenv("OUTBOUND_GLOBAL_RATE", 40))  # Discord: 50/s por bot
+
+class _Bucket:
+    """Balde de fichas: `rate` envios a cada `per` segundos, reposição contínua."""
+    __slots__ = ('rate', 'per', 'tokens', 'updated')
+
+    def __init__(self, rate, per):
+        self.rate, self.per = rate, per
+        self.tokens = float(rate)
+        self.updated = time.monotonic()
+
+    def delay(self, now):
+        """Segundos até ter uma ficha (0 = pode enviar já)."""
+        self.tokens = min(self.rate, self.tokens + (now - self.updated) * self.rate / self.per)
+        self.updated = now
+        return 0 if self.tokens >= 1 else (1 - self.tokens) * self.per / self.rate
+
+    def take(self):
+        self.tokens -= 1
+
+    def idle(self, now):
+        return self.delay(now) == 0 and self.tokens >= self.rate
+
+class _Job:
+    __slots__ = ('priority', 'seq', 'route', 'factory', 'kwargs', 'key', 'future', 'state', 'queued_at')
+
+    def __init__(self, priority, seq, route, factory, kwargs, key, future):
+        self.priority, self.seq, self.route = priority, seq, route
+        self.factory, self.kwargs, self.key = factory, kwargs, key
+        self.future = future
+        self.state = 'queued'   # queued -> parked (rota sem vaga) -> running (ou cancelled)
+        self.queued_at = time.monotonic()
+
+class OutboundScheduler:
+    def __init__(self, global_rate=OUTBOUND_GLOBAL_RATE):
+        self._heap = []        # (prioridade, seq, job) prontos para tentar
+        self._parked = {}      # rota -> deque[job] esperando a vaga da rota
+        self._timers = []      # (libera_em, rota) das rotas estacionadas
+        self._buckets = {}     # rota -> _Bucket
+        self._global = _Bucket(global_rate, 1.0)
+        self._keys = {}        # chave de coalescência -> job ainda na fila
+        self._seq = itertools.count()
+        self._wakeup = asyncio.Event()
+        self._task = None
+        self._running = 0
+        self.sent = Counter()       # classe -> enviados
+        self.failed = Counter()     # classe -> falhas
+        self.coalesced = 0
+        self.wait_ms = {}           # classe -> espera média na fila (EWMA)
+
+    # ---------- API ----------
+    def submit(self, route, priority, factory, key=None, **kwargs):
+        """Agenda factory(**kwargs) na rota; retorna Future com o resultado.
+
+        Com `key`, um pedido que ainda não saiu da fila é reaproveitado: os
+        kwargs novos são mesclados por cima dos antigos.
+        """
+        job = self._keys.get(key) if key is not None else None
+        if job and job.future.cancelled(): # Quem pediu desistiu: não herda o cancelamento
+            self._forget(job)
+            job = None
+        if job:
+            job.kwargs.update(kwargs)
+            job.factory = factory
+            self.coalesced += 1
+            if priority < job.priority:
+                job.priority = priority
+                if job.state == 'queued': heapq.heappush(self._heap, (priority, job.seq, job))
+            return job.future
+
+        job = _Job(priority, next(self._seq), route, factory, kwargs, key,
+                   asyncio.get_running_loop().create_future())
+        if key is not None: self._keys[key] = job
+        heapq.heappush(self._heap, (priority, job.seq, job))
+        self._wakeup.set()
+        if not self._task or self._task.done():
+            self._task = asyncio.create_task(self._dispatch())
+        return job.future
+
+    def send(self, channel, priority=PANEL, **kwargs):
+        return self.submit(('channel', channel.id), priority, channel.send, **kwargs)
+
+    def edit(self, message, priority=PANEL, **kwargs):
+        return self.submit(('edit', message.channel.id), priority, message.edit, key=('edit', message.id), **kwargs)
+
+    def dm(self, user, priority=BULK, **kwargs):
+        return self.submit(('dm',), priority, user.send, **kwargs)
+
+    def followup(self, interaction, priority=INTERACTION, **kwargs):
+        return self.submit(('interaction', interaction.id), priority, interaction.followup.send, **kwargs)
+
+    def edit_original(self, interaction, priority=INTERACTION, **kwargs):
+        return self.submit(('interaction', interaction.id), priority, interaction.edit_original_response,
+                           key=('original', interaction.id), **kwargs)
+
+    def metrics(self):
+        """Profundidade da fila por classe e contadores (painel /api/stats)."""
+        depth = Counter()
+        seen = set()
+        for _, _, job in self._heap:
+            if job.state == 'queued' and job.seq not in seen:
+                seen.add(job.seq)
+                depth[PRIORITY_NAMES[job.priority]] += 1
+        for jobs in self._parked.values():
+            for job in jobs: depth[PRIORITY_NAMES[job.priority]] += 1
+        return {
+            "queued": {name: depth[name] for name in PRIORITY_NAMES.values()},
+            "parked_routes": len(self._parked),
+            "running": self._running,
+            "sent": {name: self.sent[name] for name in PRIORITY_NAMES.values()},
+            "failed": {name: self.failed[name] for name in PRIORITY_NAMES.values()},
+            "coalesced": self.coalesced,
+            "wait_ms": {name: round(ms) for name, ms in self.wait_ms.items()},
+        }
+
+    def stop(self):
+        if self._task: self._task.cancel()
+        for _, _, job in self._heap:
+            if not job.future.done(): job.future.cancel()
+        for jobs in self._parked.values():
+            for job in jobs:
+                if not job.future.done(): job.future.cancel()
+        self._heap.clear()
+        self._parked.clear()
+        self._keys.clear()
+
+    # ---------- Despachante ----------
+    def _bucket(self, route):
+        bucket = self._buckets.get(route)
+        if bucket is None:
+            if len(self._buckets) > 1000: # Descarta baldes cheios de rotas ociosas
+                now = time.monotonic()
+                self._buckets = {r: b for r, b in self._buckets.items() if not b.idle(now) or r in self._parked}
+            bucket = self._buckets[route] = _Bucket(*ROUTE_LIMITS[route[0]])
+        return bucket
+
+    def _release_timers(self, now):
+        """Rotas cujo balde já repôs voltam para o heap."""
+        while self._timers and self._timers[0][0] <= now:
+            _, route = heapq.heappop(self._timers)
+            for job in self._parked.pop(route, ()):
+                if job.future.cancelled():
+                    self._forget(job)
+                    continue
+                job.state = 'queued'
+                heapq.heappush(self._heap, (job.priority, job.seq, job))
+
+    async def _dispatch(self):
+        while self._heap or self._parked:
+            now = time.monotonic()
+            self._release_timers(now)
+
+            if not self._heap:
+                await self._sleep(self._timers[0][0] - now)
+                continue
+
+            priority, seq, job = self._heap[0]
+            if job.state != 'queued' or priority != job.priority: # Entrada velha (coalescida/estacionada)
+                heapq.heappop(self._heap)
+                continue
+            if job.future.cancelled(): # Ninguém espera mais: não gasta ficha da rota
+                heapq.heappop(self._heap)
+                self._forget(job)
+                continue
+
+            # Rota já sem vaga: espera junto; na liberação o heap reordena por prioridade
+            if job.route in self._parked:
+                heapq.heappop(self._heap)
+                job.state = 'parked'
+                self._parked[job.route].append(job)
+                continue
+
+            wait = self._bucket(job.route).delay(now)
+            if wait:
+                heapq.heappop(self._heap)
+                job.state = 'parked'
+                self._parked[job.route] = deque([job])
+                heapq.heappush(self._timers, (now + wait, job.route))
+                continue
+
+            wait = self._global.delay(now)
+            if wait:
+                await self._sleep(wait)
+                continue
+
+            heapq.heappop(self._heap)
+            self._bucket(job.route).take()
+            self._global.take()
+            self._launch(job, now)
+
+    async def _sleep(self, seconds):
+        """Dorme até a próxima vaga ou até chegar um pedido novo (pode ser mais urgente)."""
+        self._wakeup.clear()
+        try: await asyncio.wait_for(self._wakeup.wait(), max(seconds, 0))
+        except asyncio.TimeoutError: pass
+
+    def _forget(self, job):
+        """Tira da fila um pedido cancelado (as entradas velhas no heap são ignoradas)."""
+        job.state = 'cancelled'
+        if job.key is not None and self._keys.get(job.key) is job:
+            del self._keys[job.key]
+
+    def _launch(self, job, now):
+        job.state = 'running'
+        if job.key is not None and self._keys.get(job.key) is job:
+            del self._keys[job.key] # Edições novas daqui em diante viram outro envio
+        name = PRIORITY_NAMES[job.priority]
+        waited = (now - job.queued_at) * 1000
+        self.wait_ms[name] = waited if name not in self.wait_ms else self.wait_ms[name] * 0.9 + waited * 0.1
+        self._running += 1
+        asyncio.create_task(self._run(job, name))
+
+    async def _run(self, job, name):
+        try:
+            result = await job.factory(**job.kwargs)
+            self.sent[name] += 1
+            if not job.future.done(): job.future.set_result(result)
+        except Exception as e:
+            self.failed[name] += 1
+            if not job.future.done():
+                job.future.set_exception(e)
+                job.future.exception() # Quem não aguardou o envio não gera aviso de exceção perdida
+        finally:
+            self._running -= 1
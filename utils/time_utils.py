@@ -0,0 +1,41 @@
+import datetime
+import time
+
+# ====================================================
+# 🕒 HELPERS DE TEMPO (EPOCH INTEIRO)
+# ====================================================
+# Toda coluna de data consultada por intervalo guarda segundos Unix (INTEGER).
+# Comparar inteiros usa o índice; strings misturadas (str(datetime), isoformat,
+# CURRENT_TIMESTAMP) não ordenam de forma confiável.
+
+def now_ts():
+    """Agora em segundos Unix."""
+    return int(time.time())
+
+def to_ts(dt):
+    """datetime (naive = horário local) -> segundos Unix."""
+    return int(dt.timestamp())
+
+def from_ts(ts):
+    """Segundos Unix -> datetime local (naive)."""
+    return datetime.datetime.fromtimestamp(int(ts))
+
+def days_ago_ts(days):
+    return now_ts() - int(days * 86400)
+
+def month_start_ts():
+    """Início do mês atual (00:00 do dia 1, horário local)."""
+    start = datetime.datetime.now().replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+    return to_ts(start)
+
+def fmt_ts(ts, fmt="%d/%m/%Y %H:%M", default="-"):
+    if ts is None: return default
+    return from_ts(ts).strftime(fmt)
+
+def discord_ts(ts, style="f"):
+    """Marcação de data do Discord: <t:1700000000:R>."""
+    return f"<t:{int(ts)}:{style}>"
+
+def legacy_to_epoch_sql(column):
+    """Expressão SQL que converte as datas antigas em texto (horário local) para epoch."""
+    return f"CAST(strftime('%s', substr({column}, 1, 19), 'utc') AS INTEGER)"